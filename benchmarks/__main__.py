@@ -0,0 +1,53 @@
+"""run ODM hot path benchmarks
+
+python -m benchmarks --output before.json
+python -m benchmarks --output after.json --compare before.json
+"""
+
+import argparse
+import sys
+
+from motordantic.connection import connect
+
+from . import runner
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("names", nargs="*", help="run benchmarks with this prefix")
+    parser.add_argument("--backend", default="memory", choices=("memory", "motor"))
+    parser.add_argument("--address", default="mongodb://127.0.0.1:27017")
+    parser.add_argument("--database", default="motordantic_benchmarks")
+    parser.add_argument("--output", help="save results as json")
+    parser.add_argument("--compare", help="baseline json for regression check")
+    parser.add_argument("--threshold", type=float, default=0.1)
+    parser.add_argument("--min-time", type=float, default=0.2)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    connect(args.address, args.database, backend=args.backend)
+    from . import (  # noqa: F401
+        bench_documents,
+        bench_import,
+        bench_manager,
+        bench_query,
+        bench_relations,
+        bench_sync,
+    )
+
+    report = runner.run(args.names, args.min_time, args.repeat)
+    report["backend"] = args.backend
+    if args.output:
+        runner.save(report, args.output)
+    if args.compare:
+        regressions = runner.compare(runner.load(args.compare), report, args.threshold)
+        for name, base, current, ratio in regressions:
+            print(
+                f"REGRESSION {name}: {base:.2f} us -> {current:.2f} us (x{ratio:.2f})"
+            )
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+from bson import encode as bson_encode
+
+from motordantic.query.result import FindResult
+
+from .documents import WIDTHS, make_document_class, make_raw_rows, make_row
+from .runner import benchmark
+
+ROWS = 100
+# FindResult dump cost is per row, measured on large results
+DUMP_ROWS = 10_000
+
+
+def _register(width: int) -> None:
+    document_class = make_document_class(width)
+
+    @benchmark(f"documents.from_bson.w{width}")
+    def from_bson():
+        row = make_raw_rows(width, 1)[0]
+        return lambda: document_class.from_bson(row)
+
+    @benchmark(f"documents.from_bson_rows.w{width}")
+    def from_bson_rows():
+        row = make_raw_rows(width, 1)[0]
+        return lambda: document_class.__row_class__.from_bson(row)
+
+    @benchmark(f"documents.model_dump.w{width}")
+    def model_dump():
+        document = document_class(**make_row(width))
+        return lambda: document.model_dump()
+
+    @benchmark(f"documents.find_result_data.{DUMP_ROWS}rows.w{width}")
+    def find_result_data():
+        rows = [document_class.from_bson(r) for r in make_raw_rows(width, DUMP_ROWS)]
+        result = FindResult(document_class, rows)
+        return lambda: result.data
+
+    @benchmark(f"documents.find_result_json.{ROWS}rows.w{width}")
+    def find_result_json():
+        rows = [document_class.from_bson(r) for r in make_raw_rows(width, ROWS)]
+        result = FindResult(document_class, rows)
+        return lambda: result.json()
+
+    @benchmark(f"documents.find_result_json_bytes.{ROWS}rows.w{width}")
+    def find_result_json_bytes():
+        rows = [document_class.from_bson(r) for r in make_raw_rows(width, ROWS)]
+        result = FindResult(document_class, rows)
+        return lambda: result.json_bytes()
+
+    @benchmark(f"documents.insert_encoding.w{width}")
+    def insert_encoding():
+        document = document_class(**make_row(width))
+        return lambda: bson_encode(document._mongo_query_data)
+
+    @benchmark(f"documents.insert_many.{ROWS}rows.w{width}")
+    def insert_many():
+        documents = [document_class(**make_row(width, i)) for i in range(ROWS)]
+
+        async def insert():
+            await document_class.Q.insert_many(documents)
+            await document_class.Q.drop_collection(force=True)
+
+        return insert
+
+
+for _width in WIDTHS:
+    _register(_width)
+
+
+@benchmark("documents.fields_all")
+def fields_all():
+    document_class = make_document_class(WIDTHS[-1])
+    return lambda: document_class.fields_all
@@ -0,0 +1,33 @@
+import subprocess
+import sys
+
+from .runner import benchmark
+
+
+def _python(code: str):
+    command = [sys.executable, "-c", code]
+    return lambda: subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+
+
+@benchmark("import.baseline")
+def import_baseline():
+    return _python("pass")
+
+
+@benchmark("import.package")
+def import_package():
+    return _python("import motordantic")
+
+
+@benchmark("import.document")
+def import_document():
+    # cold start of serverless functions: subtract import.baseline
+    return _python("import motordantic.document")
+
+
+@benchmark("import.connect")
+def import_connect():
+    return _python(
+        "from motordantic.connection import connect\n"
+        "connect('mongodb://127.0.0.1:27017', 'bench')._get_motor_client()"
+    )
@@ -0,0 +1,17 @@
+from pymongo import WriteConcern
+
+from .documents import make_document_class
+from .runner import benchmark
+
+
+@benchmark("manager.collection")
+def collection():
+    manager = make_document_class(5).manager
+    return lambda: manager.collection
+
+
+@benchmark("manager.get_collection.write_concern")
+def collection_with_write_concern():
+    manager = make_document_class(5).manager
+    write_concern = WriteConcern(w=1)
+    return lambda: manager.get_collection(write_concern=write_concern)
@@ -0,0 +1,56 @@
+from motordantic.query.query import Q, generate_basic_query
+from motordantic.validation import validate_field_value
+
+from .documents import WIDTHS, make_document_class
+from .runner import benchmark
+
+
+def _register(width: int) -> None:
+    document_class = make_document_class(width)
+
+    @benchmark(f"query.generate_basic_query.simple.w{width}")
+    def simple():
+        manager = document_class.manager
+        query = {"field_0": 1, "field_1": "name"}
+        return lambda: generate_basic_query(manager, query)
+
+    @benchmark(f"query.generate_basic_query.operators.w{width}")
+    def operators():
+        manager = document_class.manager
+        query = {
+            "field_0__gte": 1,
+            "field_0__lte": 100,
+            "field_1__in": ["a", "b", "c"],
+            "field_2__ne": 1.5,
+            "field_4__key": 3,
+        }
+        return lambda: generate_basic_query(manager, query)
+
+    @benchmark(f"query.q_tree.w{width}")
+    def q_tree():
+        builder = document_class.Q
+
+        def compile_tree():
+            query = (Q(field_0=1) | Q(field_1__startswith="na")) & (
+                Q(field_2__gt=1.0) | Q(field_0__in=[1, 2, 3])
+            )
+            return query.to_query(builder)
+
+        return compile_tree
+
+
+for _width in WIDTHS:
+    _register(_width)
+
+
+@benchmark("query.validate_field_value.int")
+def validate_int():
+    document_class = make_document_class(WIDTHS[0])
+    return lambda: validate_field_value(document_class, "field_0", "12")
+
+
+@benchmark("query.validate_field_value.dict")
+def validate_dict():
+    document_class = make_document_class(WIDTHS[0])
+    value = {"key": 1, "nested": {"row": 2}}
+    return lambda: validate_field_value(document_class, "field_4", value)
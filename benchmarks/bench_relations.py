@@ -0,0 +1,43 @@
+import asyncio
+
+from .documents import Author, Book
+from .runner import benchmark
+
+BOOKS = 100
+
+
+async def _fill() -> None:
+    await Author.Q.drop_collection(force=True)
+    await Book.Q.drop_collection(force=True)
+    authors = [Author(name=f"author-{i}") for i in range(10)]
+    for author in authors:
+        await author.save()
+    await Book.Q.insert_many(
+        [
+            Book(title=f"book-{i}", author=Author.to_relation(authors[i % 10]._id))  # type: ignore
+            for i in range(BOOKS)
+        ]
+    )
+
+
+@benchmark(f"relations.hydrate_and_map.{BOOKS}rows")
+def map_relations():
+    loop = asyncio.get_event_loop()
+    loop.run_until_complete(_fill())
+    rows = loop.run_until_complete(Book.manager.collection.find({}).to_list(None))
+    relation_manager = Book.manager.relation_manager
+
+    async def map_relations():
+        # mapping replaces relations with objects, so rows are hydrated every call
+        books = [Book.from_bson(row) for row in rows]
+        await relation_manager.map_relation_for_array(books)  # type: ignore
+
+    return map_relations
+
+
+@benchmark(f"relations.find_with_relations_objects.{BOOKS}rows")
+def find_with_relations():
+    async def find():
+        await Book.Q.find(with_relations_objects=True)
+
+    return find
@@ -0,0 +1,15 @@
+from .documents import Author
+from .runner import benchmark
+
+
+@benchmark("sync.async_count")
+def async_count():
+    async def count():
+        await Author.Q.count(name="author-1")
+
+    return count
+
+
+@benchmark("sync.qsync_count")
+def qsync_count():
+    return lambda: Author.Qsync.count(name="author-1")
@@ -0,0 +1,77 @@
+"""synthetic documents of different width for benchmarks"""
+
+from datetime import datetime
+from typing import Dict, List, Optional, Type
+
+from bson import ObjectId, encode as bson_encode
+from bson.raw_bson import RawBSONDocument
+
+from motordantic.document import Document
+from motordantic.types import Relation
+
+__all__ = (
+    "WIDTHS",
+    "make_document_class",
+    "make_row",
+    "make_raw_rows",
+    "Author",
+    "Book",
+)
+
+WIDTHS = (5, 20, 50)
+
+_FIELD_TYPES = (int, str, float, Optional[str], dict, List[int], datetime)
+_classes: Dict[int, Type[Document]] = {}
+
+
+def _field_type(index: int):
+    return _FIELD_TYPES[index % len(_FIELD_TYPES)]
+
+
+def make_document_class(width: int) -> Type[Document]:
+    """Document with width fields of mixed types and one property"""
+    if width in _classes:
+        return _classes[width]
+    annotations = {f"field_{i}": _field_type(i) for i in range(width)}
+    namespace = {
+        "__annotations__": annotations,
+        "__module__": __name__,
+        "label": property(lambda self: f"{self.field_1}-{self.field_0}"),
+    }
+    document_class = type(f"Wide{width}", (Document,), namespace)
+    _classes[width] = document_class
+    return document_class  # type: ignore
+
+
+def _value(field_type, index: int, row: int):
+    if field_type is int:
+        return row * index
+    if field_type is str or field_type == Optional[str]:
+        return f"value-{row}-{index}"
+    if field_type is float:
+        return row / (index + 1)
+    if field_type is dict:
+        return {"key": index, "nested": {"row": row}}
+    if field_type == List[int]:
+        return list(range(index % 5))
+    return datetime(2023, 1, 1 + row % 28)
+
+
+def make_row(width: int, row: int = 1) -> dict:
+    return {f"field_{i}": _value(_field_type(i), i, row) for i in range(width)}
+
+
+def make_raw_rows(width: int, count: int) -> List[RawBSONDocument]:
+    return [
+        RawBSONDocument(bson_encode({"_id": ObjectId(), **make_row(width, row)}))
+        for row in range(count)
+    ]
+
+
+class Author(Document):
+    name: str
+
+
+class Book(Document):
+    title: str
+    author: Relation[Author]
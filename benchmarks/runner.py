@@ -0,0 +1,144 @@
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+__all__ = ("benchmark", "run", "save", "load", "compare", "REGISTRY")
+
+BenchFunc = Union[Callable[[], Any], Callable[[], Awaitable[Any]]]
+
+# benchmark name -> setup function
+REGISTRY: Dict[str, Callable[[], BenchFunc]] = {}
+
+
+def benchmark(name: str) -> Callable:
+    """register setup function, it returns callable measured per call
+
+    Setup runs once and is not measured, returned callable may be a
+    coroutine function.
+    """
+
+    def decorator(setup: Callable[[], BenchFunc]) -> Callable[[], BenchFunc]:
+        REGISTRY[name] = setup
+        return setup
+
+    return decorator
+
+
+def _timer(func: BenchFunc, loop: asyncio.AbstractEventLoop) -> Callable[[int], float]:
+    if asyncio.iscoroutinefunction(func):
+
+        async def batch(number: int) -> float:
+            start = time.perf_counter()
+            for _ in range(number):
+                await func()
+            return time.perf_counter() - start
+
+        return lambda number: loop.run_until_complete(batch(number))
+
+    def sync_batch(number: int) -> float:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        return time.perf_counter() - start
+
+    return sync_batch
+
+
+def measure(
+    func: BenchFunc,
+    loop: asyncio.AbstractEventLoop,
+    min_time: float = 0.2,
+    repeat: int = 5,
+) -> Dict[str, float]:
+    """timeit-like autorange, per call times in microseconds"""
+    timer = _timer(func, loop)
+    number = 1
+    while True:
+        elapsed = timer(number)
+        if elapsed >= min_time or number >= 1_000_000:
+            break
+        number *= 2 if elapsed * 10 > min_time else 10
+    runs = [elapsed] + [timer(number) for _ in range(repeat - 1)]
+    per_call = [r / number * 1e6 for r in runs]
+    return {
+        "number": number,
+        "min_us": min(per_call),
+        "median_us": statistics.median(per_call),
+        "stdev_us": statistics.stdev(per_call) if len(per_call) > 1 else 0.0,
+    }
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return (
+            subprocess.check_output(
+                ["git", "rev-parse", "--short", "HEAD"],
+                stderr=subprocess.DEVNULL,
+                cwd=os.path.dirname(os.path.abspath(__file__)),
+            )
+            .decode()
+            .strip()
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(
+    names: Optional[List[str]] = None,
+    min_time: float = 0.2,
+    repeat: int = 5,
+    echo: Callable[[str], None] = print,
+) -> Dict[str, Any]:
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    results: Dict[str, Dict[str, float]] = {}
+    try:
+        for name, setup in REGISTRY.items():
+            if names and not any(name.startswith(n) for n in names):
+                continue
+            func = setup()
+            results[name] = stats = measure(func, loop, min_time, repeat)
+            echo(f"{name:<50} {stats['min_us']:>12.2f} us")
+    finally:
+        loop.close()
+    return {
+        "revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+
+
+def save(report: Dict[str, Any], path: str) -> None:
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+
+
+def load(path: str) -> Dict[str, Any]:
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(
+    baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = 0.1
+) -> List[Tuple[str, float, float, float]]:
+    """benchmarks slower than baseline by more than threshold
+
+    Returns:
+        List[Tuple[str, float, float, float]]: name, baseline us, current us, ratio
+    """
+    regressions = []
+    for name, stats in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        ratio = stats["min_us"] / base["min_us"]
+        if ratio > 1 + threshold:
+            regressions.append((name, base["min_us"], stats["min_us"], ratio))
+    return regressions
@@ -0,0 +1,51 @@
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+__all__ = (
+    "init",
+    "connect",
+    "MotordanticConnection",
+    "Document",
+    "Q",
+    "Relation",
+    "ObjectIdStr",
+)
+
+# public name -> submodule, loaded on first attribute access
+_LAZY_ATTRIBUTES = {
+    "init": ".bootstrap",
+    "connect": ".connection",
+    "MotordanticConnection": ".connection",
+    "Document": ".document",
+    "Q": ".query.query",
+    "Relation": ".types",
+    "ObjectIdStr": ".types",
+}
+
+if TYPE_CHECKING:
+    from .bootstrap import init
+    from .connection import connect, MotordanticConnection
+    from .document import Document
+    from .query.query import Q
+    from .types import Relation, ObjectIdStr
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is not None:
+        value = getattr(import_module(module_name, __name__), name)
+    else:
+        try:
+            value = import_module(f".{name}", __name__)
+        except ModuleNotFoundError as e:
+            if e.name != f"{__name__}.{name}":
+                raise
+            raise AttributeError(
+                f"module {__name__!r} has no attribute {name!r}"
+            ) from None
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__all__))
@@ -4,10 +4,27 @@ from ..exceptions import MotordanticValidationError
 from ..query import generate_basic_query, Q, QCombination, AggregateResult
 from ..utils.pydantic import get_model_fields
 
-__all__ = ('Aggregate',)
+__all__ = ('Aggregate', 'map_field_refs')
 
 if TYPE_CHECKING:
     from .document import Document
+    from ..query.decode import DecodeStrategy
+
+
+def map_field_refs(document_class: 'Document', expression: Any) -> Any:
+    """rename "$field" references in aggregation expression to db fields"""
+    if isinstance(expression, str):
+        if expression.startswith('$') and not expression.startswith('$$'):
+            return f'${document_class.get_db_field(expression[1:])}'
+        return expression
+    if isinstance(expression, dict):
+        return {
+            k: v if k == '$literal' else map_field_refs(document_class, v)
+            for k, v in expression.items()
+        }
+    if isinstance(expression, (list, tuple)):
+        return [map_field_refs(document_class, v) for v in expression]
+    return expression
 
 
 class Aggregate(object):
@@ -35,6 +52,35 @@ class Aggregate(object):
         self.pipeline.append({'$addFields': {**fields}})
         return self
 
+    def _db_field(self, field: str) -> str:
+        path = field.replace('__', '.')
+        name = path.split('.', 1)[0]
+        if name not in get_model_fields(self.document_class) and name != '_id':
+            raise MotordanticValidationError(
+                f'field - {field} not a field from model: {self.document_class.__name__}'
+            )
+        return self.document_class.get_db_field(path)
+
+    def set(self, **fields) -> 'Aggregate':
+        """$set stage for document fields, address__city for inner path
+
+        Expressions can reference fields by python names, like
+        set(total={'$multiply': ['$price', '$qty']}).
+        """
+        self.pipeline.append(
+            {
+                '$set': {
+                    self._db_field(field): map_field_refs(self.document_class, value)
+                    for field, value in fields.items()
+                }
+            }
+        )
+        return self
+
+    def unset(self, *fields: str) -> 'Aggregate':
+        self.pipeline.append({'$unset': [self._db_field(field) for field in fields]})
+        return self
+
     def group(self, _id: Any = None, **group_kwargs) -> 'Aggregate':
         self.pipeline.append({'$group': {'_id': _id, **group_kwargs}})
         return self
@@ -52,7 +98,10 @@ class Aggregate(object):
         return self
 
     def sort(self, **sort_kwargs) -> 'Aggregate':
-        self.pipeline.append({'$sort': {**sort_kwargs}})
+        get_db_field = self.document_class.get_db_field
+        self.pipeline.append(
+            {'$sort': {get_db_field(field): v for field, v in sort_kwargs.items()}}
+        )
         return self
 
     def lookup(
@@ -74,8 +123,8 @@ class Aggregate(object):
             )
         lookup = {
             'from': from_.get_collection_name(),
-            'localField': local_field,
-            'foreignField': foreign_field,
+            'localField': self.document_class.get_db_field(local_field),
+            'foreignField': from_.get_db_field(foreign_field),
         }
         if as_:
             lookup['as'] = as_
@@ -95,12 +144,16 @@ class Aggregate(object):
         return self
 
     def facet(self, facet: Dict[str, 'Aggregate']) -> 'Aggregate':
-        assert any([not isinstance(v, Aggregate) for v in facet.values()])
+        assert all(isinstance(v, Aggregate) for v in facet.values())
         self.pipeline.append(
             {'$facet': {name: aggregate.pipeline for name, aggregate in facet.items()}}
         )
         return self
 
+    def count(self, name: str = 'count') -> 'Aggregate':
+        self.pipeline.append({'$count': name})
+        return self
+
     def out(self, name: str) -> 'Aggregate':
         self.pipeline.append({'$out': name})
         return self
@@ -177,10 +230,18 @@ class Aggregate(object):
         self.pipeline.append({'$let': {**let}})
         return self
 
-    async def result(self) -> AggregateResult:
-        result = await self.document_class.Q.raw_aggregate(self.pipeline)
+    async def result(
+        self, decode: 'DecodeStrategy' = 'dict', fields: Optional[list] = None
+    ) -> AggregateResult:
+        result = await self.document_class.Q.raw_aggregate(
+            self.pipeline, decode=decode, fields=fields
+        )
         return AggregateResult(native_result=result, document_class=self.document_class)
 
-    def result_sync(self) -> AggregateResult:
-        result = self.document_class.Qsync.raw_aggregate(self.pipeline)
+    def result_sync(
+        self, decode: 'DecodeStrategy' = 'dict', fields: Optional[list] = None
+    ) -> AggregateResult:
+        result = self.document_class.Qsync.raw_aggregate(
+            self.pipeline, decode=decode, fields=fields
+        )
         return AggregateResult(native_result=result, document_class=self.document_class)
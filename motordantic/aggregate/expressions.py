@@ -39,7 +39,7 @@ class BaseAggregationOperation(object):
         self._validate_field(document_class)
         query_field = document_class.__mapping_query_fields__[self.field]
         query = {
-            f"{query_field}__{self.operation}": {f"${self.operation}": f"${self.field}"}
+            f"{self.field}__{self.operation}": {f"${self.operation}": f"${query_field}"}
         }
         return query
 
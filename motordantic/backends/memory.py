@@ -0,0 +1,1412 @@
+import asyncio
+import copy
+import datetime
+import random
+from collections import OrderedDict
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from bson import ObjectId, encode as bson_encode, decode as bson_decode
+from bson.codec_options import CodecOptions, DEFAULT_CODEC_OPTIONS
+from bson.raw_bson import RawBSONDocument
+from bson.son import SON
+from pymongo import IndexModel, ReturnDocument
+from pymongo.errors import (
+    DuplicateKeyError,
+    OperationFailure,
+    BulkWriteError,
+)
+from pymongo.operations import (
+    InsertOne,
+    UpdateOne,
+    UpdateMany,
+    ReplaceOne,
+    DeleteOne,
+    DeleteMany,
+)
+from pymongo.results import (
+    InsertOneResult,
+    InsertManyResult,
+    UpdateResult,
+    DeleteResult,
+    BulkWriteResult,
+)
+from pymongo.write_concern import WriteConcern
+
+from ..exceptions import MotordanticUnsupportedOperation
+from ..query.matcher import (
+    MISSING,
+    compile_filter,
+    resolve_path,
+    sort_key,
+    values_equal,
+)
+
+__all__ = (
+    "MemoryClient",
+    "MemoryDatabase",
+    "MemoryCollection",
+    "MemoryCursor",
+    "MemoryCommandCursor",
+    "MemoryChangeStream",
+    "MemorySession",
+)
+
+
+def _key_spec(keys: Union[str, List, Tuple, Mapping]) -> List[Tuple[str, Any]]:
+    if isinstance(keys, str):
+        return [(keys, 1)]
+    if isinstance(keys, Mapping):
+        return list(keys.items())
+    return [(k, d) for k, d in keys]
+
+
+def _index_name(keys: List[Tuple[str, Any]]) -> str:
+    return "_".join(f"{k}_{d}" for k, d in keys)
+
+
+def _id_key(value: Any) -> bytes:
+    return bson_encode({"_id": value})
+
+
+def _split(path: str) -> List[str]:
+    return path.split(".")
+
+
+def _get_path(doc: Any, path: str) -> Any:
+    value = doc
+    for part in _split(path):
+        if isinstance(value, Mapping):
+            value = value.get(part, MISSING)
+        elif isinstance(value, list) and part.isdigit() and int(part) < len(value):
+            value = value[int(part)]
+        else:
+            return MISSING
+        if value is MISSING:
+            return MISSING
+    return value
+
+
+def _parent(doc: dict, path: str, create: bool = True) -> Tuple[Any, str]:
+    parts = _split(path)
+    target: Any = doc
+    for part in parts[:-1]:
+        if isinstance(target, list) and part.isdigit():
+            index = int(part)
+            while create and len(target) <= index:
+                target.append(None)
+            if index >= len(target):
+                return None, parts[-1]
+            if target[index] is None and create:
+                target[index] = {}
+            target = target[index]
+        elif isinstance(target, dict):
+            if part not in target:
+                if not create:
+                    return None, parts[-1]
+                target[part] = {}
+            target = target[part]
+        else:
+            return None, parts[-1]
+    return target, parts[-1]
+
+
+def _set_path(doc: dict, path: str, value: Any) -> None:
+    target, key = _parent(doc, path)
+    if isinstance(target, list) and key.isdigit():
+        index = int(key)
+        while len(target) <= index:
+            target.append(None)
+        target[index] = value
+    elif isinstance(target, dict):
+        target[key] = value
+    else:
+        raise OperationFailure(f"cannot set field {path}")
+
+
+def _unset_path(doc: dict, path: str) -> None:
+    target, key = _parent(doc, path, create=False)
+    if isinstance(target, dict):
+        target.pop(key, None)
+    elif isinstance(target, list) and key.isdigit() and int(key) < len(target):
+        target[int(key)] = None
+
+
+def _numeric(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+# aggregation expressions
+
+
+def _evaluate(expression: Any, doc: Any, variables: Optional[dict] = None) -> Any:
+    if isinstance(expression, str):
+        if expression.startswith("$$"):
+            name, _, path = expression[2:].partition(".")
+            if name == "ROOT" or name == "CURRENT":
+                base = doc
+            else:
+                base = (variables or {}).get(name, MISSING)
+            value = _get_path(base, path) if path else base
+            return None if value is MISSING else value
+        if expression.startswith("$"):
+            values = resolve_path(doc, expression[1:])
+            if not values:
+                return None
+            if len(values) == 1:
+                return values[0]
+            return values
+        return expression
+    if isinstance(expression, list):
+        return [_evaluate(e, doc, variables) for e in expression]
+    if isinstance(expression, Mapping):
+        if len(expression) == 1:
+            operator, args = next(iter(expression.items()))
+            if operator.startswith("$"):
+                return _evaluate_operator(operator, args, doc, variables)
+        return {k: _evaluate(v, doc, variables) for k, v in expression.items()}
+    return expression
+
+
+def _args(args: Any, doc: Any, variables: Optional[dict]) -> list:
+    if not isinstance(args, list):
+        args = [args]
+    return [_evaluate(a, doc, variables) for a in args]
+
+
+def _evaluate_operator(
+    operator: str, args: Any, doc: Any, variables: Optional[dict]
+) -> Any:
+    if operator == "$literal":
+        return args
+    values = _args(args, doc, variables) if operator != "$cond" else []
+    if operator == "$add":
+        if any(v is None for v in values):
+            return None
+        if any(isinstance(v, datetime.datetime) for v in values):
+            base = next(v for v in values if isinstance(v, datetime.datetime))
+            millis = sum(v for v in values if _numeric(v))
+            return base + datetime.timedelta(milliseconds=millis)
+        return sum(values)
+    if operator == "$subtract":
+        if values[0] is None or values[1] is None:
+            return None
+        return values[0] - values[1]
+    if operator == "$multiply":
+        if any(v is None for v in values):
+            return None
+        result = 1
+        for v in values:
+            result *= v
+        return result
+    if operator == "$divide":
+        if values[0] is None or values[1] is None:
+            return None
+        return values[0] / values[1]
+    if operator == "$mod":
+        return values[0] % values[1]
+    if operator == "$concat":
+        if any(v is None for v in values):
+            return None
+        return "".join(values)
+    if operator == "$toUpper":
+        return (values[0] or "").upper()
+    if operator == "$toLower":
+        return (values[0] or "").lower()
+    if operator == "$toString":
+        return None if values[0] is None else str(values[0])
+    if operator == "$ifNull":
+        return next((v for v in values if v is not None), None)
+    if operator in ("$eq", "$ne", "$gt", "$gte", "$lt", "$lte", "$cmp"):
+        left, right = sort_key(values[0]), sort_key(values[1])
+        return {
+            "$eq": left == right,
+            "$ne": left != right,
+            "$gt": left > right,
+            "$gte": left >= right,
+            "$lt": left < right,
+            "$lte": left <= right,
+            "$cmp": (left > right) - (left < right),
+        }[operator]
+    if operator == "$and":
+        return all(values)
+    if operator == "$or":
+        return any(values)
+    if operator == "$not":
+        return not values[0]
+    if operator == "$in":
+        return any(values_equal(values[0], v) for v in values[1])
+    if operator == "$size":
+        return len(values[0])
+    if operator == "$cond":
+        if isinstance(args, Mapping):
+            condition, then, otherwise = args["if"], args["then"], args["else"]
+        else:
+            condition, then, otherwise = args
+        if _evaluate(condition, doc, variables):
+            return _evaluate(then, doc, variables)
+        return _evaluate(otherwise, doc, variables)
+    if operator in ("$sum", "$avg", "$min", "$max"):
+        items = (
+            values[0] if len(values) == 1 and isinstance(values[0], list) else values
+        )
+        numbers = [v for v in items if _numeric(v)]
+        if operator == "$sum":
+            return sum(numbers)
+        if operator == "$avg":
+            return sum(numbers) / len(numbers) if numbers else None
+        items = [v for v in items if v is not None]
+        if not items:
+            return None
+        return (min if operator == "$min" else max)(items, key=sort_key)
+    raise MotordanticUnsupportedOperation(operator, "aggregation operator")
+
+
+# update operators
+
+
+def _apply_update(doc: dict, update: Union[Mapping, List], is_insert: bool) -> None:
+    if isinstance(update, list):
+        new_doc = _run_pipeline_stages(update, [doc], None)
+        doc.clear()
+        doc.update(new_doc[0])
+        return
+    for operator, fields in update.items():
+        if not operator.startswith("$"):
+            raise ValueError("update only works with $ operators")
+        for path, value in fields.items():
+            current = _get_path(doc, path)
+            if operator == "$set":
+                _set_path(doc, path, copy.deepcopy(value))
+            elif operator == "$setOnInsert":
+                if is_insert:
+                    _set_path(doc, path, copy.deepcopy(value))
+            elif operator == "$unset":
+                _unset_path(doc, path)
+            elif operator in ("$inc", "$mul"):
+                if not _numeric(value):
+                    raise OperationFailure(
+                        f"Cannot {operator} with non-numeric argument"
+                    )
+                if current is MISSING or current is None:
+                    current = 0
+                elif not _numeric(current):
+                    raise OperationFailure(
+                        f"Cannot apply {operator} to non-numeric value"
+                    )
+                new_value = current + value if operator == "$inc" else current * value
+                _set_path(doc, path, new_value)
+            elif operator in ("$min", "$max"):
+                if current is MISSING:
+                    _set_path(doc, path, value)
+                else:
+                    new, old = sort_key(value), sort_key(current)
+                    if (new < old) if operator == "$min" else (new > old):
+                        _set_path(doc, path, value)
+            elif operator == "$currentDate":
+                now = datetime.datetime.utcnow().replace(microsecond=0)
+                _set_path(doc, path, now)
+            elif operator in ("$push", "$addToSet"):
+                if current is MISSING:
+                    current = []
+                    _set_path(doc, path, current)
+                elif not isinstance(current, list):
+                    raise OperationFailure(f"The field '{path}' must be an array")
+                items = (
+                    value["$each"]
+                    if isinstance(value, Mapping) and "$each" in value
+                    else [value]
+                )
+                for item in items:
+                    if operator == "$push" or not any(
+                        values_equal(item, v) for v in current
+                    ):
+                        current.append(copy.deepcopy(item))
+                if isinstance(value, Mapping) and "$slice" in value:
+                    size = value["$slice"]
+                    current[:] = current[:size] if size >= 0 else current[size:]
+            elif operator in ("$pull", "$pullAll"):
+                if not isinstance(current, list):
+                    continue
+                if operator == "$pullAll":
+                    keep = [
+                        v for v in current if not any(values_equal(v, p) for p in value)
+                    ]
+                elif isinstance(value, Mapping):
+                    if all(k.startswith("$") for k in value):
+                        check = compile_filter({"value": value})
+                        keep = [v for v in current if not check({"value": v})]
+                    else:
+                        check = compile_filter(value)
+                        keep = [v for v in current if not check(v)]
+                else:
+                    keep = [v for v in current if not values_equal(v, value)]
+                current[:] = keep
+            elif operator == "$pop":
+                if isinstance(current, list) and current:
+                    current.pop(0 if value == -1 else -1)
+            elif operator == "$rename":
+                if current is not MISSING:
+                    _unset_path(doc, path)
+                    _set_path(doc, value, current)
+            else:
+                raise MotordanticUnsupportedOperation(operator, "update operator")
+
+
+def _upsert_base(query: Mapping) -> dict:
+    doc: dict = {}
+    for key, value in query.items():
+        if key.startswith("$"):
+            continue
+        if isinstance(value, Mapping) and any(k.startswith("$") for k in value):
+            if "$eq" in value:
+                _set_path(doc, key, value["$eq"])
+            continue
+        _set_path(doc, key, copy.deepcopy(value))
+    return doc
+
+
+# projection
+
+
+def _project(doc: dict, projection: Optional[Mapping]) -> dict:
+    if not projection:
+        return doc
+    include_id = bool(projection.get("_id", True))
+    fields = {k: v for k, v in projection.items() if k != "_id"}
+    # {"_id": 1} alone is inclusive projection too
+    inclusive = any(bool(v) for v in fields.values()) or (
+        not fields and bool(projection.get("_id"))
+    )
+    if inclusive:
+        result: dict = {}
+        if include_id and "_id" in doc:
+            result["_id"] = doc["_id"]
+        for path, value in fields.items():
+            if isinstance(value, (Mapping, str)) and value not in (0, 1):
+                _set_path(result, path, _evaluate(value, doc))
+                continue
+            found = _get_path(doc, path)
+            if found is not MISSING:
+                _set_path(result, path, found)
+        return result
+    result = copy.deepcopy(doc)
+    for path in fields:
+        _unset_path(result, path)
+    if not include_id:
+        result.pop("_id", None)
+    return result
+
+
+# aggregation pipeline
+
+
+def _sort_documents(docs: List[Any], spec: List[Tuple[str, Any]]) -> List[Any]:
+    result = list(docs)
+    for field, direction in reversed(spec):
+
+        def key(doc, field=field):
+            values = resolve_path(doc, field)
+            if not values:
+                return sort_key(None)
+            return sort_key(values[0])
+
+        result.sort(key=key, reverse=direction == -1)
+    return result
+
+
+def _group(docs: List[dict], spec: Mapping) -> List[dict]:
+    groups: "OrderedDict[bytes, dict]" = OrderedDict()
+    group_values: Dict[bytes, Dict[str, list]] = {}
+    for doc in docs:
+        group_id = _evaluate(spec["_id"], doc)
+        key = _id_key(group_id)
+        if key not in groups:
+            groups[key] = {"_id": group_id}
+            group_values[key] = {name: [] for name in spec if name != "_id"}
+        for name, accumulator in spec.items():
+            if name == "_id":
+                continue
+            operator, expression = next(iter(accumulator.items()))
+            group_values[key][name].append(_evaluate(expression, doc))
+    result = []
+    for key, group in groups.items():
+        for name, accumulator in spec.items():
+            if name == "_id":
+                continue
+            operator = next(iter(accumulator))
+            values = group_values[key][name]
+            numbers = [v for v in values if _numeric(v)]
+            not_null = [v for v in values if v is not None]
+            if operator == "$sum":
+                group[name] = sum(numbers)
+            elif operator == "$avg":
+                group[name] = sum(numbers) / len(numbers) if numbers else None
+            elif operator == "$min":
+                group[name] = min(not_null, key=sort_key) if not_null else None
+            elif operator == "$max":
+                group[name] = max(not_null, key=sort_key) if not_null else None
+            elif operator == "$first":
+                group[name] = values[0] if values else None
+            elif operator == "$last":
+                group[name] = values[-1] if values else None
+            elif operator == "$push":
+                group[name] = values
+            elif operator == "$addToSet":
+                unique: list = []
+                for v in values:
+                    if not any(values_equal(v, u) for u in unique):
+                        unique.append(v)
+                group[name] = unique
+            elif operator == "$count":
+                group[name] = len(values)
+            else:
+                raise MotordanticUnsupportedOperation(operator, "accumulator")
+        result.append(group)
+    return result
+
+
+def _unwind(docs: List[dict], spec: Union[str, Mapping]) -> List[dict]:
+    if isinstance(spec, str):
+        path, preserve = spec[1:], False
+    else:
+        path, preserve = spec["path"][1:], spec.get("preserveNullAndEmptyArrays", False)
+    result = []
+    for doc in docs:
+        value = _get_path(doc, path)
+        if isinstance(value, list) and value:
+            for item in value:
+                new_doc = copy.deepcopy(doc)
+                _set_path(new_doc, path, item)
+                result.append(new_doc)
+        elif isinstance(value, list) or value is MISSING or value is None:
+            if preserve:
+                result.append(doc)
+        else:
+            result.append(doc)
+    return result
+
+
+def _elements(values: List[Any]) -> List[Any]:
+    """arrays replaced by their items, $lookup matches array fields by items"""
+    result: list = []
+    for value in values:
+        if isinstance(value, list):
+            result.extend(value)
+        else:
+            result.append(value)
+    return result
+
+
+def _run_pipeline_stages(
+    pipeline: Iterable[Mapping],
+    docs: List[dict],
+    database: Optional["MemoryDatabase"],
+) -> List[dict]:
+    for stage in pipeline:
+        name, spec = next(iter(stage.items()))
+        if name == "$match":
+            predicate = compile_filter(spec)
+            docs = [d for d in docs if predicate(d)]
+        elif name in ("$addFields", "$set"):
+            new_docs = []
+            for doc in docs:
+                new_doc = copy.deepcopy(doc)
+                for path, expression in spec.items():
+                    _set_path(new_doc, path, _evaluate(expression, doc))
+                new_docs.append(new_doc)
+            docs = new_docs
+        elif name == "$unset":
+            fields = [spec] if isinstance(spec, str) else spec
+            docs = [_project(d, {f: 0 for f in fields}) for d in docs]
+        elif name == "$project":
+            docs = [_project(d, spec) for d in docs]
+        elif name == "$group":
+            docs = _group(docs, spec)
+        elif name == "$sort":
+            docs = _sort_documents(docs, list(spec.items()))
+        elif name == "$skip":
+            docs = docs[spec:]
+        elif name == "$limit":
+            docs = docs[:spec]
+        elif name == "$count":
+            docs = [{spec: len(docs)}] if docs else []
+        elif name == "$unwind":
+            docs = _unwind(docs, spec)
+        elif name == "$facet":
+            docs = [
+                {
+                    facet_name: _run_pipeline_stages(
+                        facet_pipeline, copy.deepcopy(docs), database
+                    )
+                    for facet_name, facet_pipeline in spec.items()
+                }
+            ]
+        elif name in ("$replaceRoot", "$replaceWith"):
+            expression = spec["newRoot"] if name == "$replaceRoot" else spec
+            docs = [_evaluate(expression, d) for d in docs]
+        elif name == "$sample":
+            docs = random.sample(docs, min(spec["size"], len(docs)))
+        elif name == "$lookup":
+            if database is None:
+                raise MotordanticUnsupportedOperation(name, "stage outside aggregate")
+            foreign = database.get_collection(spec["from"])._store.documents
+            new_docs = []
+            for doc in docs:
+                local_values = _elements(resolve_path(doc, spec["localField"]))
+                new_doc = copy.deepcopy(doc)
+                new_doc[spec["as"]] = []
+                for f in foreign.values():
+                    values = resolve_path(f, spec["foreignField"])
+                    values = values + _elements(values)
+                    if any(values_equal(v, lv) for v in values for lv in local_values):
+                        new_doc[spec["as"]].append(copy.deepcopy(f))
+                new_docs.append(new_doc)
+            docs = new_docs
+        else:
+            raise MotordanticUnsupportedOperation(name, "aggregation stage")
+    return docs
+
+
+class _Store(object):
+    """documents and indexes of one collection"""
+
+    __slots__ = ("documents", "indexes", "watchers", "events", "counter")
+
+    def __init__(self):
+        self.documents: "OrderedDict[bytes, dict]" = OrderedDict()
+        self.indexes: Dict[str, dict] = {
+            "_id_": {"v": 2, "key": SON([("_id", 1)]), "name": "_id_"}
+        }
+        self.watchers: List[asyncio.Queue] = []
+        self.events: List[dict] = []
+        self.counter = 0
+
+
+class MemorySession(object):
+    """session stub, operations of in-memory backend are not transactional"""
+
+    def __init__(self, client: "MemoryClient"):
+        self.client = client
+        self.has_ended = False
+        self.in_transaction = False
+
+    async def end_session(self) -> None:
+        self.has_ended = True
+
+    def start_transaction(self, *args, **kwargs) -> "MemorySession":
+        self.in_transaction = True
+        return self
+
+    async def commit_transaction(self) -> None:
+        self.in_transaction = False
+
+    async def abort_transaction(self) -> None:
+        self.in_transaction = False
+
+    async def __aenter__(self) -> "MemorySession":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        self.in_transaction = False
+
+
+class MemoryCursor(object):
+    """async cursor over a snapshot of matched documents"""
+
+    def __init__(
+        self,
+        collection: "MemoryCollection",
+        filter: Optional[Mapping] = None,
+        projection: Optional[Mapping] = None,
+        skip: int = 0,
+        limit: int = 0,
+        sort: Optional[List[Tuple[str, Any]]] = None,
+        **kwargs,
+    ):
+        self._collection = collection
+        self._filter = filter or {}
+        self._projection = projection
+        self._skip = skip
+        self._limit = limit
+        self._sort = sort
+        self._iterator: Optional[Iterable] = None
+
+    def skip(self, skip: int) -> "MemoryCursor":
+        self._skip = skip
+        return self
+
+    def limit(self, limit: int) -> "MemoryCursor":
+        self._limit = limit
+        return self
+
+    def sort(self, key_or_list: Any, direction: Optional[int] = None) -> "MemoryCursor":
+        if isinstance(key_or_list, str):
+            self._sort = [(key_or_list, direction or 1)]
+        else:
+            self._sort = list(key_or_list)
+        return self
+
+    def batch_size(self, batch_size: int) -> "MemoryCursor":
+        return self
+
+    def _documents(self) -> List[dict]:
+        docs = self._collection._match(self._filter)
+        if self._sort:
+            docs = _sort_documents(docs, self._sort)
+        if self._skip:
+            docs = docs[self._skip :]
+        if self._limit:
+            docs = docs[: self._limit]
+        return [_project(d, self._projection) for d in docs]
+
+    def __aiter__(self) -> "MemoryCursor":
+        return self
+
+    async def __anext__(self) -> Any:
+        if self._iterator is None:
+            self._iterator = iter(self._documents())
+        try:
+            doc = next(self._iterator)  # type: ignore
+        except StopIteration:
+            raise StopAsyncIteration
+        return self._collection._to_output(doc)
+
+    async def next(self) -> Any:
+        return await self.__anext__()
+
+    async def to_list(self, length: Optional[int]) -> list:
+        result = []
+        async for doc in self:
+            result.append(doc)
+            if length and len(result) >= length:
+                break
+        return result
+
+    async def explain(self) -> dict:
+        examined = len(self._collection._store.documents)
+        returned = len(self._documents())
+        return {
+            "queryPlanner": {
+                "namespace": self._collection.full_name,
+                "parsedQuery": self._filter,
+                "winningPlan": {"stage": "COLLSCAN", "filter": self._filter},
+            },
+            "executionStats": {
+                "nReturned": returned,
+                "executionTimeMillis": 0,
+                "totalKeysExamined": 0,
+                "totalDocsExamined": examined,
+            },
+        }
+
+
+class MemoryCommandCursor(object):
+    """async cursor over precomputed results (aggregate, list_indexes)"""
+
+    def __init__(self, collection: "MemoryCollection", documents: List[dict]):
+        self._collection = collection
+        self._documents = documents
+        self._position = 0
+
+    def __aiter__(self) -> "MemoryCommandCursor":
+        return self
+
+    async def __anext__(self) -> Any:
+        if self._position >= len(self._documents):
+            raise StopAsyncIteration
+        doc = self._documents[self._position]
+        self._position += 1
+        return self._collection._to_output(doc)
+
+    async def next(self) -> Any:
+        return await self.__anext__()
+
+    async def to_list(self, length: Optional[int]) -> list:
+        result = []
+        async for doc in self:
+            result.append(doc)
+            if length and len(result) >= length:
+                break
+        return result
+
+
+class MemoryChangeStream(object):
+    """change stream fed by writes to the in-memory collection"""
+
+    def __init__(
+        self,
+        collection: "MemoryCollection",
+        pipeline: Optional[List[Mapping]] = None,
+        full_document: Optional[str] = None,
+        resume_after: Optional[Mapping] = None,
+        start_after: Optional[Mapping] = None,
+        **kwargs,
+    ):
+        self._collection = collection
+        self._pipeline = pipeline or []
+        self._full_document = full_document
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._closed = False
+        self.resume_token: Optional[Mapping] = resume_after or start_after
+        store = collection._store
+        token = resume_after or start_after
+        if isinstance(token, RawBSONDocument):
+            token = bson_decode(token.raw)
+        if token is not None:
+            replay = False
+            for event in store.events:
+                if replay:
+                    self._queue.put_nowait(event)
+                elif event["_id"] == token:
+                    replay = True
+        store.watchers.append(self._queue)
+
+    def __aiter__(self) -> "MemoryChangeStream":
+        return self
+
+    async def __anext__(self) -> Any:
+        while True:
+            if self._closed:
+                raise StopAsyncIteration
+            event = await self._queue.get()
+            if event is None:
+                raise StopAsyncIteration
+            if (
+                self._full_document != "updateLookup"
+                and event["operationType"] == "update"
+            ):
+                event = {k: v for k, v in event.items() if k != "fullDocument"}
+            self.resume_token = event["_id"]
+            if self._pipeline and not _run_pipeline_stages(
+                self._pipeline, [event], None
+            ):
+                continue
+            return self._collection._to_output(event)
+
+    async def next(self) -> Any:
+        return await self.__anext__()
+
+    async def try_next(self) -> Any:
+        if self._queue.empty():
+            return None
+        return await self.__anext__()
+
+    @property
+    def alive(self) -> bool:
+        return not self._closed
+
+    async def close(self) -> None:
+        self._closed = True
+        if self._queue in self._collection._store.watchers:
+            self._collection._store.watchers.remove(self._queue)
+        self._queue.put_nowait(None)
+
+    async def __aenter__(self) -> "MemoryChangeStream":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+
+class MemoryCollection(object):
+    """subset of motor AsyncIOMotorCollection api working on process memory"""
+
+    def __init__(
+        self,
+        database: "MemoryDatabase",
+        name: str,
+        codec_options: Optional[CodecOptions] = None,
+        read_preference: Any = None,
+        write_concern: Optional[WriteConcern] = None,
+        read_concern: Any = None,
+    ):
+        self.database = database
+        self.name = name
+        self.codec_options = codec_options or database.codec_options
+        self.read_preference = read_preference
+        self.write_concern = write_concern or WriteConcern()
+        self.read_concern = read_concern
+        self._store = database._stores.setdefault(name, _Store())
+
+    def __repr__(self) -> str:
+        return f"MemoryCollection({self.full_name})"
+
+    @property
+    def full_name(self) -> str:
+        return f"{self.database.name}.{self.name}"
+
+    def with_options(
+        self,
+        codec_options: Optional[CodecOptions] = None,
+        read_preference: Any = None,
+        write_concern: Optional[WriteConcern] = None,
+        read_concern: Any = None,
+    ) -> "MemoryCollection":
+        return MemoryCollection(
+            self.database,
+            self.name,
+            codec_options=codec_options or self.codec_options,
+            read_preference=read_preference or self.read_preference,
+            write_concern=write_concern or self.write_concern,
+            read_concern=read_concern or self.read_concern,
+        )
+
+    def get_io_loop(self) -> asyncio.AbstractEventLoop:
+        return self.database.client.io_loop
+
+    @property
+    def _acknowledged(self) -> bool:
+        return self.write_concern.acknowledged
+
+    def _to_output(self, doc: Mapping) -> Any:
+        document_class = self.codec_options.document_class
+        raw = bson_encode(doc, codec_options=self.codec_options)
+        if document_class is RawBSONDocument:
+            return RawBSONDocument(raw)
+        return bson_decode(raw, codec_options=self.codec_options)
+
+    def _prepare(self, doc: Any) -> dict:
+        if isinstance(doc, RawBSONDocument):
+            raw = doc.raw
+        else:
+            raw = bson_encode(doc, codec_options=self.codec_options)
+        return bson_decode(raw, codec_options=DEFAULT_CODEC_OPTIONS)
+
+    def _match(self, query: Optional[Mapping]) -> List[dict]:
+        if not query:
+            return list(self._store.documents.values())
+        if set(query) == {"_id"} and not isinstance(query["_id"], Mapping):
+            doc = self._store.documents.get(_id_key(query["_id"]))
+            return [doc] if doc is not None else []
+        predicate = compile_filter(query)
+        return [doc for doc in self._store.documents.values() if predicate(doc)]
+
+    def _check_unique(self, doc: dict, exclude: Optional[bytes] = None) -> None:
+        for index in self._store.indexes.values():
+            if not index.get("unique") or index["name"] == "_id_":
+                continue
+            keys = list(index["key"].keys())
+            value = [_get_path(doc, k) for k in keys]
+            value = [None if v is MISSING else v for v in value]
+            for key, other in self._store.documents.items():
+                if key == exclude:
+                    continue
+                other_value = [_get_path(other, k) for k in keys]
+                other_value = [None if v is MISSING else v for v in other_value]
+                if all(values_equal(a, b) for a, b in zip(value, other_value)):
+                    raise DuplicateKeyError(
+                        f"E11000 duplicate key error collection: {self.full_name} index: {index['name']}",
+                        11000,
+                    )
+
+    def _emit(self, operation_type: str, doc_id: Any, **extra) -> None:
+        store = self._store
+        store.counter += 1
+        event = {
+            "_id": {"_data": f"{store.counter:016x}"},
+            "operationType": operation_type,
+            "ns": {"db": self.database.name, "coll": self.name},
+            "documentKey": {"_id": doc_id},
+            **extra,
+        }
+        store.events.append(event)
+        for queue in store.watchers:
+            queue.put_nowait(copy.deepcopy(event))
+
+    def _insert(self, doc: Any) -> Any:
+        prepared = self._prepare(doc)
+        if "_id" not in prepared:
+            prepared = {"_id": ObjectId(), **prepared}
+        key = _id_key(prepared["_id"])
+        if key in self._store.documents:
+            raise DuplicateKeyError(
+                f"E11000 duplicate key error collection: {self.full_name} index: _id_",
+                11000,
+            )
+        self._check_unique(prepared)
+        self._store.documents[key] = prepared
+        self._emit("insert", prepared["_id"], fullDocument=copy.deepcopy(prepared))
+        return prepared["_id"]
+
+    def _update(
+        self,
+        query: Mapping,
+        update: Union[Mapping, List],
+        upsert: bool,
+        multi: bool,
+        replacement: bool = False,
+    ) -> Tuple[int, int, Any, Optional[dict], Optional[dict]]:
+        if not replacement and isinstance(update, Mapping):
+            if not update or not all(k.startswith("$") for k in update):
+                raise ValueError("update only works with $ operators")
+        docs = self._match(query)
+        if not multi:
+            docs = docs[:1]
+        modified = 0
+        before = after = None
+        for doc in docs:
+            key = _id_key(doc["_id"])
+            new_doc = copy.deepcopy(doc)
+            if replacement:
+                new_doc = {"_id": doc["_id"], **self._prepare(update)}
+            else:
+                _apply_update(new_doc, update, is_insert=False)
+            new_doc = self._prepare(new_doc)
+            before, after = doc, new_doc
+            if new_doc != doc:
+                self._check_unique(new_doc, exclude=key)
+                self._store.documents[key] = new_doc
+                modified += 1
+                self._emit(
+                    "replace" if replacement else "update",
+                    doc["_id"],
+                    fullDocument=copy.deepcopy(new_doc),
+                    updateDescription={
+                        "updatedFields": {
+                            k: v for k, v in new_doc.items() if doc.get(k, MISSING) != v
+                        },
+                        "removedFields": [k for k in doc if k not in new_doc],
+                    },
+                )
+        if docs or not upsert:
+            return len(docs), modified, None, before, after
+        if replacement:
+            new_doc = self._prepare(update)
+        else:
+            new_doc = _upsert_base(query)
+            _apply_update(new_doc, update, is_insert=True)
+        upserted_id = self._insert(new_doc)
+        return 0, 0, upserted_id, None, self._store.documents[_id_key(upserted_id)]
+
+    async def insert_one(
+        self, document: Any, session: Any = None, **kwargs
+    ) -> InsertOneResult:
+        inserted_id = self._insert(document)
+        return InsertOneResult(inserted_id, self._acknowledged)
+
+    async def insert_many(
+        self,
+        documents: Iterable[Any],
+        ordered: bool = True,
+        bypass_document_validation: bool = False,
+        session: Any = None,
+        **kwargs,
+    ) -> InsertManyResult:
+        inserted_ids = []
+        errors = []
+        for index, document in enumerate(documents):
+            try:
+                inserted_ids.append(self._insert(document))
+            except DuplicateKeyError as e:
+                errors.append({"index": index, "code": 11000, "errmsg": str(e)})
+                if ordered:
+                    break
+        if errors:
+            raise BulkWriteError(
+                {"writeErrors": errors, "nInserted": len(inserted_ids)}
+            )
+        return InsertManyResult(inserted_ids, self._acknowledged)
+
+    async def update_one(
+        self,
+        filter: Mapping,
+        update: Union[Mapping, List],
+        upsert: bool = False,
+        session: Any = None,
+        **kwargs,
+    ) -> UpdateResult:
+        matched, modified, upserted_id, _, _ = self._update(
+            filter, update, upsert, multi=False
+        )
+        return self._update_result(matched, modified, upserted_id)
+
+    async def update_many(
+        self,
+        filter: Mapping,
+        update: Union[Mapping, List],
+        upsert: bool = False,
+        session: Any = None,
+        **kwargs,
+    ) -> UpdateResult:
+        matched, modified, upserted_id, _, _ = self._update(
+            filter, update, upsert, multi=True
+        )
+        return self._update_result(matched, modified, upserted_id)
+
+    async def replace_one(
+        self,
+        filter: Mapping,
+        replacement: Mapping,
+        upsert: bool = False,
+        session: Any = None,
+        **kwargs,
+    ) -> UpdateResult:
+        matched, modified, upserted_id, _, _ = self._update(
+            filter, replacement, upsert, multi=False, replacement=True
+        )
+        return self._update_result(matched, modified, upserted_id)
+
+    def _update_result(
+        self, matched: int, modified: int, upserted_id: Any
+    ) -> UpdateResult:
+        raw_result: Dict[str, Any] = {
+            "n": matched or int(upserted_id is not None),
+            "nModified": modified,
+        }
+        if upserted_id is not None:
+            raw_result["upserted"] = upserted_id
+        return UpdateResult(raw_result, self._acknowledged)
+
+    def _delete(self, query: Mapping, multi: bool) -> List[dict]:
+        docs = self._match(query)
+        if not multi:
+            docs = docs[:1]
+        for doc in docs:
+            del self._store.documents[_id_key(doc["_id"])]
+            self._emit("delete", doc["_id"])
+        return docs
+
+    async def delete_one(
+        self, filter: Mapping, session: Any = None, **kwargs
+    ) -> DeleteResult:
+        return DeleteResult({"n": len(self._delete(filter, False))}, self._acknowledged)
+
+    async def delete_many(
+        self, filter: Mapping, session: Any = None, **kwargs
+    ) -> DeleteResult:
+        return DeleteResult({"n": len(self._delete(filter, True))}, self._acknowledged)
+
+    async def find_one_and_delete(
+        self, filter: Mapping, projection: Optional[Mapping] = None, **kwargs
+    ) -> Any:
+        if kwargs.get("sort"):
+            docs = _sort_documents(self._match(filter), kwargs["sort"])[:1]
+            filter = {"_id": docs[0]["_id"]} if docs else filter
+        docs = self._delete(filter, False)
+        return self._to_output(_project(docs[0], projection)) if docs else None
+
+    async def _find_and_modify(
+        self,
+        filter: Mapping,
+        update: Any,
+        projection: Optional[Mapping],
+        sort: Optional[List],
+        upsert: bool,
+        return_document: bool,
+        replacement: bool,
+    ) -> Any:
+        if sort:
+            docs = _sort_documents(self._match(filter), sort)[:1]
+            if docs:
+                filter = {"_id": docs[0]["_id"]}
+        _, _, _, before, after = self._update(
+            filter, update, upsert, multi=False, replacement=replacement
+        )
+        doc = after if return_document == ReturnDocument.AFTER else before
+        if doc is None:
+            return None
+        return self._to_output(_project(doc, projection))
+
+    async def find_one_and_update(
+        self,
+        filter: Mapping,
+        update: Union[Mapping, List],
+        projection: Optional[Mapping] = None,
+        sort: Optional[List] = None,
+        upsert: bool = False,
+        return_document: bool = ReturnDocument.BEFORE,
+        session: Any = None,
+        **kwargs,
+    ) -> Any:
+        return await self._find_and_modify(
+            filter, update, projection, sort, upsert, return_document, False
+        )
+
+    async def find_one_and_replace(
+        self,
+        filter: Mapping,
+        replacement: Mapping,
+        projection: Optional[Mapping] = None,
+        sort: Optional[List] = None,
+        upsert: bool = False,
+        return_document: bool = ReturnDocument.BEFORE,
+        session: Any = None,
+        **kwargs,
+    ) -> Any:
+        return await self._find_and_modify(
+            filter, replacement, projection, sort, upsert, return_document, True
+        )
+
+    async def bulk_write(
+        self, requests: List[Any], ordered: bool = True, session: Any = None, **kwargs
+    ) -> BulkWriteResult:
+        result = {
+            "nInserted": 0,
+            "nMatched": 0,
+            "nModified": 0,
+            "nRemoved": 0,
+            "nUpserted": 0,
+            "upserted": [],
+            "writeErrors": [],
+            "writeConcernErrors": [],
+        }
+        for index, request in enumerate(requests):
+            if isinstance(request, InsertOne):
+                self._insert(request._doc)
+                result["nInserted"] += 1
+            elif isinstance(request, (UpdateOne, UpdateMany, ReplaceOne)):
+                matched, modified, upserted_id, _, _ = self._update(
+                    request._filter,
+                    request._doc,
+                    bool(request._upsert),
+                    multi=isinstance(request, UpdateMany),
+                    replacement=isinstance(request, ReplaceOne),
+                )
+                result["nMatched"] += matched
+                result["nModified"] += modified
+                if upserted_id is not None:
+                    result["nUpserted"] += 1
+                    result["upserted"].append({"index": index, "_id": upserted_id})
+            elif isinstance(request, (DeleteOne, DeleteMany)):
+                result["nRemoved"] += len(
+                    self._delete(request._filter, isinstance(request, DeleteMany))
+                )
+            else:
+                raise TypeError(f"{request!r} is not a valid request")
+        return BulkWriteResult(result, self._acknowledged)
+
+    def find(self, *args, **kwargs) -> MemoryCursor:
+        if args:
+            kwargs["filter"] = args[0]
+        if len(args) > 1:
+            kwargs["projection"] = args[1]
+        kwargs.pop("session", None)
+        return MemoryCursor(self, **kwargs)
+
+    async def find_one(self, filter: Optional[Mapping] = None, *args, **kwargs) -> Any:
+        if filter is not None and not isinstance(filter, Mapping):
+            filter = {"_id": filter}
+        kwargs.pop("session", None)
+        cursor = self.find(filter, *args, **kwargs).limit(1)
+        async for doc in cursor:
+            return doc
+        return None
+
+    async def count_documents(
+        self, filter: Mapping, session: Any = None, **kwargs
+    ) -> int:
+        docs = self._match(filter)
+        if kwargs.get("skip"):
+            docs = docs[kwargs["skip"] :]
+        if kwargs.get("limit"):
+            docs = docs[: kwargs["limit"]]
+        return len(docs)
+
+    async def estimated_document_count(self, **kwargs) -> int:
+        return len(self._store.documents)
+
+    async def distinct(
+        self, key: str, filter: Optional[Mapping] = None, session: Any = None, **kwargs
+    ) -> list:
+        result: list = []
+        for doc in self._match(filter):
+            for value in resolve_path(doc, key):
+                values = value if isinstance(value, list) else [value]
+                for v in values:
+                    if not any(values_equal(v, r) for r in result):
+                        result.append(v)
+        return result
+
+    def aggregate(
+        self, pipeline: List[Mapping], session: Any = None, **kwargs
+    ) -> MemoryCommandCursor:
+        docs = _run_pipeline_stages(
+            pipeline, [copy.deepcopy(d) for d in self._match(None)], self.database
+        )
+        return MemoryCommandCursor(self, docs)
+
+    def watch(
+        self,
+        pipeline: Optional[List[Mapping]] = None,
+        full_document: Optional[str] = None,
+        resume_after: Optional[Mapping] = None,
+        session: Any = None,
+        start_after: Optional[Mapping] = None,
+        **kwargs,
+    ) -> MemoryChangeStream:
+        return MemoryChangeStream(
+            self,
+            pipeline=pipeline,
+            full_document=full_document,
+            resume_after=resume_after,
+            start_after=start_after,
+        )
+
+    def list_indexes(self, session: Any = None, **kwargs) -> MemoryCommandCursor:
+        return MemoryCommandCursor(self, list(self._store.indexes.values()))
+
+    async def index_information(self, session: Any = None, **kwargs) -> dict:
+        return {
+            name: {k: v for k, v in index.items() if k != "name"}
+            for name, index in self._store.indexes.items()
+        }
+
+    def _create_index(self, document: Mapping) -> str:
+        keys = _key_spec(document["key"])
+        name = document.get("name") or _index_name(keys)
+        existing = self._store.indexes.get(name)
+        spec = {"v": 2, **{k: v for k, v in document.items() if k != "key"}}
+        spec["key"] = SON(keys)
+        spec["name"] = name
+        if existing is not None and existing != spec:
+            raise OperationFailure(
+                f"An existing index has the same name as the requested index: {name}",
+                86,
+            )
+        if spec.get("unique"):
+            seen: list = []
+            for doc in self._store.documents.values():
+                value = [_get_path(doc, k) for k, _ in keys]
+                if any(all(values_equal(a, b) for a, b in zip(value, s)) for s in seen):
+                    raise DuplicateKeyError(
+                        f"E11000 duplicate key error collection: {self.full_name} index: {name}",
+                        11000,
+                    )
+                seen.append(value)
+        self._store.indexes[name] = spec
+        return name
+
+    async def create_index(self, keys: Any, session: Any = None, **kwargs) -> str:
+        kwargs.pop("background", None)
+        return self._create_index({"key": keys, **kwargs})
+
+    async def create_indexes(
+        self, indexes: List[IndexModel], session: Any = None, **kwargs
+    ) -> List[str]:
+        return [self._create_index(index.document) for index in indexes]
+
+    async def drop_index(
+        self, index_or_name: Any, session: Any = None, **kwargs
+    ) -> None:
+        name = (
+            index_or_name
+            if isinstance(index_or_name, str)
+            else _index_name(_key_spec(index_or_name))
+        )
+        if name == "_id_" or name not in self._store.indexes:
+            raise OperationFailure(f"index not found with name [{name}]", 27)
+        del self._store.indexes[name]
+
+    async def drop_indexes(self, session: Any = None, **kwargs) -> None:
+        for name in list(self._store.indexes):
+            if name != "_id_":
+                del self._store.indexes[name]
+
+    async def drop(self, session: Any = None, **kwargs) -> None:
+        store = self.database._stores.pop(self.name, None)
+        if store is not None:
+            for queue in store.watchers:
+                queue.put_nowait(None)
+        self._store = self.database._stores.setdefault(self.name, _Store())
+
+
+class MemoryDatabase(object):
+    """subset of motor AsyncIOMotorDatabase api"""
+
+    def __init__(self, client: "MemoryClient", name: str):
+        self.client = client
+        self.name = name
+        self.codec_options = client.codec_options
+        self._stores: Dict[str, _Store] = client._storage.setdefault(name, {})
+
+    def __repr__(self) -> str:
+        return f"MemoryDatabase({self.name})"
+
+    def __getitem__(self, name: str) -> MemoryCollection:
+        return self.get_collection(name)
+
+    def __getattr__(self, name: str) -> MemoryCollection:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self.get_collection(name)
+
+    def get_collection(self, name: str, **kwargs) -> MemoryCollection:
+        return MemoryCollection(self, name, **kwargs)
+
+    async def list_collection_names(self, session: Any = None, **kwargs) -> List[str]:
+        return list(self._stores)
+
+    async def drop_collection(self, name: str, session: Any = None, **kwargs) -> None:
+        await self.get_collection(name).drop()
+
+    async def command(self, command: Union[str, Mapping], *args, **kwargs) -> dict:
+        name = command if isinstance(command, str) else next(iter(command))
+        if name == "ping":
+            return {"ok": 1.0}
+        if name == "explain":
+            explained = args[0] if args else command[name]  # type: ignore
+            collection = self.get_collection(
+                explained.get("find")
+                or explained.get("aggregate")
+                or explained.get("count")
+            )
+            query = explained.get("filter", explained.get("query", {}))
+            for stage in explained.get("pipeline", ())[:1]:
+                query = stage.get("$match", query)
+            cursor = collection.find(query)
+            return await cursor.explain()
+        raise MotordanticUnsupportedOperation(name, "command")
+
+
+class MemoryClient(object):
+    """in-memory replacement of AsyncIOMotorClient for tests and benchmarks
+
+    Supports the subset of collection methods used by :class:`Builder`,
+    documents are stored decoded and returned like motor returns them.
+    """
+
+    def __init__(self, host: Any = None, document_class: type = dict, **kwargs):
+        self.address = host
+        self.codec_options = CodecOptions(document_class=document_class)
+        self._storage: Dict[str, Dict[str, _Store]] = {}
+
+    def __repr__(self) -> str:
+        return f"MemoryClient({self.address})"
+
+    @property
+    def io_loop(self) -> asyncio.AbstractEventLoop:
+        try:
+            return asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.get_event_loop_policy().get_event_loop()
+
+    def get_io_loop(self) -> asyncio.AbstractEventLoop:
+        return self.io_loop
+
+    def __getitem__(self, name: str) -> MemoryDatabase:
+        return self.get_database(name)
+
+    def get_database(self, name: str, **kwargs) -> MemoryDatabase:
+        return MemoryDatabase(self, name)
+
+    async def list_database_names(self, session: Any = None) -> List[str]:
+        return list(self._storage)
+
+    async def drop_database(self, name: str, session: Any = None) -> None:
+        self._storage.pop(name, None)
+
+    async def start_session(self, **kwargs) -> MemorySession:
+        return MemorySession(self)
+
+    def close(self) -> None:
+        pass
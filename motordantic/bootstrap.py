@@ -0,0 +1,94 @@
+import asyncio
+from typing import TYPE_CHECKING, Iterable, List, Optional, Type
+
+from .exceptions import MotordanticValidationError
+from .field_paths import build_field_paths
+from .indexes import IndexPlan, sync_all_indexes
+from .manager import ODMManager
+from .registry import get_documents
+from .utils.pydantic import IS_PYDANTIC_V2, get_config_value
+
+__all__ = ("init", "check_relations", "warm_document")
+
+if TYPE_CHECKING:
+    from .connection import MotordanticConnection
+    from .document import Document
+
+
+def check_relations(documents: Iterable[Type["Document"]]) -> None:
+    """check relation fields point to concrete registered documents
+
+    Raises:
+        MotordanticValidationError: list of unresolved relations
+    """
+    from .document import Document
+
+    registered = set(get_documents())
+    errors = []
+    for document_class in documents:
+        for field, relation_info in (document_class.__db_refs__ or {}).items():
+            target = relation_info.document_class
+            if not isinstance(target, type) or not issubclass(target, Document):
+                errors.append(
+                    f"{document_class.__name__}.{field}: {target!r} is not a Document"
+                )
+            elif target not in registered:
+                errors.append(
+                    f"{document_class.__name__}.{field}: {target.__name__} is not registered"
+                )
+    if errors:
+        raise MotordanticValidationError(f"invalid relations: {'; '.join(errors)}")
+
+
+def warm_document(document_class: Type["Document"]) -> None:
+    """build lazily created validators, inner field paths and collection handle before first query"""
+    if IS_PYDANTIC_V2 and not getattr(document_class, "__pydantic_complete__", True):
+        document_class.model_rebuild()  # type: ignore
+    build_field_paths(document_class)
+    document_class.manager.get_collection()
+
+
+async def init(
+    connection: Optional["MotordanticConnection"] = None,
+    documents: Optional[Iterable[Type["Document"]]] = None,
+    ensure_indexes: bool = True,
+    warm: bool = True,
+) -> List[IndexPlan]:
+    """application startup: check relations, warm documents and sync indexes concurrently
+
+    Args:
+        connection (Optional[MotordanticConnection], optional): connection to use, current if None. Defaults to None.
+        documents (Optional[Iterable[Type[Document]]], optional): document classes, all registered if None. Defaults to None.
+        ensure_indexes (bool, optional): sync Config.indexes of documents. Defaults to True.
+        warm (bool, optional): build lazy validators, collection handles and open pool connection. Defaults to True.
+
+    Raises:
+        MotordanticValidationError: relation points to not registered document
+
+    Returns:
+        List[IndexPlan]: applied index plans
+    """
+    if connection is not None and ODMManager.__connection__ is not connection:
+        ODMManager.use(connection)
+    selected = tuple(get_documents() if documents is None else documents)
+    check_relations(selected)
+    ping = None
+    if warm:
+        for document_class in selected:
+            warm_document(document_class)
+        if selected:
+            ping = selected[0].manager.database.command("ping")
+    plans: List[IndexPlan] = []
+    if ensure_indexes:
+        sync = sync_all_indexes(
+            None
+            if documents is None
+            else [d for d in selected if get_config_value(d, "indexes")]
+        )
+        if ping is not None:
+            plans = (await asyncio.gather(sync, ping))[0]
+        else:
+            plans = await sync
+    elif ping is not None:
+        await ping
+    return plans
@@ -0,0 +1,158 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Dict, Optional, Set, Tuple
+
+from bson import encode as bson_encode
+from bson.errors import InvalidDocument
+from bson.raw_bson import RawBSONDocument
+
+__all__ = ("BaseCacheBackend", "MemoryCache", "make_cache_key")
+
+
+def make_cache_key(operation: str, query: dict, **options) -> Optional[bytes]:
+    """build cache key from compiled query
+
+    Args:
+        operation (str): builder operation like find, find_one, count
+        query (dict): compiled query
+
+    Returns:
+        Optional[bytes]: bson encoded key or None if query can't be encoded
+    """
+    try:
+        return bson_encode({"op": operation, "filter": query, **options})
+    except (InvalidDocument, TypeError):
+        return None
+
+
+def _estimate_size(value: Any) -> int:
+    if isinstance(value, RawBSONDocument):
+        return len(value.raw)
+    if isinstance(value, (list, tuple)):
+        return sum(_estimate_size(v) for v in value) + 8
+    return 8
+
+
+class BaseCacheBackend(ABC):
+    """interface for query result cache backends
+
+    Values are rows returned by motor (RawBSONDocument) or counters,
+    namespace is a collection name and used for invalidation.
+
+    Every invalidation bumps in-process generation of namespace, value fetched
+    while generation changed is stale and is not stored. Subclasses must call
+    super().__init__().
+    """
+
+    __slots__ = ("_generations",)
+
+    def __init__(self) -> None:
+        self._generations: Dict[str, int] = {}
+
+    def generation(self, namespace: str) -> int:
+        """count of namespace invalidations"""
+        return self._generations.get(namespace, 0)
+
+    def bump_generation(self, namespace: str) -> None:
+        self._generations[namespace] = self._generations.get(namespace, 0) + 1
+
+    @abstractmethod
+    async def get(self, namespace: str, key: bytes) -> Any:
+        """return cached value or None"""
+
+    @abstractmethod
+    async def set(self, namespace: str, key: bytes, value: Any) -> None:
+        """store value of key"""
+
+    @abstractmethod
+    async def invalidate(self, namespace: str) -> None:
+        """drop all cached values of namespace"""
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """drop all cached values"""
+
+
+class MemoryCache(BaseCacheBackend):
+    """in-process LRU cache with ttl and size limits
+
+    Args:
+        ttl (Optional[float], optional): seconds to keep value. Defaults to 60.
+        max_size (int, optional): max count of cached values. Defaults to 1024.
+        max_bytes (Optional[int], optional): max size of cached rows in bytes. Defaults to None.
+    """
+
+    __slots__ = (
+        "ttl",
+        "max_size",
+        "max_bytes",
+        "_data",
+        "_namespaces",
+        "_bytes",
+    )
+
+    def __init__(
+        self,
+        ttl: Optional[float] = 60,
+        max_size: int = 1024,
+        max_bytes: Optional[int] = None,
+    ):
+        super().__init__()
+        self.ttl = ttl
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self._data: "OrderedDict[Tuple[str, bytes], Tuple[Optional[float], int, Any]]" = OrderedDict()
+        self._namespaces: Dict[str, Set[bytes]] = {}
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def _pop(self, namespace: str, key: bytes) -> None:
+        _, size, _ = self._data.pop((namespace, key))
+        self._bytes -= size
+        keys = self._namespaces.get(namespace)
+        if keys is not None:
+            keys.discard(key)
+
+    async def get(self, namespace: str, key: bytes) -> Any:
+        item = self._data.get((namespace, key))
+        if item is None:
+            return None
+        expires_at, _, value = item
+        if expires_at is not None and expires_at < monotonic():
+            self._pop(namespace, key)
+            return None
+        self._data.move_to_end((namespace, key))
+        return value
+
+    async def set(self, namespace: str, key: bytes, value: Any) -> None:
+        size = _estimate_size(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        if (namespace, key) in self._data:
+            self._pop(namespace, key)
+        expires_at = monotonic() + self.ttl if self.ttl is not None else None
+        self._data[(namespace, key)] = (expires_at, size, value)
+        self._namespaces.setdefault(namespace, set()).add(key)
+        self._bytes += size
+        while len(self._data) > self.max_size or (
+            self.max_bytes is not None and self._bytes > self.max_bytes
+        ):
+            oldest_namespace, oldest_key = next(iter(self._data))
+            self._pop(oldest_namespace, oldest_key)
+
+    async def invalidate(self, namespace: str) -> None:
+        for key in self._namespaces.pop(namespace, set()):
+            _, size, _ = self._data.pop((namespace, key))
+            self._bytes -= size
+
+    async def clear(self) -> None:
+        self._data.clear()
+        self._namespaces.clear()
+        self._bytes = 0
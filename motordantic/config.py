@@ -1,4 +1,4 @@
-from typing import TypedDict, Union
+from typing import Any, TypedDict, Union
 from .utils.pydantic import IS_PYDANTIC_V2
 
 if IS_PYDANTIC_V2:
@@ -7,9 +7,19 @@ if IS_PYDANTIC_V2:
     class ConfigDict(BaseConfigDict):  # type: ignore
         indexes: list
         excluded_query_fields: Union[tuple, list]
+        cache: Any
+        count_cache_ttl: float
+        slow_query_ms: float
+        slow_query_explain: bool
+        abstract: bool
 
 else:
 
     class ConfigDict(TypedDict, total=False):  # type: ignore
         indexes: list
         excluded_query_fields: Union[tuple, list]
+        cache: Any
+        count_cache_ttl: float
+        slow_query_ms: float
+        slow_query_explain: bool
+        abstract: bool
@@ -1,11 +1,16 @@
 import os
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-from motor.motor_asyncio import AsyncIOMotorClient
 from bson.raw_bson import RawBSONDocument
 
 from .singleton import Singleton
 from .manager import ODMManager
+from .exceptions import MotordanticConnectionError
+
+if TYPE_CHECKING:
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+BACKENDS = ("motor", "memory")
 
 
 class MotordanticConnection(object, metaclass=Singleton):
@@ -17,6 +22,7 @@ class MotordanticConnection(object, metaclass=Singleton):
         "connect_timeout_ms",
         "socket_timeout_ms",
         "ssl_cert_path",
+        "backend",
     )
 
     _connections: dict = {}
@@ -30,7 +36,12 @@ class MotordanticConnection(object, metaclass=Singleton):
         server_selection_timeout_ms: int = 60000,
         connect_timeout_ms: int = 30000,
         socket_timeout_ms: int = 60000,
+        backend: str = "motor",
     ):
+        if backend not in BACKENDS:
+            raise MotordanticConnectionError(
+                f"invalid backend - {backend}, use one of {BACKENDS}"
+            )
         self.address = address
         self.database_name = database_name
         self.max_pool_size = max_pool_size
@@ -38,8 +49,16 @@ class MotordanticConnection(object, metaclass=Singleton):
         self.server_selection_timeout_ms = server_selection_timeout_ms
         self.connect_timeout_ms = connect_timeout_ms
         self.socket_timeout_ms = socket_timeout_ms
+        self.backend = backend
+
+    def _init_mongo_connection(self, connect: bool = False) -> "AsyncIOMotorClient":  # type: ignore
+        if self.backend == "memory":
+            from .backends.memory import MemoryClient
+
+            return MemoryClient(self.address, document_class=RawBSONDocument)  # type: ignore
+        # motor is imported on first connection, not with motordantic
+        from motor.motor_asyncio import AsyncIOMotorClient
 
-    def _init_mongo_connection(self, connect: bool = False) -> AsyncIOMotorClient:  # type: ignore
         connection_params: dict = {
             "host": self.address,
             "connect": connect,
@@ -61,7 +80,7 @@ class MotordanticConnection(object, metaclass=Singleton):
         print(client.tls)
         return client
 
-    def _get_motor_client(self) -> AsyncIOMotorClient:  # type: ignore
+    def _get_motor_client(self) -> "AsyncIOMotorClient":  # type: ignore
         pid = os.getpid()
         if pid in self._connections:
             return self._connections[pid]
@@ -79,6 +98,7 @@ def connect(
     server_selection_timeout_ms: int = 60000,
     connect_timeout_ms: int = 30000,
     socket_timeout_ms: int = 60000,
+    backend: str = "motor",
 ) -> MotordanticConnection:
     """init connection to mongodb
 
@@ -90,10 +110,19 @@ def connect(
         server_selection_timeout_ms (int, optional): ServerSelectionTimeoutMS. Defaults to 60000.
         connect_timeout_ms (int, optional): ConnectionTimeoutMS. Defaults to 30000.
         socket_timeout_ms (int, optional): SocketTimeoutMS. Defaults to 60000.
+        backend (str, optional): motor or memory, in-process storage for tests and benchmarks. Defaults to "motor".
 
     Returns:
         MotordanticConnection: motordantic connection
+
+    Raises:
+        MotordanticConnectionError: connection with another backend is already open
     """
+    live = Singleton._instances.get(MotordanticConnection)
+    if live is not None and live.backend != backend:
+        raise MotordanticConnectionError(
+            f"connection with {live.backend} backend is already open, can not switch to {backend}"
+        )
     os.environ["MOTORDANTIC_DATABASE"] = database_name
     os.environ["MOTORDANTIC_ADDRESS"] = address
     os.environ["MOTORDANTIC_MAX_POOL_SIZE"] = str(max_pool_size)
@@ -112,6 +141,7 @@ def connect(
         connect_timeout_ms=connect_timeout_ms,
         socket_timeout_ms=socket_timeout_ms,
         ssl_cert_path=ssl_cert_path,
+        backend=backend,
     )
     ODMManager.use(connection)
     return connection
@@ -1,4 +1,3 @@
-import json
 from typing import (
     Dict,
     Any,
@@ -9,43 +8,40 @@ from typing import (
     TYPE_CHECKING,
     ClassVar,
     TypeVar,
+    Type,
 )
 
 from bson import ObjectId, DBRef, decode as bson_decode
 from bson.raw_bson import RawBSONDocument
-from motor.core import AgnosticClientSession
 
 from pydantic import (
     BaseModel as BasePydanticModel,
     ValidationError,
 )
 
-from pymongo import IndexModel
-
-from .utils.pydantic import IS_PYDANTIC_V2
+from .utils.pydantic import IS_PYDANTIC_V2, get_extra_field_info, get_model_fields
 from .relation import RelationManager
 from .types import ObjectIdStr, RelationInfo, Relation
-from .exceptions import (
-    MotordanticValidationError,
-    MotordanticConnectionError,
-)
+from .exceptions import MotordanticValidationError
 from .property import classproperty
 from .query.extra import take_relation
 from .config import ConfigDict
+from .encoders import dumps
+from .row import DocumentRow, build_row_class
+from .indexes import IndexPlan, sync_indexes
+from .registry import declares_abstract, register_document
 
 from .manager import ODMManager
 
 if IS_PYDANTIC_V2:
     import pydantic.main as pydantic_main
     from pydantic import model_validator  # type: ignore
-    from .utils.typing import resolve_annotations
 
     PydanticModelMetaclass = pydantic_main._model_construction.ModelMetaclass  # type: ignore
 else:
     from pydantic.main import (
         ModelMetaclass as PydanticModelMetaclass,
     )
-    from pydantic.typing import resolve_annotations
     from pydantic import root_validator  # type: ignore
 
 
@@ -53,7 +49,9 @@ __all__ = ("Document", "DocumentMetaclass", "DocType")
 
 if TYPE_CHECKING:
     from asyncio import AbstractEventLoop
+    from motor.core import AgnosticClientSession
     from .custom_typing import DictStrAny, AbstractSetIntStr, SetStr
+    from .field_paths import FieldPath
     from .query import Builder
     from .sync.query import SyncQueryBuilder
 
@@ -61,20 +59,75 @@ if TYPE_CHECKING:
 _is_document_class_defined = False
 DocType = TypeVar("DocType", bound="Document")
 
+_NOT_PROPERTIES = frozenset(
+    (
+        "__values__",
+        "data",
+        "querybuilder",
+        "Q",
+        "Qsync",
+        "pk",
+        "_query_data",
+        "_mongo_query_data",
+        "__fields_set__",
+        "model_fields_set",
+        "model_extra",
+        "fields_all",
+        "_io_loop",
+    )
+)
+
+
+def _collect_properties(cls) -> Tuple[str, ...]:
+    """names of python properties declared on document class and its bases"""
+    properties = []
+    for name in dir(cls):
+        if name in _NOT_PROPERTIES:
+            continue
+        for klass in cls.__mro__:
+            if name in klass.__dict__:
+                if isinstance(klass.__dict__[name], property):
+                    properties.append(name)
+                break
+    return tuple(properties)
+
+
+def _db_field_mappings(cls) -> Tuple[Dict[str, str], Dict[str, str], Dict[str, str]]:
+    """field -> db field, db field -> field and renamed fields only
+
+    Raises:
+        ValueError: invalid or duplicated db_field
+    """
+    mapping_query_fields = {"_id": "_id"}
+    db_fields = {}
+    for field_name, field in get_model_fields(cls).items():
+        db_field = get_extra_field_info(field, "db_field") or field_name
+        if db_field != field_name:
+            if (
+                not isinstance(db_field, str)
+                or db_field.startswith("$")
+                or "." in db_field
+                or db_field == "_id"
+            ):
+                raise ValueError(f"{field_name}: invalid db_field - {db_field!r}")
+            db_fields[field_name] = db_field
+        mapping_query_fields[field_name] = db_field
+    mapping_from_fields = {
+        db_field: cls_field for cls_field, db_field in mapping_query_fields.items()
+    }
+    if len(mapping_from_fields) != len(mapping_query_fields):
+        raise ValueError(f"{cls.__name__}: db_field values must be unique")
+    return mapping_query_fields, mapping_from_fields, db_fields
+
 
 class DocumentMetaclass(PydanticModelMetaclass):  # type: ignore
     def __new__(mcs, name, bases, namespace, **kwargs):  # type: ignore
-        annotations = resolve_annotations(
-            namespace.get("__annotations__", {}), namespace.get("__module__")
-        )
-        mapping_query_fields = {"_id": "_id"}
-        for field_name in annotations:
-            mapping_query_fields[field_name] = field_name
-        namespace["__mapping_query_fields__"] = mapping_query_fields
-        namespace["__mapping_from_fields__"] = {
-            db_field: cls_field for cls_field, db_field in mapping_query_fields.items()
-        }
         cls = super().__new__(mcs, name, bases, namespace, **kwargs)
+        # maps are precomputed once, reads and writes skip them without db_field
+        mapping_query_fields, mapping_from_fields, db_fields = _db_field_mappings(cls)
+        setattr(cls, "__mapping_query_fields__", mapping_query_fields)
+        setattr(cls, "__mapping_from_fields__", mapping_from_fields)
+        setattr(cls, "__db_fields__", db_fields)
         indexes = set()
         if _is_document_class_defined and issubclass(cls, Document):
             db_refs = {}
@@ -91,23 +144,36 @@ class DocumentMetaclass(PydanticModelMetaclass):  # type: ignore
         else:
             cls_config = getattr(cls, "Config")
         json_encoders = getattr(cls_config, "json_encoders", {})  # type: ignore
-        json_encoders.update({ObjectId: lambda f: str(f)})
+        # config is shared with base classes, encoder is added once
+        add_object_id_encoder = ObjectId not in json_encoders
+        if add_object_id_encoder:
+            json_encoders[ObjectId] = str
         if IS_PYDANTIC_V2:
-            cls_config["json_encoders"] = json_encoders  # type: ignore
+            if add_object_id_encoder:
+                cls_config["json_encoders"] = json_encoders  # type: ignore
             exclude_fields = cls_config.get("exclude_fields", tuple())  # type: ignore
             collection_name = (
                 cls_config.get("collection_name", None) or cls.__name__.lower()
             )
         else:
-            setattr(cls_config, "json_encoders", json_encoders)  # type: ignore
+            if add_object_id_encoder:
+                setattr(cls_config, "json_encoders", json_encoders)  # type: ignore
             exclude_fields = getattr(cls_config, "exclude_fields", tuple())  # type: ignore
             collection_name = (
                 getattr(cls_config, "collection_name", None) or cls.__name__.lower()
             )
         setattr(cls, "__collection_name__", collection_name)
         setattr(cls, "__indexes__", indexes)
+        # inner query paths, resolved on first use or by build_field_paths
+        setattr(cls, "__field_paths__", {})
         setattr(cls, "__database_exclude_fields__", exclude_fields)
+        properties = _collect_properties(cls)
+        setattr(cls, "__properties__", properties)
+        setattr(cls, "__fields_all__", tuple(get_model_fields(cls)) + properties)
+        setattr(cls, "__row_class__", build_row_class(cls))
         setattr(cls, "__manager__", ODMManager(cls))  # type: ignore
+        if _is_document_class_defined and not declares_abstract(namespace):
+            register_document(cls)  # type: ignore
         return cls
 
 
@@ -120,7 +186,12 @@ class Document(BasePydanticModel, metaclass=DocumentMetaclass):
     __motordantic_computed_fields__: Dict[str, dict] = {}
     __mapping_query_fields__: Dict[str, str] = {}
     __mapping_from_fields__: Dict[str, str] = {}
+    __db_fields__: ClassVar[Dict[str, str]] = {}
+    __field_paths__: ClassVar[Dict[Tuple[str, ...], "FieldPath"]] = {}
     __collection_name__: Optional[str] = None
+    __properties__: Tuple[str, ...] = tuple()
+    __fields_all__: Tuple[str, ...] = tuple()
+    __row_class__: ClassVar[Type[DocumentRow]]
     _id: Optional[ObjectIdStr] = None
     has_relations: ClassVar[bool] = False
     model_config: ClassVar[ConfigDict]
@@ -143,60 +214,20 @@ class Document(BasePydanticModel, metaclass=DocumentMetaclass):
         return self.manager._io_loop
 
     @classmethod
-    async def ensure_indexes(cls):
-        """method for create/update/delete indexes if indexes declared in Config property"""
-        if IS_PYDANTIC_V2:
-            indexes = cls.model_config.get("indexes", [])
-        else:
-            indexes = getattr(cls.__config__, "indexes", [])
-        if not all([isinstance(index, IndexModel) for index in indexes]):
-            raise ValueError("indexes must be list of IndexModel instances")
-        if indexes:
-            db_indexes = await cls.Q.list_indexes()
-            indexes_to_create = [
-                i for i in indexes if i.document["name"] not in db_indexes
-            ]
-            indexes_to_delete = [
-                i
-                for i in db_indexes
-                if i not in [i.document["name"] for i in indexes] and i != "_id_"
-            ]
-            result = []
-            if indexes_to_create:
-                try:
-                    result = await cls.Q.create_indexes(indexes_to_create)
-                except MotordanticConnectionError:
-                    pass
-            if indexes_to_delete:
-                for index_name in indexes_to_delete:
-                    await cls.Q.drop_index(index_name)
-                db_indexes = await cls.Q.list_indexes()
-            indexes = set(list(db_indexes.keys()) + result)
-        setattr(cls, "__indexes__", indexes)
+    async def ensure_indexes(cls, dry_run: bool = False) -> IndexPlan:
+        """create/rebuild/delete indexes to match indexes declared in Config
+
+        Args:
+            dry_run (bool, optional): only compute plan. Defaults to False.
+
+        Returns:
+            IndexPlan: indexes to create, drop and unchanged
+        """
+        return await sync_indexes(cls, dry_run=dry_run)
 
     @classmethod
     def _get_properties(cls) -> list:
-        return [
-            prop
-            for prop in dir(cls)
-            if prop
-            not in (
-                "__values__",
-                "data",
-                "querybuilder",
-                "Q",
-                "Qsync",
-                "pk",
-                "_query_data",
-                "_mongo_query_data",
-                "__fields_set__",
-                "model_fields_set",
-                "model_extra",
-                "fields_all",
-                "_io_loop",
-            )
-            and isinstance(getattr(cls, prop), property)
-        ]
+        return list(cls.__properties__)
 
     if IS_PYDANTIC_V2:
 
@@ -221,7 +252,7 @@ class Document(BasePydanticModel, metaclass=DocumentMetaclass):
     async def save(
         self,
         updated_fields: Union[Tuple, List] = [],
-        session: Optional[AgnosticClientSession] = None,
+        session: Optional["AgnosticClientSession"] = None,
     ) -> Any:
         if self._id is not None:
             data = {
@@ -264,7 +295,7 @@ class Document(BasePydanticModel, metaclass=DocumentMetaclass):
     def save_sync(
         self,
         updated_fields: Union[Tuple, List] = [],
-        session: Optional[AgnosticClientSession] = None,
+        session: Optional["AgnosticClientSession"] = None,
     ):
         return self._io_loop.run_until_complete(self.save(updated_fields, session))
 
@@ -277,9 +308,7 @@ class Document(BasePydanticModel, metaclass=DocumentMetaclass):
     @classproperty
     def fields_all(cls) -> list:
         """return all fields with properties(not document fields)"""
-        fields = list(cls.model_fields.keys())
-        return_fields = fields + cls._get_properties()
-        return return_fields
+        return list(cls.__fields_all__)
 
     @classproperty
     def manager(cls) -> ODMManager:
@@ -327,19 +356,19 @@ class Document(BasePydanticModel, metaclass=DocumentMetaclass):
             exclude_none=exclude_none,
         )
         if with_props:
-            props = self._get_properties()
+            props = self.__properties__
             # Include and exclude properties
             if include:
-                props = [prop for prop in props if prop in include]
+                props = tuple(prop for prop in props if prop in include)
             if exclude:
-                props = [prop for prop in props if prop not in exclude]
+                props = tuple(prop for prop in props if prop not in exclude)
 
             # Update the attribute dict with the properties
-            if props:
-                attribs.update({prop: getattr(self, prop) for prop in props})
+            for prop in props:
+                attribs[prop] = getattr(self, prop)
         if self.has_relations:
             for field in self.__db_refs__:  # type: ignore
-                attrib_data = attribs[field]
+                attrib_data = attribs.get(field)
                 if attrib_data and not isinstance(attrib_data, dict):
                     attribs[field] = (
                         attrib_data.to_dict()
@@ -355,10 +384,14 @@ class Document(BasePydanticModel, metaclass=DocumentMetaclass):
 
     @classmethod
     def from_bson(cls, bson_raw_data: RawBSONDocument) -> "Document":
-        data = bson_decode(bson_raw_data.raw)
-        data = {
-            cls.__mapping_from_fields__[field]: value for field, value in data.items()
-        }
+        return cls._from_data(bson_decode(bson_raw_data.raw))
+
+    @classmethod
+    def _from_data(cls, data: "DictStrAny") -> "Document":
+        """document from decoded bson row with db field names"""
+        if cls.__db_fields__:
+            mapping = cls.__mapping_from_fields__
+            data = {mapping.get(field, field): value for field, value in data.items()}
         obj = cls(**data)
         obj._id = data.get("_id")
         return obj
@@ -385,7 +418,17 @@ class Document(BasePydanticModel, metaclass=DocumentMetaclass):
 
     @property
     def _mongo_query_data(self) -> "DictStrAny":
-        return self._query_data
+        data = self._query_data
+        if not self.__db_fields__:
+            return data
+        mapping = self.__mapping_query_fields__
+        return {mapping.get(field, field): value for field, value in data.items()}
+
+    @classmethod
+    def get_db_field(cls, field: str) -> str:
+        """database name of field or dotted path, declared with Field(db_field=...)"""
+        name, dot, rest = field.partition(".")
+        return cls.__mapping_query_fields__.get(name, name) + dot + rest
 
     @classmethod
     def get_collection_name(cls) -> str:
@@ -401,7 +444,7 @@ class Document(BasePydanticModel, metaclass=DocumentMetaclass):
         return {f: data[f] for f in fields}
 
     def serialize_json(self, fields: Union[Tuple, List]) -> str:
-        return json.dumps(self.serialize(fields))
+        return dumps(self.serialize(fields))
 
     @property
     def pk(self):
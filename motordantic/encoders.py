@@ -0,0 +1,254 @@
+import json
+import datetime
+from decimal import Decimal
+from enum import Enum
+from uuid import UUID
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Optional,
+)
+
+from bson import ObjectId, DBRef, Decimal128, decode as bson_decode, json_util
+from bson.raw_bson import RawBSONDocument
+from pydantic import BaseModel
+
+from .types import Relation
+from .row import DocumentRow
+from .utils.pydantic import IS_PYDANTIC_V2, get_model_dump
+
+if IS_PYDANTIC_V2:
+    from inspect import signature
+
+    from pydantic_core import to_json  # type: ignore
+
+__all__ = (
+    "JsonEncoder",
+    "json_default",
+    "dumps",
+    "dumps_bytes",
+    "document_to_json",
+    "get_json_encoder",
+    "set_json_encoder",
+    "JSON_MODES",
+    "bson_to_json",
+    "iter_bson_json",
+)
+
+if TYPE_CHECKING:
+    from .document import Document
+
+JsonEncoder = Callable[[Any], bytes]
+
+JSON_MODES = ("plain", "relaxed", "canonical")
+
+
+def json_default(value: Any) -> Any:
+    """fallback for values json can't encode: bson, uuid, dates, relations"""
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, Relation):
+        return value.to_dict()
+    if isinstance(value, DBRef):
+        return {"id": str(value.id), "collection": value.collection}
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, Decimal128):
+        return str(value.to_decimal())
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, RawBSONDocument):
+        return bson_decode(value.raw)
+    if isinstance(value, BaseModel):
+        return get_model_dump(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, bytes):
+        return value.decode()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(value: Any) -> str:
+    """stdlib json.dumps with motordantic types support"""
+    return json.dumps(value, default=json_default)
+
+
+def _stdlib_dumps_bytes(value: Any) -> bytes:
+    return json.dumps(value, default=json_default, separators=(",", ":")).encode()
+
+
+_CORE_FALLBACK = False
+if IS_PYDANTIC_V2:
+    try:
+        _CORE_FALLBACK = "fallback" in signature(to_json).parameters
+    except (TypeError, ValueError):
+        _CORE_FALLBACK = False
+
+
+def _core_dumps_bytes(value: Any) -> bytes:
+    return to_json(value, fallback=json_default)
+
+
+_json_encoder: JsonEncoder = (
+    _core_dumps_bytes if _CORE_FALLBACK else _stdlib_dumps_bytes
+)
+
+
+def get_json_encoder() -> JsonEncoder:
+    return _json_encoder
+
+
+def set_json_encoder(encoder: Optional[JsonEncoder] = None) -> None:
+    """replace default encoder for json_bytes/iter_json, for example with orjson
+
+    Args:
+        encoder (Optional[JsonEncoder], optional): callable returning bytes, None restores default. Defaults to None.
+    """
+    global _json_encoder
+    if encoder is None:
+        encoder = _core_dumps_bytes if _CORE_FALLBACK else _stdlib_dumps_bytes
+    _json_encoder = encoder
+
+
+def _extra_data(document: "Document") -> dict:
+    extra = {prop: getattr(document, prop) for prop in document.__properties__}
+    if document._id is not None:
+        extra["_id"] = document._id
+    return extra
+
+
+def document_to_json(
+    document: "Document", encoder: Optional[JsonEncoder] = None
+) -> bytes:
+    """encode document like document.data without building intermediate dict
+
+    Args:
+        document (Document): document instance
+        encoder (Optional[JsonEncoder], optional): encoder for values pydantic can't serialize. Defaults to None.
+
+    Returns:
+        bytes: json
+    """
+    encoder = encoder or _json_encoder
+    if IS_PYDANTIC_V2 and _CORE_FALLBACK and encoder is _core_dumps_bytes:
+        body = document.__pydantic_serializer__.to_json(  # type: ignore
+            document, fallback=json_default
+        )
+        extra = _extra_data(document)
+        if not extra:
+            return body
+        extra_body = encoder(extra)
+        if body == b"{}":
+            return extra_body
+        return body[:-1] + b"," + extra_body[1:]
+    return encoder(document.data)
+
+
+def dumps_bytes(value: Any, encoder: Optional[JsonEncoder] = None) -> bytes:
+    """encode row (Document, RawBSONDocument or python value) to json bytes"""
+    if isinstance(value, RawBSONDocument):
+        value = bson_decode(value.raw)
+    elif isinstance(value, BaseModel) and hasattr(value, "__fields_all__"):
+        return document_to_json(value, encoder)
+    elif isinstance(value, DocumentRow):
+        value = value.to_dict()
+    return (encoder or _json_encoder)(value)
+
+
+def _bson_row_converter(document_class: "Document") -> Callable[[dict], dict]:
+    """rename db fields to document fields and drop excluded fields"""
+    mapping = {
+        db_field: field
+        for db_field, field in document_class.__mapping_from_fields__.items()
+        if db_field != field
+    }
+    excluded = frozenset(document_class.__database_exclude_fields__)
+    if not mapping and not excluded:
+        return lambda data: data
+    return lambda data: {
+        field: value
+        for field, value in (
+            (mapping.get(key, key), value) for key, value in data.items()
+        )
+        if field not in excluded
+    }
+
+
+def _bson_json_encoder(
+    mode: str, encoder: Optional[JsonEncoder] = None
+) -> JsonEncoder:
+    if mode == "plain":
+        return encoder or _json_encoder
+    if mode == "relaxed":
+        options = json_util.RELAXED_JSON_OPTIONS
+    elif mode == "canonical":
+        options = json_util.CANONICAL_JSON_OPTIONS
+    else:
+        raise ValueError(f"invalid json mode - {mode}, use one of {JSON_MODES}")
+    return lambda data: json_util.dumps(
+        data, json_options=options, separators=(",", ":")
+    ).encode()
+
+
+def bson_to_json(
+    row: RawBSONDocument,
+    document_class: "Document",
+    mode: str = "plain",
+    encoder: Optional[JsonEncoder] = None,
+) -> bytes:
+    """convert raw bson row to json without pydantic validation
+
+    Args:
+        row (RawBSONDocument): row from motor
+        document_class (Document): document class for fields mapping
+        mode (str, optional): plain, relaxed or canonical extended json. Defaults to "plain".
+        encoder (Optional[JsonEncoder], optional): encoder for plain mode. Defaults to None.
+
+    Returns:
+        bytes: json
+    """
+    convert = _bson_row_converter(document_class)
+    return _bson_json_encoder(mode, encoder)(convert(bson_decode(row.raw)))
+
+
+async def iter_bson_json(
+    rows: AsyncIterable[RawBSONDocument],
+    document_class: "Document",
+    mode: str = "plain",
+    chunk_size: int = 100,
+    encoder: Optional[JsonEncoder] = None,
+) -> AsyncIterator[bytes]:
+    """stream raw bson rows as json array chunks
+
+    Args:
+        rows (AsyncIterable[RawBSONDocument]): motor cursor or other async rows source
+        document_class (Document): document class for fields mapping
+        mode (str, optional): plain, relaxed or canonical extended json. Defaults to "plain".
+        chunk_size (int, optional): rows per yielded chunk. Defaults to 100.
+        encoder (Optional[JsonEncoder], optional): encoder for plain mode. Defaults to None.
+
+    Yields:
+        AsyncIterator[bytes]: json chunks
+    """
+    convert = _bson_row_converter(document_class)
+    encode = _bson_json_encoder(mode, encoder)
+    chunk = [b"["]
+    first = True
+    async for row in rows:
+        if first:
+            first = False
+        else:
+            chunk.append(b",")
+        chunk.append(encode(convert(bson_decode(row.raw))))
+        if len(chunk) >= chunk_size * 2:
+            yield b"".join(chunk)
+            chunk = []
+    chunk.append(b"]")
+    yield b"".join(chunk)
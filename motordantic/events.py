@@ -0,0 +1,128 @@
+import logging
+from typing import TYPE_CHECKING, Any, Callable, List, Optional
+
+__all__ = (
+    "QueryEvent",
+    "listeners",
+    "add_listener",
+    "remove_listener",
+    "emit",
+    "filter_shape",
+)
+
+if TYPE_CHECKING:
+    from .document import Document
+
+logger = logging.getLogger(__name__)
+
+Listener = Callable[["QueryEvent"], Any]
+
+# instrumented code checks `if listeners:` before measuring anything
+listeners: List[Listener] = []
+
+
+def filter_shape(query: Any) -> Any:
+    """query with values replaced by "?", operators and field names are kept"""
+    if isinstance(query, dict):
+        return {
+            key: (
+                filter_shape(value)
+                if key.startswith("$") or isinstance(value, (dict, list))
+                else "?"
+            )
+            for key, value in query.items()
+        }
+    if isinstance(query, (list, tuple)):
+        if query and all(isinstance(v, dict) for v in query):
+            return [filter_shape(v) for v in query]
+        return "?"
+    return "?"
+
+
+class QueryEvent(object):
+    """timing breakdown of one query
+
+    Times are in milliseconds, server_ms includes network and cursor
+    iteration, decode_ms is bson decoding, hydrate_ms is Document creation.
+    options holds sort, skip, limit and other method arguments.
+    """
+
+    __slots__ = (
+        "operation",
+        "collection",
+        "filter",
+        "options",
+        "document",
+        "compile_ms",
+        "server_ms",
+        "decode_ms",
+        "hydrate_ms",
+        "rows",
+        "bytes",
+        "error",
+        "_filter_shape",
+    )
+
+    def __init__(
+        self,
+        operation: str,
+        collection: str,
+        filter: Any = None,
+        document: Optional["Document"] = None,
+        options: Optional[dict] = None,
+        compile_ms: float = 0.0,
+        server_ms: float = 0.0,
+        decode_ms: float = 0.0,
+        hydrate_ms: float = 0.0,
+        rows: int = 0,
+        bytes: int = 0,
+        error: Optional[BaseException] = None,
+    ):
+        self.operation = operation
+        self.collection = collection
+        self.filter = filter
+        self.options = options
+        self.document = document
+        self.compile_ms = compile_ms
+        self.server_ms = server_ms
+        self.decode_ms = decode_ms
+        self.hydrate_ms = hydrate_ms
+        self.rows = rows
+        self.bytes = bytes
+        self.error = error
+        self._filter_shape: Any = None
+
+    def __repr__(self) -> str:
+        return (
+            f"QueryEvent({self.operation}, {self.collection}, "
+            f"total_ms={self.total_ms:.3f}, rows={self.rows})"
+        )
+
+    @property
+    def filter_shape(self) -> Any:
+        if self._filter_shape is None and self.filter is not None:
+            self._filter_shape = filter_shape(self.filter)
+        return self._filter_shape
+
+    @property
+    def total_ms(self) -> float:
+        return self.compile_ms + self.server_ms + self.decode_ms + self.hydrate_ms
+
+
+def add_listener(listener: Listener) -> Listener:
+    """subscribe to query events, can be used as decorator"""
+    listeners.append(listener)
+    return listener
+
+
+def remove_listener(listener: Listener) -> None:
+    if listener in listeners:
+        listeners.remove(listener)
+
+
+def emit(event: QueryEvent) -> None:
+    for listener in tuple(listeners):
+        try:
+            listener(event)
+        except Exception:
+            logger.exception("query event listener %r failed", listener)
@@ -1,14 +1,7 @@
 import json
 from time import sleep
 from types import GeneratorType
-from typing import Callable, Any, Union
-
-from pymongo.errors import (
-    ServerSelectionTimeoutError,
-    AutoReconnect,
-    NetworkTimeout,
-    ConnectionFailure,
-)
+from typing import Callable, Any, Union, Tuple
 
 
 class BaseMotorDanticException(Exception):
@@ -63,6 +56,33 @@ class MotordanticIndexError(BaseMotorDanticException):
     pass
 
 
+class MotordanticUnsupportedOperation(BaseMotorDanticException):
+    def __init__(self, name: str, kind: str = "operator", *args):
+        self.name = name
+        self.kind = kind
+        super().__init__(*args)
+
+    def __str__(self):
+        return f"unsupported {self.kind} - {self.name}"
+
+
+def _connection_errors() -> Tuple[type, ...]:
+    # evaluated only when exception is raised, keeps pymongo out of import time
+    from pymongo.errors import (
+        ServerSelectionTimeoutError,
+        AutoReconnect,
+        NetworkTimeout,
+        ConnectionFailure,
+    )
+
+    return (
+        AutoReconnect,
+        ServerSelectionTimeoutError,
+        NetworkTimeout,
+        ConnectionFailure,
+    )
+
+
 def handle_and_convert_connection_errors(func: Callable) -> Any:
     """decorator for handle connection errors and raise MongoConnectionError
 
@@ -84,12 +104,7 @@ def handle_and_convert_connection_errors(func: Callable) -> Any:
                 if isinstance(result, GeneratorType):
                     result = generator_wrapper(result)
                 return result
-            except (
-                AutoReconnect,
-                ServerSelectionTimeoutError,
-                NetworkTimeout,
-                ConnectionFailure,
-            ) as e:
+            except _connection_errors() as e:
                 counter += 1
                 if counter > 3:
                     raise MotordanticConnectionError(str(e))
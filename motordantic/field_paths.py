@@ -0,0 +1,231 @@
+import sys
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
+
+if sys.version_info >= (3, 8):
+    from typing import get_args, get_origin
+else:
+    from typing_extensions import get_args, get_origin
+
+from pydantic import BaseModel
+
+from .exceptions import NotDeclaredField
+from .types import Relation
+from .utils.pydantic import get_field_type, get_model_dump, get_model_fields
+from .validation import validate_field_value
+
+__all__ = ("FieldPath", "resolve_field_path", "build_field_paths")
+
+if TYPE_CHECKING:
+    from .document import Document
+
+_ARRAY_TYPES = (list, set, frozenset, tuple)
+_MAPPING_TYPES = (dict, Mapping)
+# nested models deeper than this are resolved on first query only
+_MAX_PREBUILD_DEPTH = 4
+
+# (list, None) for array item, (dict, key) for mapping value
+Container = Tuple[type, Optional[str]]
+
+
+class FieldPath(object):
+    """inner query path like address__city resolved against nested models
+
+    Value is validated with validator of the last declared model field on the
+    path, array items and mapping values below it are validated by wrapping
+    value into the container.
+    """
+
+    __slots__ = ("names", "db_path", "model", "field_name", "containers")
+
+    def __init__(
+        self,
+        names: Tuple[str, ...],
+        db_path: str,
+        model: Optional[Type[BaseModel]] = None,
+        field_name: Optional[str] = None,
+        containers: Tuple[Container, ...] = (),
+    ):
+        self.names = names
+        self.db_path = db_path
+        self.model = model
+        self.field_name = field_name
+        self.containers = containers
+
+    def __repr__(self) -> str:
+        return f"FieldPath({'__'.join(self.names)} -> {self.db_path})"
+
+    @property
+    def is_typed(self) -> bool:
+        return self.model is not None
+
+    def validate(self, value: Any) -> Any:
+        """validate value of path, untyped paths (dict, Any) return value as is"""
+        if self.model is None:
+            return value
+        for container, key in reversed(self.containers):
+            value = [value] if container is list else {key: value}
+        value = validate_field_value(self.model, self.field_name, value)  # type: ignore
+        for container, _ in self.containers:
+            value = value[0] if container is list else next(iter(value.values()))
+        if isinstance(value, BaseModel):
+            return get_model_dump(value)
+        return value
+
+
+def _unwrap_optional(type_: Any) -> Any:
+    if get_origin(type_) is Union:
+        args = tuple(arg for arg in get_args(type_) if arg is not type(None))
+        if len(args) == 1:
+            return args[0]
+    return type_
+
+
+def _is_model(type_: Any) -> bool:
+    from .document import Document
+
+    return (
+        isinstance(type_, type)
+        and issubclass(type_, BaseModel)
+        and not issubclass(type_, Document)
+    )
+
+
+def _type_kind(type_: Any) -> Tuple[Optional[str], Any]:
+    """model, array or mapping with inner type, None for leaf and untyped values"""
+    type_ = _unwrap_optional(type_)
+    if type_ is Relation or get_origin(type_) is Relation:
+        return None, None
+    if _is_model(type_):
+        return "model", type_
+    origin = get_origin(type_) or type_
+    if not isinstance(origin, type):
+        return None, None
+    args = get_args(type_)
+    if issubclass(origin, _ARRAY_TYPES):
+        if origin is tuple and (len(args) != 2 or args[1] is not Ellipsis):
+            # fixed size tuple items have different types
+            return "array", Any
+        return "array", args[0] if args else Any
+    if issubclass(origin, _MAPPING_TYPES):
+        return "mapping", args[1] if len(args) == 2 else Any
+    return None, None
+
+
+def _model_field_name(model: Type[BaseModel], name: str) -> str:
+    fields = get_model_fields(model)
+    if name in fields:
+        return name
+    for field_name, field in fields.items():
+        if field.alias == name:
+            return field_name
+    raise NotDeclaredField(name, list(fields))
+
+
+def _resolve(document: Type["Document"], names: Tuple[str, ...]) -> FieldPath:
+    field, inners = names[0], names[1:]
+    db_parts = [document.__mapping_query_fields__.get(field, field)]
+    document_field = get_model_fields(document).get(field)
+    if document_field is None:
+        return FieldPath(names, ".".join(db_parts + list(inners)))
+    model: Optional[Type[BaseModel]] = document
+    field_name = field
+    containers: List[Container] = []
+    type_ = get_field_type(document_field)
+    position = 0
+    while position < len(inners):
+        name = inners[position]
+        kind, inner_type = _type_kind(type_)
+        if kind == "model":
+            field_name = _model_field_name(inner_type, name)
+            model, containers = inner_type, []
+            type_ = get_field_type(get_model_fields(inner_type)[field_name])
+            db_parts.append(field_name)
+        elif kind == "array" and not name.isdigit():
+            # condition on array of models matches any item, path has no index
+            type_ = inner_type
+            continue
+        elif kind == "array":
+            containers.append((list, None))
+            type_ = inner_type
+            db_parts.append(name)
+        elif kind == "mapping":
+            containers.append((dict, name))
+            type_ = inner_type
+            db_parts.append(name)
+        else:
+            # below untyped value, mongo path is used as is
+            model = None
+            db_parts.extend(inners[position:])
+            break
+        position += 1
+    if model is not None and type_ is Any:
+        model = None
+    return FieldPath(names, ".".join(db_parts), model, field_name, tuple(containers))
+
+
+def resolve_field_path(
+    document: Type["Document"], field: str, inners: Sequence[str]
+) -> FieldPath:
+    """resolve and cache inner path of document field
+
+    Args:
+        document (Type[Document]): document class
+        field (str): document field name
+        inners (Sequence[str]): inner names, aliases of nested model fields are allowed
+
+    Raises:
+        NotDeclaredField: name is not declared in nested model
+
+    Returns:
+        FieldPath: resolved path
+    """
+    names = (field, *inners)
+    paths = document.__field_paths__
+    path = paths.get(names)
+    if path is None:
+        path = paths[names] = _resolve(document, names)
+    return path
+
+
+def _nested_model(type_: Any) -> Optional[Type[BaseModel]]:
+    kind, inner_type = _type_kind(type_)
+    while kind == "array":
+        kind, inner_type = _type_kind(inner_type)
+    return inner_type if kind == "model" else None
+
+
+def build_field_paths(document: Type["Document"]) -> Dict[Tuple[str, ...], FieldPath]:
+    """resolve paths of all nested model fields ahead of first query
+
+    Returns:
+        Dict[Tuple[str, ...], FieldPath]: document path cache
+    """
+
+    def walk(names: Tuple[str, ...], model: Type[BaseModel], seen: tuple) -> None:
+        for field_name, field in get_model_fields(model).items():
+            path = names + (field_name,)
+            resolve_field_path(document, path[0], path[1:])
+            nested = _nested_model(get_field_type(field))
+            if (
+                nested is not None
+                and nested not in seen
+                and len(path) < _MAX_PREBUILD_DEPTH
+            ):
+                walk(path, nested, seen + (nested,))
+
+    for field_name, field in get_model_fields(document).items():
+        nested = _nested_model(get_field_type(field))
+        if nested is not None:
+            walk((field_name,), nested, (nested,))
+    return document.__field_paths__
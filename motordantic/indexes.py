@@ -0,0 +1,296 @@
+import asyncio
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+)
+
+from .utils.pydantic import get_config_value
+from .registry import get_documents
+from .exceptions import _connection_errors
+
+__all__ = (
+    "COMPARED_OPTIONS",
+    "IndexPlan",
+    "declared_index_models",
+    "index_spec",
+    "plan_indexes",
+    "apply_index_plan",
+    "sync_indexes",
+    "sync_all_indexes",
+)
+
+if TYPE_CHECKING:
+    from motor.core import AgnosticClientSession as ClientSession
+    from pymongo import IndexModel
+
+    from .document import Document
+
+# options which change index behaviour, index is rebuilt when one of them differs
+COMPARED_OPTIONS = (
+    "unique",
+    "sparse",
+    "hidden",
+    "partialFilterExpression",
+    "expireAfterSeconds",
+    "collation",
+    "weights",
+    "default_language",
+    "language_override",
+    "wildcardProjection",
+    "bits",
+    "min",
+    "max",
+)
+# server omits false flags
+_FLAG_OPTIONS = frozenset(("unique", "sparse", "hidden"))
+_DEFAULT_INDEX = "_id_"
+
+IndexSpec = Dict[str, Any]
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, Mapping):
+        return {k: _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def index_spec(index: Any) -> IndexSpec:
+    """comparable spec of IndexModel or list_indexes document: key and options"""
+    document = getattr(index, "document", index)
+    spec: IndexSpec = {
+        "key": [(field, _normalize(d)) for field, d in document["key"].items()]
+    }
+    for option in COMPARED_OPTIONS:
+        value = document.get(option)
+        if value is None or (option in _FLAG_OPTIONS and not value):
+            continue
+        spec[option] = _normalize(value)
+    return spec
+
+
+def _is_text_index(spec: IndexSpec) -> bool:
+    return any(
+        direction == "text" or field == "_fts" for field, direction in spec["key"]
+    )
+
+
+def _spec_matches(declared: IndexSpec, existing: IndexSpec) -> bool:
+    if _is_text_index(declared) or _is_text_index(existing):
+        # server stores text keys as _fts/_ftsx and fills weights defaults
+        return _is_text_index(declared) and _is_text_index(existing)
+    for option in set(declared) | set(existing):
+        declared_value, existing_value = declared.get(option), existing.get(option)
+        if option == "collation" and declared_value and existing_value:
+            # server returns collation with all defaults filled in
+            if any(existing_value.get(k) != v for k, v in declared_value.items()):
+                return False
+        elif declared_value != existing_value:
+            return False
+    return True
+
+
+class IndexPlan(object):
+    """difference between declared and existing indexes of a document collection
+
+    Indexes from drop and create with the same name are rebuilt because
+    their spec changed.
+    """
+
+    __slots__ = ("document", "create", "drop", "unchanged")
+
+    def __init__(
+        self,
+        document: "Document",
+        create: Optional[List["IndexModel"]] = None,
+        drop: Optional[List[str]] = None,
+        unchanged: Optional[List[str]] = None,
+    ):
+        self.document = document
+        self.create: List["IndexModel"] = create or []
+        self.drop: List[str] = drop or []
+        self.unchanged: List[str] = unchanged or []
+
+    def __repr__(self) -> str:
+        return (
+            f"IndexPlan({self.document.get_collection_name()}, create={self.create_names}, "
+            f"drop={self.drop}, unchanged={self.unchanged})"
+        )
+
+    def __bool__(self) -> bool:
+        return bool(self.create or self.drop)
+
+    @property
+    def create_names(self) -> List[str]:
+        return [index.document["name"] for index in self.create]
+
+    @property
+    def rebuild(self) -> List[str]:
+        return [name for name in self.create_names if name in self.drop]
+
+    @property
+    def index_names(self) -> List[str]:
+        """index names after plan is applied"""
+        return [_DEFAULT_INDEX] + self.unchanged + self.create_names
+
+
+def _with_db_fields(document_class: "Document", index: "IndexModel") -> "IndexModel":
+    from pymongo import IndexModel
+
+    document = index.document
+    keys = list(document["key"].items())
+    db_keys = [(document_class.get_db_field(field), d) for field, d in keys]
+    if db_keys == keys:
+        return index
+    # declared name is kept, options are passed as is
+    return IndexModel(db_keys, **{k: v for k, v in document.items() if k != "key"})
+
+
+def declared_index_models(document_class: "Document") -> List["IndexModel"]:
+    """Config.indexes of document, keys renamed to database names of fields
+
+    Index options like partialFilterExpression must use database names.
+
+    Raises:
+        ValueError: indexes is not list of IndexModel instances
+    """
+    from pymongo import IndexModel
+
+    indexes = get_config_value(document_class, "indexes") or []
+    if not all(isinstance(index, IndexModel) for index in indexes):
+        raise ValueError("indexes must be list of IndexModel instances")
+    if not document_class.__db_fields__:
+        return list(indexes)
+    return [_with_db_fields(document_class, index) for index in indexes]
+
+
+async def _existing_indexes(
+    document_class: "Document", session: Optional["ClientSession"] = None
+) -> Dict[str, IndexSpec]:
+    cursor = document_class.manager.collection.list_indexes(session=session)
+    return {index["name"]: index_spec(index) for index in await cursor.to_list(None)}
+
+
+async def plan_indexes(
+    document_class: "Document", session: Optional["ClientSession"] = None
+) -> IndexPlan:
+    """diff Config.indexes with collection indexes by name and full spec
+
+    Indexes which are not declared are dropped only when document declares
+    indexes, collections without Config.indexes are left as is.
+
+    Args:
+        document_class (Document): document class
+        session (Optional[ClientSession], optional): motor session. Defaults to None.
+
+    Returns:
+        IndexPlan: indexes to create, drop and unchanged
+    """
+    declared = declared_index_models(document_class)
+    plan = IndexPlan(document_class)
+    if not declared:
+        return plan
+    existing = await _existing_indexes(document_class, session)
+    declared_names = set()
+    for index in declared:
+        name = index.document["name"]
+        declared_names.add(name)
+        existing_spec = existing.get(name)
+        if existing_spec is None:
+            plan.create.append(index)
+        elif _spec_matches(index_spec(index), existing_spec):
+            plan.unchanged.append(name)
+        else:
+            plan.drop.append(name)
+            plan.create.append(index)
+    plan.drop.extend(
+        name
+        for name in existing
+        if name not in declared_names and name != _DEFAULT_INDEX
+    )
+    return plan
+
+
+async def apply_index_plan(
+    plan: IndexPlan, session: Optional["ClientSession"] = None
+) -> List[str]:
+    """drop changed and undeclared indexes, create new ones in one command
+
+    Connection errors while creating are skipped, so startup does not fail
+    on unavailable server, missing indexes are created by next sync.
+
+    Returns:
+        List[str]: created index names
+    """
+    collection = plan.document.manager.collection
+    for name in plan.drop:
+        await collection.drop_index(name, session=session)
+    if not plan.create:
+        return []
+    try:
+        return await collection.create_indexes(plan.create, session=session)
+    except _connection_errors():
+        return []
+
+
+async def sync_indexes(
+    document_class: "Document",
+    dry_run: bool = False,
+    session: Optional["ClientSession"] = None,
+) -> IndexPlan:
+    """make collection indexes match Config.indexes
+
+    Args:
+        document_class (Document): document class
+        dry_run (bool, optional): only compute plan, don't change collection. Defaults to False.
+        session (Optional[ClientSession], optional): motor session. Defaults to None.
+
+    Returns:
+        IndexPlan: computed plan, applied unless dry_run
+    """
+    plan = await plan_indexes(document_class, session)
+    if dry_run:
+        return plan
+    created = await apply_index_plan(plan, session) if plan else []
+    names = plan.unchanged + created
+    document_class.__indexes__ = {_DEFAULT_INDEX, *names} if names else set()
+    return plan
+
+
+async def sync_all_indexes(
+    documents: Optional[Iterable["Document"]] = None, dry_run: bool = False
+) -> List[IndexPlan]:
+    """sync indexes of many documents concurrently
+
+    Args:
+        documents (Optional[Iterable[Document]], optional): document classes, registered documents with declared indexes if None. Defaults to None.
+        dry_run (bool, optional): only compute plans. Defaults to False.
+
+    Returns:
+        List[IndexPlan]: plans in documents order
+    """
+    if documents is None:
+        documents = _documents_with_indexes()
+    return list(
+        await asyncio.gather(
+            *(sync_indexes(document, dry_run=dry_run) for document in documents)
+        )
+    )
+
+
+def _documents_with_indexes() -> Tuple["Document", ...]:
+    documents: Dict[str, "Document"] = {}
+    for document in get_documents():
+        if get_config_value(document, "indexes"):
+            # collection shared by several classes is synced once, by the last one
+            documents[document.get_collection_name()] = document
+    return tuple(documents.values())
@@ -1,9 +1,7 @@
-from typing import Optional, TYPE_CHECKING, List
+from typing import Optional, TYPE_CHECKING, List, Dict, Any, Tuple
+from weakref import WeakSet
 import asyncio
-
-from motor.core import AgnosticClientSession, AgnosticCollection, AgnosticDatabase
-from pymongo.errors import AutoReconnect, ServerSelectionTimeoutError, NetworkTimeout
-
+import logging
 
 from .query import ExtraQueryMapper
 from .query.builder import Builder
@@ -12,31 +10,58 @@ from .relation import RelationManager
 
 from .sync import SyncQueryBuilder
 from .aggregate.aggregate import Aggregate
-from .utils.pydantic import get_model_fields
+from .cache import BaseCacheBackend, MemoryCache
+from .slow_query import enable_slow_query_log
+from .indexes import sync_indexes
+from .utils.pydantic import get_model_fields, get_config_value
 
 if TYPE_CHECKING:
+    from motor.core import (
+        AgnosticClientSession,
+        AgnosticCollection,
+        AgnosticDatabase,
+    )
+
     from .document import Document
+    from .indexes import IndexPlan
     from .connection import MotordanticConnection
 
+logger = logging.getLogger(__name__)
+
 
 class ODMManager(object):
-    __database__: Optional[AgnosticDatabase] = None
-    __collection__: Optional[AgnosticCollection] = None
+    __database__: Optional["AgnosticDatabase"] = None
+    __collection__: Optional["AgnosticCollection"] = None
     __connection__: Optional["MotordanticConnection"] = None
     __relation_manager__: Optional["RelationManager"] = None
+    _managers: "WeakSet[ODMManager]" = WeakSet()
 
     def __init__(self, document: "Document"):
+        self._collections: Dict[Tuple, "AgnosticCollection"] = {}
+        self._managers.add(self)
         self._builder: Builder = Builder(self)
         self.querybuilder = self._builder
         self.sync_querybuilder: SyncQueryBuilder = SyncQueryBuilder(self._builder)
         self.__document__ = document
+        self.cache: Optional[BaseCacheBackend] = get_config_value(document, "cache")
+        count_cache_ttl = get_config_value(document, "count_cache_ttl")
+        self.count_cache: Optional[MemoryCache] = (
+            MemoryCache(ttl=count_cache_ttl) if count_cache_ttl else None
+        )
+        self.slow_query_ms: Optional[float] = None
+        self.slow_query_explain = False
+        slow_query_ms = get_config_value(document, "slow_query_ms")
+        if slow_query_ms is not None:
+            self.set_slow_query_log(
+                slow_query_ms, bool(get_config_value(document, "slow_query_explain"))
+            )
         if self.__document__.has_relations:
             self.__relation_manager__ = RelationManager(self.__document__)
         else:
             self.__relation_manager__ = None
 
     @property
-    def database(self) -> AgnosticDatabase:
+    def database(self) -> "AgnosticDatabase":
         """Returns the database that is currently associated with this document."""
         if not hasattr(self, "__database__") or self.__database__ is None:
             raise AttributeError("Accessing database without using it first.")
@@ -64,16 +89,99 @@ class ODMManager(object):
         return _io_loop
 
     @property
-    def collection(self) -> AgnosticCollection:
+    def collection(self) -> "AgnosticCollection":
         """Returns the collection for this :class:`Document`."""
-        if (
-            self.__collection__ is None
-            or self.__collection__.database is not self.database
-        ):
-            self.__collection__ = self.database.get_collection(self.document.get_collection_name())  # type: ignore
-        return self.__collection__  # type: ignore
-
-    async def _start_session(self) -> AgnosticClientSession:
+        collection = self.__collection__
+        if collection is None:
+            collection = self.database.get_collection(self.document.get_collection_name())  # type: ignore
+            self.__collection__ = collection
+        return collection
+
+    def get_collection(
+        self,
+        write_concern: Any = None,
+        read_preference: Any = None,
+        read_concern: Any = None,
+        codec_options: Any = None,
+    ) -> "AgnosticCollection":
+        """Returns the collection with options, handles are cached per options set.
+
+        Args:
+            write_concern (Optional[WriteConcern], optional): pymongo WriteConcern. Defaults to None.
+            read_preference (Optional[_ServerMode], optional): pymongo read preference. Defaults to None.
+            read_concern (Optional[ReadConcern], optional): pymongo ReadConcern. Defaults to None.
+            codec_options (Optional[CodecOptions], optional): bson CodecOptions. Defaults to None.
+
+        Returns:
+            AgnosticCollection: motor collection
+        """
+        options = (write_concern, read_preference, read_concern, codec_options)
+        if options == (None, None, None, None):
+            return self.collection
+        # pymongo option objects are not hashable, repr contains all of their values
+        key = tuple(repr(option) if option is not None else None for option in options)
+        collection = self._collections.get(key)
+        if collection is None:
+            collection = self.collection.with_options(
+                write_concern=write_concern,
+                read_preference=read_preference,
+                read_concern=read_concern,
+                codec_options=codec_options,
+            )
+            self._collections[key] = collection
+        return collection
+
+    def _reset_collections(self) -> None:
+        self.__collection__ = None
+        self._collections.clear()
+
+    async def invalidate_cache_on_changes(self, retry_delay: float = 1.0) -> None:
+        """drop cached results of this collection on every change stream event
+
+        Runs until cancelled, so every process keeps its in-process cache coherent
+        with writes made by other nodes.
+
+        Args:
+            retry_delay (float, optional): seconds before reopening failed stream. Defaults to 1.0.
+        """
+        from pymongo.errors import PyMongoError
+
+        builder = self.querybuilder
+        while True:
+            try:
+                # events consumed only for invalidation, document is not needed
+                async with builder.watch(
+                    pipeline=[{"$project": {"operationType": 1}}]
+                ) as stream:
+                    # changes made while stream was closed are unknown
+                    await builder._invalidate_cache()
+                    async for _ in stream:
+                        await builder._invalidate_cache()
+            except PyMongoError:
+                logger.exception(
+                    "change stream for %s failed", self.document.get_collection_name()
+                )
+                await asyncio.sleep(retry_delay)
+
+    def set_slow_query_log(
+        self, threshold_ms: Optional[float], explain: bool = False
+    ) -> None:
+        """log find, find_one, count and aggregate queries slower than threshold
+
+        Args:
+            threshold_ms (Optional[float]): threshold in milliseconds, None disables log.
+            explain (bool, optional): log explain("executionStats") summary in background task. Defaults to False.
+        """
+        self.slow_query_ms = threshold_ms
+        self.slow_query_explain = explain
+        if threshold_ms is not None:
+            enable_slow_query_log()
+
+    def start_cache_invalidation(self, retry_delay: float = 1.0) -> asyncio.Task:
+        """run invalidate_cache_on_changes in background task"""
+        return asyncio.ensure_future(self.invalidate_cache_on_changes(retry_delay))
+
+    async def _start_session(self) -> "AgnosticClientSession":
         return await self.motor_client.start_session()
 
     @property
@@ -87,6 +195,8 @@ class ODMManager(object):
         cls.__database__ = connection._get_motor_client().get_database(
             connection.database_name
         )
+        for manager in cls._managers:
+            manager._reset_collections()
 
     @property
     def document(self) -> "Document":
@@ -117,31 +227,16 @@ class ODMManager(object):
                 field_param.append(param)
         return field_param, extra
 
-    async def ensure_indexes(self):
-        """method for create/update/delete indexes if indexes declared in Config property"""
-
-        indexes = self.document.__indexes__
-        if indexes:
-            db_indexes = await self.querybuilder.list_indexes()
-            indexes_to_create = [
-                i for i in indexes if i.document["name"] not in db_indexes  # type: ignore
-            ]
-            indexes_to_delete = [
-                i
-                for i in db_indexes
-                if i not in [i.document["name"] for i in indexes] and i != "_id_"  # type: ignore
-            ]
-            result = []
-            if indexes_to_create:
-                try:
-                    result = await self.querybuilder.create_indexes(indexes_to_create)  # type: ignore
-                except (AutoReconnect, ServerSelectionTimeoutError, NetworkTimeout):
-                    pass
-            if indexes_to_delete:
-                for index_name in indexes_to_delete:
-                    await self.querybuilder.drop_index(index_name)
-                db_indexes = await self.querybuilder.list_indexes()
-            indexes = set(list(db_indexes.keys()) + result)
+    async def ensure_indexes(self, dry_run: bool = False) -> "IndexPlan":
+        """create/rebuild/delete indexes to match indexes declared in Config
+
+        Args:
+            dry_run (bool, optional): only compute plan. Defaults to False.
+
+        Returns:
+            IndexPlan: indexes to create, drop and unchanged
+        """
+        return await sync_indexes(self.document, dry_run=dry_run)
 
 
 class DynamicCollectionODMManager(ODMManager):
@@ -1,5 +1,6 @@
 from typing import (
     AsyncIterable,
+    AsyncIterator,
     AsyncGenerator,
     Union,
     List,
@@ -9,17 +10,20 @@ from typing import (
     Tuple,
     TYPE_CHECKING,
     Iterable,
+    Callable,
+    Awaitable,
 )
+from time import perf_counter
 
 from bson import ObjectId, decode as bson_decode
 from bson.raw_bson import RawBSONDocument
-from pymongo import ReturnDocument, IndexModel
-from pymongo.collection import WriteConcern
-from motor.core import AgnosticClientSession as ClientSession
 
 from .query import generate_basic_query, Q, QCombination
+from .update import compile_update, compile_update_pipeline
 from .result import FindResult, SimpleAggregateResult
 from .extra import group_by_aggregate_generation, generate_name_field
+from .decode import DecodeStrategy, get_decoder
+from .columns import ColumnBuilder
 
 from ..aggregate.expressions import Sum, Max, Min, Avg
 from ..exceptions import (
@@ -29,14 +33,61 @@ from ..exceptions import (
     DoesNotExist,
 )
 from ..validation import sort_validation
-
+from ..cache import make_cache_key
+from ..watch import ChangeStream, BaseResumeTokenStore
+from ..encoders import JSON_MODES, iter_bson_json
+from ..events import QueryEvent, listeners, emit
 
 __all__ = ("Builder",)
 
+_WRITE_METHODS = frozenset(
+    (
+        "insert_one",
+        "insert_many",
+        "update_one",
+        "update_many",
+        "replace_one",
+        "delete_one",
+        "delete_many",
+        "find_one_and_update",
+        "find_one_and_replace",
+        "find_one_and_delete",
+        "find_and_replace",
+        "bulk_write",
+    )
+)
+
 if TYPE_CHECKING:
+    from motor.core import AgnosticClientSession as ClientSession
+    from pymongo import IndexModel
+    from pymongo.write_concern import WriteConcern
+
     from ..manager import ODMManager
     from ..custom_typing import DictStrAny
     from ..document import Document
+    from ..aggregate.aggregate import Aggregate
+    from ..cache import BaseCacheBackend
+
+
+def _raw_row(row: Any) -> Any:
+    return row
+
+
+def _result_size(result: Any) -> Tuple[int, int]:
+    """rows and bytes of motor method result for query events"""
+    if result is None or not getattr(result, "acknowledged", True):
+        return 0, 0
+    if isinstance(result, RawBSONDocument):
+        return 1, len(result.raw)
+    if isinstance(result, int):
+        return result, 0
+    for attr in ("inserted_ids", "deleted_count", "modified_count"):
+        value = getattr(result, attr, None)
+        if value is not None:
+            return (len(value) if attr == "inserted_ids" else value), 0
+    if getattr(result, "inserted_id", None) is not None:
+        return 1, 0
+    return 0, 0
 
 
 class Builder(object):
@@ -58,6 +109,16 @@ class Builder(object):
 
         return query_params
 
+    def _sort_validation(
+        self, sort: Optional[int] = None, sort_fields: Union[list, tuple, None] = None
+    ) -> Tuple[Any, ...]:
+        """sort_validation with sort fields renamed to database names"""
+        sort, sort_fields = sort_validation(sort, sort_fields)
+        if sort_fields:
+            get_db_field = self.odm_manager.document.get_db_field
+            sort_fields = [get_db_field(field) for field in sort_fields]
+        return sort, sort_fields
+
     def _check_query_args(
         self,
         logical_query: Union[
@@ -79,14 +140,34 @@ class Builder(object):
             raise MotordanticInvalidArgsParams()
         return logical_query.to_query(self)  # type: ignore
 
+    def _compile_query(
+        self,
+        query_params: Union[List, Dict, str, Q, QCombination],
+        logical: bool = False,
+    ) -> Any:
+        """compile query params to pymongo query
+
+        Args:
+            query_params (Union[List, Dict, str, Query, LogicalCombination]): query params: dict or Query or LogicalCombination
+            logical (bool, optional): if logical. Defaults to False.
+
+        Returns:
+            Any: compiled query
+        """
+        if logical:
+            return self._check_query_args(query_params)
+        elif isinstance(query_params, dict):
+            return self._validate_query_data(query_params)
+        return query_params
+
     async def _make_query(
         self,
         method_name: str,
         query_params: Union[List, Dict, str, Q, QCombination],
         set_values: Optional[Dict] = None,
-        session: Optional[ClientSession] = None,
+        session: Optional["ClientSession"] = None,
         logical: bool = False,
-        write_concern: Optional[WriteConcern] = None,
+        write_concern: Optional["WriteConcern"] = None,
         **kwargs,
     ) -> Any:
         """main query function
@@ -101,40 +182,174 @@ class Builder(object):
         Returns:
             Any: query result
         """
-        if logical:
-            query_params = self._check_query_args(query_params)
-        elif isinstance(query_params, dict):
-            query_params = self._validate_query_data(query_params)
-        if write_concern:
-            collection = self.odm_manager.collection.with_options(  # type: ignore
-                write_concern=write_concern
-            )
+        if listeners:
+            start = perf_counter()
+            query_params = self._compile_query(query_params, logical)
+            kwargs["compile_ms"] = (perf_counter() - start) * 1000
         else:
-            collection = self.odm_manager.collection
-        # print(query_params)
+            query_params = self._compile_query(query_params, logical)
+        return await self._execute_query(
+            method_name,
+            query_params,
+            set_values=set_values,
+            session=session,
+            write_concern=write_concern,
+            **kwargs,
+        )
+
+    async def _execute_query(
+        self,
+        method_name: str,
+        query_params: Any,
+        set_values: Optional[Dict] = None,
+        session: Optional["ClientSession"] = None,
+        write_concern: Optional["WriteConcern"] = None,
+        compile_ms: float = 0.0,
+        **kwargs,
+    ) -> Any:
+        """call motor collection method with compiled query"""
+        if not listeners:
+            return await self._call_collection_method(
+                method_name, query_params, set_values, session, write_concern, **kwargs
+            )
+        event = QueryEvent(
+            method_name,
+            self.odm_manager.document.get_collection_name(),
+            query_params,
+            self.odm_manager.document,
+            options=kwargs or None,
+            compile_ms=compile_ms,
+        )
+        start = perf_counter()
+        try:
+            result = await self._call_collection_method(
+                method_name, query_params, set_values, session, write_concern, **kwargs
+            )
+            event.rows, event.bytes = _result_size(result)
+            return result
+        except Exception as e:
+            event.error = e
+            raise
+        finally:
+            event.server_ms = (perf_counter() - start) * 1000
+            emit(event)
+
+    async def _call_collection_method(
+        self,
+        method_name: str,
+        query_params: Any,
+        set_values: Optional[Dict] = None,
+        session: Optional["ClientSession"] = None,
+        write_concern: Optional["WriteConcern"] = None,
+        **kwargs,
+    ) -> Any:
+        collection = self.odm_manager.get_collection(write_concern=write_concern)
         method = getattr(collection, method_name)
-        query: tuple = (query_params,)
+        # None for methods without filter like estimated_document_count
+        query: tuple = (query_params,) if query_params is not None else ()
         if session:
             kwargs["session"] = session
         if set_values:
             query = (query_params, set_values)
-        if kwargs:
+        if method_name not in _WRITE_METHODS or (
+            self.odm_manager.cache is None and self.odm_manager.count_cache is None
+        ):
+            if kwargs:
+                return await method(*query, **kwargs)
+            return await method(*query)
+        try:
             return await method(*query, **kwargs)
-        return await method(*query)
+        finally:
+            await self._invalidate_cache()
+
+    async def _invalidate_cache(self) -> None:
+        namespace = self.odm_manager.document.get_collection_name()
+        for cache in (self.odm_manager.cache, self.odm_manager.count_cache):
+            if cache is not None:
+                cache.bump_generation(namespace)
+                await cache.invalidate(namespace)
+
+    @staticmethod
+    async def _cached(
+        cache: "BaseCacheBackend",
+        namespace: str,
+        key: bytes,
+        fetch: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """get value from cache or fetch it, value fetched during invalidation is not stored"""
+        value = await cache.get(namespace, key)
+        if value is None:
+            generation = cache.generation(namespace)
+            value = await fetch()
+            if cache.generation(namespace) == generation:
+                await cache.set(namespace, key, value)
+        return value
+
+    async def _read_through(
+        self,
+        operation: str,
+        query_params: Any,
+        fetch: Callable[[], Awaitable[Any]],
+        session: Optional["ClientSession"] = None,
+        **options,
+    ) -> Any:
+        """return cached rows for compiled query or fetch and cache them
+
+        Args:
+            operation (str): operation name, part of the cache key
+            query_params (Any): compiled query
+            fetch (Callable[[], Awaitable[Any]]): coroutine factory for database call
+            session (Optional[ClientSession], optional): queries inside session are not cached. Defaults to None.
 
-    async def get(self, session: Optional[ClientSession] = None, **query) -> "Document":
+        Returns:
+            Any: rows or value returned by fetch
+        """
+        cache = self.odm_manager.cache
+        if cache is None or session is not None:
+            return await fetch()
+        key = make_cache_key(operation, query_params, **options)
+        if key is None:
+            return await fetch()
+        namespace = self.odm_manager.document.get_collection_name()
+        return await self._cached(cache, namespace, key, fetch)
+
+    async def get(self, session: Optional["ClientSession"] = None, **query) -> "Document":
         obj = await self.find_one(session=session, **query)
         if not obj:
-            raise DoesNotExist(self.odm_manager.document.__name__) # type: ignore
+            raise DoesNotExist(self.odm_manager.document.__name__)  # type: ignore
         return obj
 
+    async def _count(
+        self,
+        operation: str,
+        query_params: Any,
+        fetch: Callable[[], Awaitable[int]],
+        session: Optional["ClientSession"] = None,
+    ) -> int:
+        """count through short ttl count cache and query cache"""
+        count_cache = self.odm_manager.count_cache
+        key = (
+            make_cache_key(operation, query_params)
+            if count_cache is not None and session is None
+            else None
+        )
+        if key is None:
+            return await self._read_through(operation, query_params, fetch, session)
+        namespace = self.odm_manager.document.get_collection_name()
+        return await self._cached(
+            count_cache,  # type: ignore
+            namespace,
+            key,
+            lambda: self._read_through(operation, query_params, fetch, session),
+        )
+
     async def count(
         self,
         logical_query: Union[Q, QCombination, None] = None,
-        session: Optional[ClientSession] = None,
+        session: Optional["ClientSession"] = None,
         **query,
     ) -> int:
-        """count query
+        """exact count query, see estimated_count for fast count of all documents
 
         Args:
             logical_query (Union[Q, QCombination, None], optional): Query | QueryCombination. Defaults to None.
@@ -143,39 +358,39 @@ class Builder(object):
         Returns:
             int: count of documents
         """
-        if getattr(self.odm_manager.collection, "count_documents"):
-            return await self._make_query(
-                "count_documents",
-                logical_query or query,
-                session=session,
-                logical=bool(logical_query),
-            )
-        return await self._make_query(
+        query_params = self._compile_query(logical_query or query, bool(logical_query))
+        return await self._count(
             "count",
-            logical_query or query,
+            query_params,
+            lambda: self._execute_query(
+                "count_documents", query_params, session=session
+            ),
             session=session,
-            logical=bool(logical_query),
         )
 
     async def count_documents(
         self,
         logical_query: Union[Q, QCombination, None] = None,
-        session: Optional[ClientSession] = None,
+        session: Optional["ClientSession"] = None,
         **query,
     ) -> int:
-        """count_documents query
+        """same as count, named like motor method"""
+        return await self.count(logical_query, session=session, **query)
 
-        Args:
-            logical_query (Union[Query, LogicalCombination, None], optional): Query | QueryCombination. Defaults to None.
-            session (Optional[ClientSession], optional): motor session. Defaults to None.
+    async def estimated_count(self) -> int:
+        """count of all documents from collection metadata
 
         Returns:
-            int: count of documents
+            int: estimated count of documents
         """
-        return await self.count(logical_query, session, **query)
+        return await self._count(
+            "estimated_count",
+            {},
+            lambda: self._make_query("estimated_document_count", None),
+        )
 
     async def insert_one(
-        self, session: Optional[ClientSession] = None, **query
+        self, session: Optional["ClientSession"] = None, **query
     ) -> ObjectId:
         """insert one document
 
@@ -186,9 +401,10 @@ class Builder(object):
             ObjectId: created document _id
         """
         obj = self.odm_manager.document.parse_obj(query)
+        # field names, query compilation renames them to database names
         data = await self._make_query(
             "insert_one",
-            obj._mongo_query_data,
+            obj._query_data,
             session=session,
         )
         return data.inserted_id
@@ -196,10 +412,10 @@ class Builder(object):
     async def insert_many(
         self,
         data: List,
-        session: Optional[ClientSession] = None,
+        session: Optional["ClientSession"] = None,
         ordered: bool = True,
         bypass_document_validation: bool = False,
-        write_concern: Optional[WriteConcern] = None,
+        write_concern: Optional["WriteConcern"] = None,
     ) -> int:
         """insert many documents
 
@@ -232,7 +448,7 @@ class Builder(object):
     async def delete_one(
         self,
         logical_query: Union[Q, QCombination, None] = None,
-        session: Optional[ClientSession] = None,
+        session: Optional["ClientSession"] = None,
         **query,
     ) -> int:
         """delete one document
@@ -255,7 +471,7 @@ class Builder(object):
     async def delete_many(
         self,
         logical_query: Union[Q, QCombination, None] = None,
-        session: Optional[ClientSession] = None,
+        session: Optional["ClientSession"] = None,
         **query,
     ) -> int:
         """delete many document
@@ -276,7 +492,7 @@ class Builder(object):
         return r.deleted_count
 
     async def distinct(
-        self, field: str, session: Optional[ClientSession] = None, **query
+        self, field: str, session: Optional["ClientSession"] = None, **query
     ) -> list:
         """wrapper for pymongo distinct
 
@@ -289,13 +505,17 @@ class Builder(object):
         """
         query = self._validate_query_data(query)
         method = getattr(self.odm_manager.collection, "distinct")
-        return await method(key=field, filter=query, session=session)
+        return await method(
+            key=self.odm_manager.document.get_db_field(field),
+            filter=query,
+            session=session,
+        )
 
     async def find_one(
         self,
         logical_query: Union[Q, QCombination, None] = None,
         sort_fields: Optional[Union[Tuple, List]] = None,
-        session: Optional[ClientSession] = None,
+        session: Optional["ClientSession"] = None,
         sort: Optional[int] = None,
         with_relations_objects: bool = False,
         **query,
@@ -311,14 +531,22 @@ class Builder(object):
         Returns:
             Optional[Document]: Document instance or None
         """
-        sort, sort_fields = sort_validation(sort, sort_fields)
-        data = await self._make_query(
-            "find_one",
-            logical_query or query,
-            logical=bool(logical_query),
-            sort=[(field, sort or 1) for field in sort_fields] if sort_fields else None,
-            session=session,
+        sort, sort_fields = self._sort_validation(sort, sort_fields)
+        query_params = self._compile_query(logical_query or query, bool(logical_query))
+        sort_params = (
+            [(field, sort or 1) for field in sort_fields] if sort_fields else None
         )
+
+        async def fetch() -> list:
+            row = await self._execute_query(
+                "find_one", query_params, sort=sort_params, session=session
+            )
+            return [row] if row is not None else []
+
+        rows = await self._read_through(
+            "find_one", query_params, fetch, session=session, sort=sort_params
+        )
+        data = rows[0] if rows else None
         if data is not None:
             obj = self.odm_manager.document.from_bson(data)
             if with_relations_objects and self.odm_manager.relation_manager:
@@ -333,42 +561,134 @@ class Builder(object):
         logical_query: Union[Q, QCombination, None] = None,
         skip_rows: Optional[int] = None,
         limit_rows: Optional[int] = None,
-        session: Optional[ClientSession] = None,
+        session: Optional["ClientSession"] = None,
         sort_fields: Optional[Union[Tuple, List]] = None,
         sort: Optional[int] = None,
+        as_rows: bool = False,
+        raw_rows: bool = False,
         **query,
     ) -> AsyncGenerator:
-        sort, sort_fields_parsed = sort_validation(sort, sort_fields)
+        sort, sort_fields_parsed = self._sort_validation(sort, sort_fields)
+        document_class = self.odm_manager.document
+        from_bson: Callable[[Any], Any]
+        if raw_rows:
+            # rows as motor returns them, for query cache
+            from_bson = _raw_row
+        elif as_rows:
+            from_bson = document_class.__row_class__.from_bson
+        else:
+            from_bson = document_class.from_bson
 
         async def context():
-            if bool(logical_query):
-                query_params = self._check_query_args(logical_query)
-            else:
-                query_params = self._validate_query_data(query)
-            find_cursor_method = getattr(self.odm_manager.collection, "find")
-            cursor = find_cursor_method(query_params, session=session)
-            if skip_rows is not None:
-                cursor = cursor.skip(skip_rows)
-            if limit_rows:
-                cursor = cursor.limit(limit_rows)
-            if sort:
-                cursor.sort([(field, sort or 1) for field in sort_fields_parsed])
+            query_params = self._compile_query(
+                logical_query or query, bool(logical_query)
+            )
+            cursor = self._find_cursor(
+                query_params, skip_rows, limit_rows, session, sort, sort_fields_parsed
+            )
             async for doc in cursor:
-                yield self.odm_manager.document.from_bson(doc)
-
-        return context()
+                yield from_bson(doc)
+
+        async def context_with_event():
+            event = QueryEvent(
+                "find",
+                document_class.get_collection_name(),
+                document=document_class,
+                options={
+                    "sort": (
+                        [(field, sort) for field in sort_fields_parsed]
+                        if sort
+                        else None
+                    ),
+                    "skip": skip_rows,
+                    "limit": limit_rows,
+                },
+            )
+            hydrate = (
+                document_class.__row_class__.from_bson
+                if as_rows
+                else document_class._from_data
+            )
+            start = perf_counter()
+            try:
+                event.filter = query_params = self._compile_query(
+                    logical_query or query, bool(logical_query)
+                )
+                cursor = self._find_cursor(
+                    query_params,
+                    skip_rows,
+                    limit_rows,
+                    session,
+                    sort,
+                    sort_fields_parsed,
+                ).__aiter__()
+                event.compile_ms = (perf_counter() - start) * 1000
+                while True:
+                    start = perf_counter()
+                    try:
+                        doc = await cursor.__anext__()
+                    except StopAsyncIteration:
+                        event.server_ms += (perf_counter() - start) * 1000
+                        break
+                    decoded = perf_counter()
+                    event.server_ms += (decoded - start) * 1000
+                    if raw_rows:
+                        event.bytes += len(doc.raw)
+                        event.rows += 1
+                        yield doc
+                        continue
+                    if isinstance(doc, RawBSONDocument):
+                        event.bytes += len(doc.raw)
+                        data = bson_decode(doc.raw)
+                    else:
+                        data = doc
+                    start = perf_counter()
+                    event.decode_ms += (start - decoded) * 1000
+                    obj = hydrate(data)
+                    event.hydrate_ms += (perf_counter() - start) * 1000
+                    event.rows += 1
+                    yield obj
+            except Exception as e:
+                event.error = e
+                raise
+            finally:
+                emit(event)
+
+        return context_with_event() if listeners else context()
+
+    def _find_cursor(
+        self,
+        query_params: Dict,
+        skip_rows: Optional[int] = None,
+        limit_rows: Optional[int] = None,
+        session: Optional["ClientSession"] = None,
+        sort: Optional[int] = None,
+        sort_fields: Optional[Union[Tuple, List]] = None,
+    ) -> Any:
+        find_cursor_method = getattr(self.odm_manager.collection, "find")
+        cursor = find_cursor_method(query_params, session=session)
+        if skip_rows is not None:
+            cursor = cursor.skip(skip_rows)
+        if limit_rows:
+            cursor = cursor.limit(limit_rows)
+        if sort:
+            cursor.sort([(field, sort or 1) for field in sort_fields])  # type: ignore
+        return cursor
 
     async def find(
         self,
         logical_query: Union[Q, QCombination, None] = None,
         skip_rows: Optional[int] = None,
         limit_rows: Optional[int] = None,
-        session: Optional[ClientSession] = None,
+        session: Optional["ClientSession"] = None,
         sort_fields: Optional[Union[Tuple, List]] = None,
         sort: Optional[int] = None,
         with_relations_objects: bool = False,
+        as_json: bool = False,
+        json_mode: str = "plain",
+        as_rows: bool = False,
         **query,
-    ) -> FindResult:
+    ) -> Union[FindResult, AsyncIterator[bytes]]:
         """find method
 
         Args:
@@ -378,46 +698,209 @@ class Builder(object):
             session (Optional[ClientSession], optional): pymongo session. Defaults to None.
             sort_fields (Optional[Union[Tuple, List]], optional): iterable from sort fielda. Defaults to None.
             sort (Optional[int], optional): sort value -1 or 1. Defaults to None.
+            as_json (bool, optional): return async iterator of json array chunks built from raw bson, without Documents. Defaults to False.
+            json_mode (str, optional): plain, relaxed or canonical extended json for as_json. Defaults to "plain".
+            as_rows (bool, optional): return read-only slots rows without validation instead of Documents. Defaults to False.
 
         Returns:
-            FindResult: Motordantic FindResult
+            Union[FindResult, AsyncIterator[bytes]]: Motordantic FindResult or json chunks
         """
-        result = await self._find(
-            logical_query,
-            skip_rows,
-            limit_rows,
-            session,
-            sort_fields,
-            sort,
-            **query,
-        )
-        data = [doc async for doc in result]
+        if as_json:
+            if with_relations_objects:
+                raise MotordanticInvalidArgsParams(
+                    "as_json can't be used with with_relations_objects"
+                )
+            if json_mode not in JSON_MODES:
+                raise MotordanticValidationError(
+                    f"invalid json_mode - {json_mode}, use one of {JSON_MODES}"
+                )
+            sort, sort_fields = self._sort_validation(sort, sort_fields)
+            query_params = self._compile_query(
+                logical_query or query, bool(logical_query)
+            )
+            cursor = self._find_cursor(
+                query_params, skip_rows, limit_rows, session, sort, sort_fields
+            )
+            return iter_bson_json(cursor, self.odm_manager.document, json_mode)
+        if as_rows and with_relations_objects:
+            raise MotordanticInvalidArgsParams(
+                "as_rows can't be used with with_relations_objects"
+            )
+        if self.odm_manager.cache is not None and session is None:
+
+            async def fetch() -> list:
+                rows = await self._find(
+                    logical_query,
+                    skip_rows,
+                    limit_rows,
+                    session,
+                    sort_fields,
+                    sort,
+                    raw_rows=True,
+                    **query,
+                )
+                return [row async for row in rows]
+
+            sort_value, sort_fields_parsed = self._sort_validation(sort, sort_fields)
+            query_params = self._compile_query(
+                logical_query or query, bool(logical_query)
+            )
+            rows = await self._read_through(
+                "find",
+                query_params,
+                fetch,
+                skip=skip_rows,
+                limit=limit_rows,
+                sort=(
+                    [(field, sort_value) for field in sort_fields_parsed]
+                    if sort_value
+                    else None
+                ),
+            )
+            document_class = self.odm_manager.document
+            from_bson = (
+                document_class.__row_class__.from_bson
+                if as_rows
+                else document_class.from_bson
+            )
+            data = [from_bson(row) for row in rows]
+        else:
+            result = await self._find(
+                logical_query,
+                skip_rows,
+                limit_rows,
+                session,
+                sort_fields,
+                sort,
+                as_rows,
+                **query,
+            )
+            data = [doc async for doc in result]
         if with_relations_objects and self.odm_manager.relation_manager:
             data = await self.odm_manager.relation_manager.map_relation_for_array(data)
         return FindResult(self.odm_manager.document, data)
 
+    async def find_with_count(
+        self,
+        logical_query: Union[Q, QCombination, None] = None,
+        skip_rows: Optional[int] = None,
+        limit_rows: Optional[int] = None,
+        session: Optional["ClientSession"] = None,
+        sort_fields: Optional[Union[Tuple, List]] = None,
+        sort: Optional[int] = None,
+        with_relations_objects: bool = False,
+        **query,
+    ) -> Tuple[int, FindResult]:
+        """page of documents and total count of filter in one $facet aggregation
+
+        Page must fit in one 16MB aggregation result document.
+
+        Args:
+            logical_query (Union[Q, QCombination, None], optional): Query | QueryCombination. Defaults to None.
+            skip_rows (Optional[int], optional): skip rows for pagination. Defaults to None.
+            limit_rows (Optional[int], optional): limit rows. Defaults to None.
+            session (Optional[ClientSession], optional): motor session. Defaults to None.
+            sort_fields (Optional[Union[Tuple, List]], optional): iterable from sort fields. Defaults to None.
+            sort (Optional[int], optional): sort value -1 or 1. Defaults to None.
+
+        Returns:
+            Tuple[int, FindResult]: total count and FindResult of page
+        """
+        sort, sort_fields = self._sort_validation(sort, sort_fields)
+        query_params = self._compile_query(logical_query or query, bool(logical_query))
+        rows = self.odm_manager.aggregate()
+        if sort:
+            # fields are db names already, Aggregate.sort would map them again
+            rows.pipeline.append(
+                {"$sort": {field: sort for field in sort_fields}}  # type: ignore
+            )
+        if skip_rows:
+            rows.skip(skip_rows)
+        if limit_rows:
+            rows.limit(limit_rows)
+        aggregate = (
+            self.odm_manager.aggregate()
+            .raw_match(query_params)
+            .facet({"rows": rows, "count": self.odm_manager.aggregate().count()})
+        )
+        result = await self.raw_aggregate(aggregate.pipeline, session, decode="raw")
+        facet = result[0]
+        total = facet["count"][0]["count"] if facet["count"] else 0
+        from_bson = self.odm_manager.document.from_bson
+        data = [from_bson(row) for row in facet["rows"]]
+        if with_relations_objects and self.odm_manager.relation_manager:
+            data = await self.odm_manager.relation_manager.map_relation_for_array(data)
+        return total, FindResult(self.odm_manager.document, data)
+
+    async def find_columns(
+        self,
+        fields: Union[Tuple, List],
+        logical_query: Union[Q, QCombination, None] = None,
+        batch_size: int = 10000,
+        session: Optional["ClientSession"] = None,
+        sort_fields: Optional[Union[Tuple, List]] = None,
+        sort: Optional[int] = None,
+        as_numpy: bool = False,
+        **query,
+    ) -> AsyncIterator[dict]:
+        """stream query result as column batches, only requested fields are fetched and decoded
+
+        Args:
+            fields (Union[Tuple, List]): document fields, dotted path for inner values
+            logical_query (Union[Q, QCombination, None], optional): Query | QueryCombination. Defaults to None.
+            batch_size (int, optional): rows per batch. Defaults to 10000.
+            session (Optional[ClientSession], optional): motor session. Defaults to None.
+            sort_fields (Optional[Union[Tuple, List]], optional): iterable from sort fields. Defaults to None.
+            sort (Optional[int], optional): sort value -1 or 1. Defaults to None.
+            as_numpy (bool, optional): yield numpy arrays, numpy must be installed. Defaults to False.
+
+        Returns:
+            AsyncIterator[dict]: batches of field name to array.array or list
+        """
+        mapping = self.odm_manager.document.__mapping_query_fields__
+        db_fields = []
+        for field in fields:
+            name, _, rest = field.partition(".")
+            db_name = mapping.get(name, name)
+            db_fields.append(f"{db_name}.{rest}" if rest else db_name)
+        builder = ColumnBuilder(self.odm_manager.document, fields, db_fields)
+        sort, sort_fields = self._sort_validation(sort, sort_fields)
+        query_params = self._compile_query(logical_query or query, bool(logical_query))
+        cursor = self.odm_manager.collection.find(
+            query_params,
+            projection={f: 1 for f in db_fields},
+            batch_size=batch_size,
+            session=session,
+        )
+        if sort:
+            cursor.sort([(field, sort) for field in sort_fields])  # type: ignore
+
+        async def context():
+            async for row in cursor:
+                builder.append(row)
+                if len(builder) >= batch_size:
+                    yield builder.result(as_numpy)
+                    builder.reset()
+            if len(builder):
+                yield builder.result(as_numpy)
+
+        return context()
+
     def _prepare_update_data(self, **fields) -> tuple:
-        """prepare and validate query data for update queries"""
-
-        if not any("__set" in f for f in fields):
-            raise MotordanticValidationError("not fields for updating!")
-        query_params = {}
-        set_values = {}
-        for name, value in fields.items():
-            if name.endswith("__set"):
-                name = name.replace("__set", "")
-                data = self._validate_query_data({name: value})
-                set_values.update(data)
-            else:
-                query_params.update({name: value})
-        return query_params, set_values
+        """split update arguments into filter and validated update document
+
+        Arguments ending with an operator suffix like name__set, views__inc or
+        tags__push are compiled to update operators, the rest is filter.
+        """
+        return compile_update(self.odm_manager, fields)
 
     async def _update(
         self,
         method: str,
         query: Dict,
         upsert: bool = True,
-        session: Optional[ClientSession] = None,
+        session: Optional["ClientSession"] = None,
+        pipeline: Union["Aggregate", List[Dict], None] = None,
     ) -> int:
         """innert method for update
 
@@ -426,43 +909,70 @@ class Builder(object):
             query (Dict): update query
             upsert (bool, optional): upsert option. Defaults to True.
             session (Optional[ClientSession], optional): motor session. Defaults to None.
+            pipeline (Union[Aggregate, List[Dict], None], optional): update pipeline, query is filter only. Defaults to None.
 
         Returns:
             int: updated documents count
         """
-        query, set_values = self._prepare_update_data(**query)
-        r = await self._make_query(
-            method, query, {"$set": set_values}, upsert=upsert, session=session
-        )
+        if pipeline is not None:
+            query, update = compile_update_pipeline(self.odm_manager, pipeline, query)
+        else:
+            query, update = self._prepare_update_data(**query)
+        r = await self._make_query(method, query, update, upsert=upsert, session=session)
         return r.modified_count
 
     async def update_one(
-        self, upsert: bool = False, session: Optional[ClientSession] = None, **query
+        self,
+        upsert: bool = False,
+        session: Optional["ClientSession"] = None,
+        pipeline: Union["Aggregate", List[Dict], None] = None,
+        **query,
     ) -> int:
         """update one document
 
+        upsert, session and pipeline are method keywords, document fields
+        with these names can't be used as filter arguments.
+
         Args:
             upsert (bool, optional): pymongo upsert. Defaults to False.
             session (Optional[ClientSession], optional): motor session. Defaults to None.
+            pipeline (Union[Aggregate, List[Dict], None], optional): update pipeline, query is filter only. Raw stages are sent as is and must use db field names, Aggregate.set/unset map them. Defaults to None.
 
         Returns:
             int: updated documents count
         """
-        return await self._update("update_one", query, upsert=upsert, session=session)
+        return await self._update(
+            "update_one", query, upsert=upsert, session=session, pipeline=pipeline
+        )
 
     async def update_many(
-        self, upsert: bool = False, session: Optional[ClientSession] = None, **query
+        self,
+        upsert: bool = False,
+        session: Optional["ClientSession"] = None,
+        pipeline: Union["Aggregate", List[Dict], None] = None,
+        **query,
     ) -> int:
         """update many document
 
+        Computed updates run server side with pipeline:
+
+            pipeline = Order.manager.aggregate().set(total={'$multiply': ['$price', '$qty']})
+            await Order.Q.update_many(status='new', pipeline=pipeline)
+
+        upsert, session and pipeline are method keywords, document fields
+        with these names can't be used as filter arguments.
+
         Args:
             upsert (bool, optional): pymongo upsert. Defaults to False.
             session (Optional[ClientSession], optional): motor session. Defaults to None.
+            pipeline (Union[Aggregate, List[Dict], None], optional): update pipeline, query is filter only. Raw stages are sent as is and must use db field names, Aggregate.set/unset map them. Defaults to None.
 
         Returns:
             int: updated documents count
         """
-        return await self._update("update_many", query, upsert=upsert, session=session)
+        return await self._update(
+            "update_many", query, upsert=upsert, session=session, pipeline=pipeline
+        )
 
     async def _find_with_replacement_or_with_update(
         self,
@@ -471,7 +981,7 @@ class Builder(object):
         sort_fields: Optional[Union[Tuple, List]] = None,
         sort: Optional[int] = None,
         upsert: bool = False,
-        session: Optional[ClientSession] = None,
+        session: Optional["ClientSession"] = None,
         **query,
     ) -> Union[Dict, "Document", None]:
         """base method for find_with_<operation>
@@ -487,11 +997,18 @@ class Builder(object):
         Returns:
             Union[Dict, 'Document']: Document or Dict or None
         """
-        filter_, set_values = self._prepare_update_data(**query)
+        from pymongo import ReturnDocument
+
+        filter_, update = self._prepare_update_data(**query)
         return_document = ReturnDocument.AFTER
         replacement = query.pop("replacement", None)
 
-        projection = {f: True for f in projection_fields} if projection_fields else None
+        document_class = self.odm_manager.document
+        projection = (
+            {document_class.get_db_field(f): True for f in projection_fields}
+            if projection_fields
+            else None
+        )
         extra_params = {
             "return_document": return_document,
             "projection": projection,
@@ -499,20 +1016,25 @@ class Builder(object):
             "session": session,
         }
         if sort_fields:
-            extra_params["sort"] = [(field, sort or 1) for field in sort_fields]
+            extra_params["sort"] = [
+                (document_class.get_db_field(field), sort or 1) for field in sort_fields
+            ]
 
         if replacement:
             extra_params["replacement"] = replacement
 
         data = await self._make_query(
-            operation, filter_, set_values={"$set": set_values}, **extra_params
+            operation, filter_, set_values=update, **extra_params
         )
         if projection:
+            mapping = document_class.__mapping_from_fields__
             return {
-                field: value for field, value in data.items() if field in projection
+                mapping.get(field, field): value
+                for field, value in data.items()
+                if field in projection
             }
         if data:
-            return self.odm_manager.document.from_bson(data)
+            return document_class.from_bson(data)
         return None
 
     async def find_one_and_update(
@@ -521,7 +1043,7 @@ class Builder(object):
         sort_fields: Optional[Union[Tuple, List]] = None,
         sort: Optional[int] = None,
         upsert: bool = False,
-        session: Optional[ClientSession] = None,
+        session: Optional["ClientSession"] = None,
         **query,
     ) -> Union[Dict, "Document", None]:
         """find one and update
@@ -540,9 +1062,7 @@ class Builder(object):
         return await self._find_with_replacement_or_with_update(
             "find_one_and_update",
             projection_fields=projection_fields,
-            sort_fields=(
-                [(field, sort or 1) for field in sort_fields] if sort_fields else None
-            ),
+            sort_fields=sort_fields,
             sort=sort,
             upsert=upsert,
             session=session,
@@ -556,7 +1076,7 @@ class Builder(object):
         sort_fields: Optional[Union[Tuple, List]] = None,
         sort: Optional[int] = None,
         upsert: bool = False,
-        session: Optional[ClientSession] = None,
+        session: Optional["ClientSession"] = None,
         **query,
     ) -> Union[Dict, "Document", None]:
         """find one and replace
@@ -577,9 +1097,7 @@ class Builder(object):
         return await self._find_with_replacement_or_with_update(
             "find_and_replace",
             projection_fields=projection_fields,
-            sort_fields=(
-                [(field, sort) for field in sort_fields] if sort_fields else None
-            ),
+            sort_fields=sort_fields,
             sort=sort,
             upsert=upsert,
             session=session,
@@ -588,7 +1106,7 @@ class Builder(object):
         )
 
     async def _motor_aggreggate_call(
-        self, data: list, session: Optional[ClientSession]
+        self, data: list, session: Optional["ClientSession"]
     ) -> AsyncIterable:
         async def context():
             aggregate_cursor = getattr(self.odm_manager.collection, "aggregate")
@@ -602,19 +1120,51 @@ class Builder(object):
         return bson_decode(row.raw)
 
     async def raw_aggregate(
-        self, data: List[Dict[Any, Any]], session: Optional[ClientSession] = None
+        self,
+        data: List[Dict[Any, Any]],
+        session: Optional["ClientSession"] = None,
+        decode: DecodeStrategy = "dict",
+        fields: Optional[Union[Tuple, List]] = None,
     ) -> list:
         """raw aggregation query
 
         Args:
             data (List[Dict[Any, Any]]): aggregation query
             session (Optional[ClientSession], optional): motor session. Defaults to None.
+            decode (DecodeStrategy, optional): raw, dict, document, tuple, pydantic model or callable. Defaults to "dict".
+            fields (Optional[Union[Tuple, List]], optional): decode only this row keys. Defaults to None.
 
         Returns:
             list: aggregation result
         """
-        result = await self._motor_aggreggate_call(data, session)
-        return [self.from_bson(row) async for row in result]
+        decoder = get_decoder(self.odm_manager.document, decode, fields)
+        if not listeners:
+            result = await self._motor_aggreggate_call(data, session)
+            return [decoder(row) async for row in result]
+        event = QueryEvent(
+            "aggregate",
+            self.odm_manager.document.get_collection_name(),
+            data,
+            self.odm_manager.document,
+        )
+        start = perf_counter()
+        try:
+            cursor = await self._motor_aggreggate_call(data, session)
+            rows = [row async for row in cursor]
+            decoded = perf_counter()
+            event.server_ms = (decoded - start) * 1000
+            event.rows = len(rows)
+            event.bytes = sum(
+                len(row.raw) for row in rows if isinstance(row, RawBSONDocument)
+            )
+            result = [decoder(row) for row in rows]
+            event.decode_ms = (perf_counter() - decoded) * 1000
+            return result
+        except Exception as e:
+            event.error = e
+            raise
+        finally:
+            emit(event)
 
     async def _aggregate(self, *args, **query) -> SimpleAggregateResult:
         """main aggregate method
@@ -639,7 +1189,9 @@ class Builder(object):
         else:
             aggregate_query = {}
         if group_by:
-            group_by = group_by_aggregate_generation(group_by)
+            group_by = group_by_aggregate_generation(
+                group_by, self.odm_manager.document.__mapping_query_fields__
+            )
             aggregate_query.pop("_id", None)
             group_params = {"$group": {"_id": group_by, **aggregate_query}}
         else:
@@ -661,8 +1213,7 @@ class Builder(object):
             group_params,
         ]
 
-        async_result = await self._motor_aggreggate_call(data, session)
-        result = [self.from_bson(row) async for row in async_result]
+        result = await self.raw_aggregate(data, session)
         if not result:
             return SimpleAggregateResult(self.odm_manager.document, {})
         result_data = {}
@@ -675,24 +1226,20 @@ class Builder(object):
         return await self._aggregate(*args, **kwargs)
 
     async def aggregate_sum(self, agg_field: str, **query) -> Union[int, float]:
-        result_field = self.odm_manager.document.__mapping_query_fields__[agg_field]
         result = await self._aggregate(aggregation=Sum(agg_field), **query)
-        return result.data.get(f"{result_field}__sum", 0)
+        return result.data.get(f"{agg_field}__sum", 0)
 
     async def aggregate_max(self, agg_field: str, **query) -> Union[int, float]:
         result = await self._aggregate(aggregation=Max(agg_field), **query)
-        result_field = self.odm_manager.document.__mapping_query_fields__[agg_field]
-        return result.data.get(f"{result_field}__max", 0)
+        return result.data.get(f"{agg_field}__max", 0)
 
     async def aggregate_min(self, agg_field: str, **query) -> Union[int, float]:
         result = await self._aggregate(aggregation=Min(agg_field), **query)
-        result_field = self.odm_manager.document.__mapping_query_fields__[agg_field]
-        return result.data.get(f"{result_field}__min", 0)
+        return result.data.get(f"{agg_field}__min", 0)
 
     async def aggregate_avg(self, agg_field: str, **query) -> Union[int, float]:
         result = await self._aggregate(aggregation=Avg(agg_field), **query)
-        result_field = self.odm_manager.document.__mapping_query_fields__[agg_field]
-        return result.data.get(f"{result_field}__avg", 0)
+        return result.data.get(f"{agg_field}__avg", 0)
 
     def _validate_raw_query(
         self, method_name: str, raw_query: Union[Dict, List[Dict], Tuple[Dict]]
@@ -720,7 +1267,7 @@ class Builder(object):
         self,
         method_name: str,
         raw_query: Union[Dict, List[Dict], Tuple[Dict]],
-        session: Optional[ClientSession] = None,
+        session: Optional["ClientSession"] = None,
     ) -> Any:
         """pymongo raw query
 
@@ -738,11 +1285,15 @@ class Builder(object):
         parsed_query = self._validate_raw_query(method_name, raw_query)
         try:
             query = getattr(self.odm_manager.collection, method_name)
-            return await query(*parsed_query, session=session)
         except AttributeError:
             raise MotordanticValidationError("invalid method name")
+        try:
+            return await query(*parsed_query, session=session)
+        finally:
+            if method_name in _WRITE_METHODS:
+                await self._invalidate_cache()
 
-    async def list_indexes(self, session: Optional[ClientSession] = None) -> dict:
+    async def list_indexes(self, session: Optional["ClientSession"] = None) -> dict:
         """get indexes for this collection
 
         Returns:
@@ -753,30 +1304,31 @@ class Builder(object):
         index_list = await query.to_list(None)
         return_data = {}
         for index in index_list:
-            dict_index = dict(index)
-            data = {dict_index["name"]: {"key": dict(dict_index["key"])}}
-            return_data.update(data)
+            return_data[index["name"]] = {"key": dict(index["key"])}
         return return_data
 
     async def create_indexes(
         self,
-        indexes: List[IndexModel],
-        session: Optional[ClientSession] = None,
+        indexes: List["IndexModel"],
+        session: Optional["ClientSession"] = None,
     ) -> List[str]:
-        create_indexes_cursor = getattr(self.odm_manager.collection, "create_index")
-        result = []
-        for index in indexes:
-            index_value = list(index.document["key"].items())
-            res = await create_indexes_cursor(
-                index_value,
-                session=session,
-                background=True,
-            )
-            result.append(res)
-        return result
+        """create indexes with all IndexModel options in one command
+
+        Args:
+            indexes (List[IndexModel]): pymongo index models
+            session (Optional[ClientSession], optional): motor session. Defaults to None.
+
+        Returns:
+            List[str]: created index names
+        """
+        if not indexes:
+            return []
+        return await self.odm_manager.collection.create_indexes(
+            indexes, session=session
+        )
 
     async def drop_index(
-        self, index_name: str, session: Optional[ClientSession] = None
+        self, index_name: str, session: Optional["ClientSession"] = None
     ) -> str:
         indexes = await self.list_indexes(session)
         if index_name in indexes:
@@ -784,6 +1336,37 @@ class Builder(object):
             return f"{index_name} dropped."
         raise MotordanticIndexError(f"invalid index name - {index_name}")
 
+    def watch(
+        self,
+        pipeline: Union[List[Dict], "Aggregate", None] = None,
+        full_document: Optional[str] = None,
+        resume_token_store: Optional[BaseResumeTokenStore] = None,
+        name: Optional[str] = None,
+        session: Optional["ClientSession"] = None,
+        **kwargs,
+    ) -> ChangeStream:
+        """watch collection changes
+
+        Args:
+            pipeline (Union[List[Dict], Aggregate, None], optional): change stream pipeline. Defaults to None.
+            full_document (Optional[str], optional): pymongo full_document, like updateLookup. Defaults to None.
+            resume_token_store (Optional[BaseResumeTokenStore], optional): store for resume token persistence. Defaults to None.
+            name (Optional[str], optional): resume token name. Defaults to collection name.
+            session (Optional[ClientSession], optional): motor session. Defaults to None.
+
+        Returns:
+            ChangeStream: async iterator of ChangeEvent with hydrated documents
+        """
+        return ChangeStream(
+            self.odm_manager.document,
+            pipeline=pipeline,
+            full_document=full_document,
+            resume_token_store=resume_token_store,
+            name=name,
+            session=session,
+            **kwargs,
+        )
+
     async def drop_collection(self, force: bool = False) -> bool:
         """drop collection
 
@@ -795,11 +1378,13 @@ class Builder(object):
         """
         if force:
             await self.odm_manager.collection.drop()  # type: ignore
+            await self._invalidate_cache()
             return True
         value = input(
             f"Are u sure for drop this collection - {self.odm_manager.document.__name__.lower()} (y, n)"  # type: ignore
         )
         if value.lower() == "y":
             await self.odm_manager.collection.drop()  # type: ignore
+            await self._invalidate_cache()
             return True
         return False
@@ -0,0 +1,148 @@
+from array import array
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Union,
+    get_args,
+    get_origin,
+)
+
+from bson.raw_bson import RawBSONDocument
+
+from ..exceptions import MotordanticValidationError
+from ..utils.pydantic import get_field_type, get_model_fields
+from .decode import to_python
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+__all__ = ("ColumnBuilder", "column_typecodes")
+
+if TYPE_CHECKING:
+    from ..document import Document
+
+Column = Union[array, list, Any]
+
+_TYPECODES = {bool: "b", int: "q", float: "d"}
+_NUMPY_DTYPES = {"b": "bool", "q": "int64", "d": "float64"}
+
+
+def _unwrap_optional(annotation: Any) -> Any:
+    args = get_args(annotation)
+    if get_origin(annotation) is Union and len(args) == 2 and type(None) in args:
+        return args[0] if args[1] is type(None) else args[1]
+    return annotation
+
+
+def column_typecodes(
+    document_class: "Document", fields: Sequence[str]
+) -> Dict[str, Optional[str]]:
+    """array typecodes for fields by document annotations, None for object columns"""
+    model_fields = get_model_fields(document_class)
+    typecodes: Dict[str, Optional[str]] = {}
+    for field in fields:
+        name = field.split(".", 1)[0]
+        if name not in model_fields and name != "_id":
+            raise MotordanticValidationError(
+                f"field - {name} not a field from model: {document_class.__name__}"
+            )
+        if "." in field or name == "_id":
+            typecodes[field] = None
+            continue
+        annotation = _unwrap_optional(get_field_type(model_fields[name]))
+        typecodes[field] = _TYPECODES.get(annotation)
+    return typecodes
+
+
+def _get_value(row: Any, path: Sequence[str]) -> Any:
+    value = row
+    for key in path:
+        if value is None:
+            return None
+        if isinstance(value, (dict, RawBSONDocument)):
+            value = value.get(key)
+        else:
+            value = getattr(value, key, None)
+    return to_python(value)
+
+
+class ColumnBuilder(object):
+    """collect rows into typed column buffers
+
+    Numeric and bool fields go to array.array, a column falls back to list
+    when a value does not fit (None, big int).
+    """
+
+    __slots__ = ("fields", "typecodes", "columns", "_paths")
+
+    def __init__(
+        self,
+        document_class: "Document",
+        fields: Sequence[str],
+        db_fields: Optional[Sequence[str]] = None,
+    ):
+        self.fields = tuple(fields)
+        self.typecodes = column_typecodes(document_class, self.fields)
+        self._paths = tuple(tuple(f.split(".")) for f in (db_fields or self.fields))
+        self.columns: Dict[str, Column] = {}
+        self.reset()
+
+    def reset(self) -> None:
+        self.columns = {
+            field: array(typecode) if typecode else []  # type: ignore
+            for field, typecode in self.typecodes.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.columns[self.fields[0]]) if self.fields else 0
+
+    def append(self, row: Any) -> None:
+        """append Document, dict or RawBSONDocument row"""
+        columns = self.columns
+        for field, path in zip(self.fields, self._paths):
+            value = _get_value(row, path)
+            column = columns[field]
+            try:
+                column.append(value)
+            except (TypeError, OverflowError):
+                columns[field] = column = list(column)
+                column.append(value)
+
+    def result(self, as_numpy: bool = False) -> Dict[str, Column]:
+        """collected columns, numpy arrays if as_numpy
+
+        Raises:
+            MotordanticValidationError: numpy not installed
+        """
+        if not as_numpy:
+            return self.columns
+        if numpy is None:
+            raise MotordanticValidationError("numpy is not installed")
+        data: Dict[str, Column] = {}
+        for field, column in self.columns.items():
+            if isinstance(column, array):
+                data[field] = numpy.frombuffer(
+                    column, dtype=_NUMPY_DTYPES[column.typecode]
+                ).copy()
+            else:
+                data[field] = numpy.array(column, dtype=object)
+        return data
+
+    @classmethod
+    def from_rows(
+        cls,
+        document_class: "Document",
+        fields: Sequence[str],
+        rows: List[Any],
+        as_numpy: bool = False,
+    ) -> Dict[str, Column]:
+        builder = cls(document_class, fields)
+        for row in rows:
+            builder.append(row)
+        return builder.result(as_numpy)
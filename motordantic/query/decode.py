@@ -0,0 +1,78 @@
+from typing import TYPE_CHECKING, Any, Callable, Optional, Sequence, Type, Union
+
+from bson import decode as bson_decode
+from bson.raw_bson import RawBSONDocument
+from pydantic import BaseModel
+
+from ..exceptions import MotordanticValidationError
+from ..utils.pydantic import parse_model
+
+__all__ = ("DECODE_STRATEGIES", "DecodeStrategy", "get_decoder", "to_python")
+
+if TYPE_CHECKING:
+    from ..document import Document
+
+DECODE_STRATEGIES = ("raw", "dict", "document", "tuple")
+
+DecodeStrategy = Union[str, Type[BaseModel], Callable[[RawBSONDocument], Any]]
+
+
+def to_python(value: Any) -> Any:
+    """nested raw documents and arrays of them to dicts"""
+    if isinstance(value, RawBSONDocument):
+        return bson_decode(value.raw)
+    if isinstance(value, list):
+        return [to_python(v) for v in value]
+    return value
+
+
+def _decode_dict(row: Any) -> dict:
+    if isinstance(row, RawBSONDocument):
+        return bson_decode(row.raw)
+    return dict(row)
+
+
+def get_decoder(
+    document_class: "Document",
+    decode: DecodeStrategy = "dict",
+    fields: Optional[Sequence[str]] = None,
+) -> Callable[[Any], Any]:
+    """build row decoder for motor results
+
+    Args:
+        document_class (Document): document class of query
+        decode (DecodeStrategy, optional): raw, dict, document, tuple, pydantic model class or callable. Defaults to "dict".
+        fields (Optional[Sequence[str]], optional): decode only this keys, required for tuple. Defaults to None.
+
+    Raises:
+        MotordanticValidationError: unknown strategy or tuple without fields
+
+    Returns:
+        Callable[[Any], Any]: row decoder
+    """
+    if isinstance(decode, type) and issubclass(decode, BaseModel):
+        model = decode
+        if fields:
+            return lambda row: parse_model(
+                model, {f: to_python(row.get(f)) for f in fields}
+            )
+        return lambda row: parse_model(model, _decode_dict(row))
+    if not isinstance(decode, str):
+        if callable(decode):
+            return decode
+        raise MotordanticValidationError(f"invalid decode strategy - {decode}")
+    if decode == "raw":
+        return lambda row: row
+    if decode == "dict":
+        if fields:
+            return lambda row: {f: to_python(row.get(f)) for f in fields}
+        return _decode_dict
+    if decode == "document":
+        return document_class.from_bson
+    if decode == "tuple":
+        if not fields:
+            raise MotordanticValidationError("tuple decode strategy requires fields")
+        return lambda row: tuple(to_python(row.get(f)) for f in fields)
+    raise MotordanticValidationError(
+        f"invalid decode strategy - {decode}, use one of {DECODE_STRATEGIES}"
+    )
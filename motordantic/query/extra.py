@@ -18,7 +18,6 @@ else:
     from typing_extensions import get_args, get_origin
 
 from bson import ObjectId, Regex
-from pymongo import UpdateOne
 from pydantic.fields import FieldInfo as ModelField
 
 from ..property import cached_classproperty
@@ -36,6 +35,7 @@ __all__ = (
 
 if TYPE_CHECKING:
     from ..document import Document
+    from ..field_paths import FieldPath
 
 
 class ExtraQueryMapper(object):
@@ -44,11 +44,23 @@ class ExtraQueryMapper(object):
     __slots__ = (
         "document",
         "field_name",
+        "_field_path",
     )
 
-    def __init__(self, document: "Document", field_name: str):
+    def __init__(
+        self,
+        document: "Document",
+        field_name: str,
+        field_path: Optional["FieldPath"] = None,
+    ):
         self.field_name = field_name
         self.document = document
+        self._field_path = field_path
+
+    def _validate(self, value: Any) -> Any:
+        if self._field_path is not None:
+            return self._field_path.validate(value)
+        return validate_field_value(self.document, self.field_name, value)
 
     def query(self, extra_methods: List, values: Any) -> Dict:
         if self.field_name == "_id":
@@ -74,12 +86,7 @@ class ExtraQueryMapper(object):
         if not isinstance(list_values, list):
             raise TypeError("values must be a list type")
         # try:
-        return {
-            "$in": [
-                validate_field_value(self.document, self.field_name, v)
-                for v in list_values
-            ]
-        }
+        return {"$in": [self._validate(v) for v in list_values]}
         # except MotordanticValidationError:
         # return {"$in": list_values}
 
@@ -93,7 +100,7 @@ class ExtraQueryMapper(object):
         return {"$not": Regex.from_native(compile(regex_value))}
 
     def ne(self, value: Any) -> dict:
-        return {"$ne": validate_field_value(self.document, self.field_name, value)}
+        return {"$ne": self._validate(value)}
 
     def startswith(self, value: str) -> dict:
         return {"$regex": Regex.from_native(compile(f"^{value}"))}
@@ -119,12 +126,7 @@ class ExtraQueryMapper(object):
     def nin(self, list_values: List) -> dict:
         if not isinstance(list_values, list):
             raise TypeError("values must be a list type")
-        return {
-            "$nin": [
-                validate_field_value(self.document, self.field_name, v)
-                for v in list_values
-            ]
-        }
+        return {"$nin": [self._validate(v) for v in list_values]}
 
     def exists(self, boolean_value: bool) -> dict:
         if not isinstance(boolean_value, bool):
@@ -144,16 +146,16 @@ class ExtraQueryMapper(object):
         return {"$unset": {self.field_name: value}}
 
     def gte(self, value: Any) -> dict:
-        return {"$gte": validate_field_value(self.document, self.field_name, value)}
+        return {"$gte": self._validate(value)}
 
     def lte(self, value: Any) -> dict:
-        return {"$lte": validate_field_value(self.document, self.field_name, value)}
+        return {"$lte": self._validate(value)}
 
     def gt(self, value: Any) -> dict:
-        return {"$gt": validate_field_value(self.document, self.field_name, value)}
+        return {"$gt": self._validate(value)}
 
     def lt(self, value: Any) -> dict:
-        return {"$lt": validate_field_value(self.document, self.field_name, value)}
+        return {"$lt": self._validate(value)}
 
     def inc(self, value: int) -> dict:
         if isinstance(value, int):
@@ -166,8 +168,8 @@ class ExtraQueryMapper(object):
         from_ = range_values[0]
         to_ = range_values[1]
         return {
-            "$gte": validate_field_value(self.document, self.field_name, from_),
-            "$lte": validate_field_value(self.document, self.field_name, to_),
+            "$gte": self._validate(from_),
+            "$lte": self._validate(to_),
         }
 
     @cached_classproperty
@@ -176,25 +178,34 @@ class ExtraQueryMapper(object):
         for f in cls.__dict__:
             if f == "in_":
                 methods.append("in")
-            elif not f.startswith("__") and f != "query":
+            elif not f.startswith("_") and f != "query":
                 methods.append(f)
         return methods
 
 
+def _db_path(field: str, mapping: Optional[Dict[str, str]]) -> str:
+    if not mapping or "$" in field:
+        return field
+    name, dot, rest = field.partition(".")
+    return mapping.get(name, name) + dot + rest
+
+
 def group_by_aggregate_generation(
-    group_by: Union[str, list, tuple]
+    group_by: Union[str, list, tuple], mapping: Optional[Dict[str, str]] = None
 ) -> Union[str, dict]:
-    """group by parametr generation helper"""
+    """group by parametr generation helper, mapping renames fields to db fields"""
 
     if isinstance(group_by, (list, tuple)):
         return {
-            g if "." not in g else g.split(".")[-1]: f"${g}" if "$" not in g else g
+            g if "." not in g else g.split(".")[-1]: (
+                f"${_db_path(g, mapping)}" if "$" not in g else g
+            )
             for g in group_by
         }
     if "." in group_by:
         name = group_by.split(".")[-1]
-        return {name: f"${group_by}"}
-    return f"${group_by}" if not "$" in group_by else group_by
+        return {name: f"${_db_path(group_by, mapping)}"}
+    return f"${_db_path(group_by, mapping)}" if not "$" in group_by else group_by
 
 
 def generate_name_field(name: Union[dict, str, None] = None) -> Optional[str]:
@@ -216,6 +227,7 @@ def bulk_query_generator(
     upsert=False,
 ) -> List:
     """ "helper for generate bulk query"""
+    from pymongo import UpdateOne
 
     data = []
     if updated_fields:
@@ -224,7 +236,7 @@ def bulk_query_generator(
             update = {}
             for field in updated_fields:
                 value = getattr(obj, field)
-                update.update({field: value})
+                update.update({obj.get_db_field(field): value})
             data.append(UpdateOne(query, {"$set": update}, upsert=upsert))
     elif query_fields:
         for obj in requests:
@@ -232,9 +244,9 @@ def bulk_query_generator(
             update = {}
             for field, value in obj.data.items():
                 if field not in query_fields:
-                    update.update({field: value})
+                    update.update({obj.get_db_field(field): value})
                 else:
-                    query.update({field: value})
+                    query.update({obj.get_db_field(field): value})
             data.append(UpdateOne(query, {"$set": update}, upsert=upsert))
     return data
 
@@ -252,15 +264,11 @@ def take_relation(field_name: str, field: ModelField) -> Optional[RelationInfo]:
     args = get_args(field.annotation)  # type: ignore
     if origin is not None:
         if origin is Union:
-            print("here")
-            print(args)
-            print(args[0] == type(Relation))
             if (
                 len(args) == 2
-                and args[0].__origin__ is Relation
+                and get_origin(args[0]) is Relation
                 and args[1] is type(None)
             ):
-                optional_origin = get_origin(args[0])
                 optional_args = get_args(args[0])
                 return RelationInfo(
                     field=field_name,
@@ -276,7 +284,7 @@ def take_relation(field_name: str, field: ModelField) -> Optional[RelationInfo]:
         elif (
             (origin is List or origin is list)
             and len(args) == 1
-            and args[0].__origin__ == Relation
+            and get_origin(args[0]) is Relation
         ):
             list_args = get_args(args[0])
             return RelationInfo(
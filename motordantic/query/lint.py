@@ -0,0 +1,357 @@
+import re
+import json
+import logging
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+from bson.regex import Regex
+
+from ..events import QueryEvent, add_listener, remove_listener
+from ..utils.pydantic import get_config_value
+
+__all__ = (
+    "LINT_CODES",
+    "QueryLintIssue",
+    "declared_indexes",
+    "lint_query",
+    "lint_find",
+    "lint_event",
+    "QueryLinter",
+)
+
+if TYPE_CHECKING:
+    from ..document import Document
+    from .query import Q, QCombination
+
+logger = logging.getLogger(__name__)
+
+LINT_CODES = ("no_index", "sort_not_indexed", "unanchored_regex")
+
+IndexKeys = List[Tuple[str, Any]]
+
+_RANGE_OPERATORS = frozenset(
+    ("$gt", "$gte", "$lt", "$lte", "$ne", "$nin", "$exists", "$type", "$all")
+)
+_EQUALITY_OPERATORS = frozenset(("$eq", "$in"))
+_LINTED_OPERATIONS = frozenset(
+    ("find", "find_one", "count_documents", "aggregate", "find_one_and_update")
+)
+
+
+class QueryLintIssue(object):
+    """one problem found in compiled query"""
+
+    __slots__ = ("code", "collection", "message", "field")
+
+    def __init__(
+        self, code: str, collection: str, message: str, field: Optional[str] = None
+    ):
+        self.code = code
+        self.collection = collection
+        self.message = message
+        self.field = field
+
+    def __repr__(self) -> str:
+        return f"QueryLintIssue({self.code}, {self.collection}, {self.message!r})"
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, QueryLintIssue):
+            return NotImplemented
+        return (self.code, self.collection, self.message, self.field) == (
+            other.code,
+            other.collection,
+            other.message,
+            other.field,
+        )
+
+    def __hash__(self) -> int:
+        return hash((self.code, self.collection, self.message, self.field))
+
+
+def declared_indexes(document_class: "Document") -> List[IndexKeys]:
+    """key specs of Config.indexes and default _id index"""
+    indexes: List[IndexKeys] = [[("_id", 1)]]
+    for index in get_config_value(document_class, "indexes") or []:
+        indexes.append(list(index.document["key"].items()))
+    return indexes
+
+
+def _is_anchored(pattern: str, flags: Any) -> bool:
+    if isinstance(flags, str):
+        ignore_case = "i" in flags
+    else:
+        ignore_case = bool(flags & re.IGNORECASE)
+    return not ignore_case and pattern.startswith(("^", "\\A"))
+
+
+def _regex_pattern(value: Any) -> Optional[Tuple[str, Any]]:
+    if isinstance(value, Regex):
+        return value.pattern, value.flags
+    if isinstance(value, re.Pattern):
+        return value.pattern, value.flags
+    return None
+
+
+class _FilterFields(object):
+    __slots__ = ("equality", "range", "regex")
+
+    def __init__(self):
+        self.equality: List[str] = []
+        self.range: List[str] = []
+        # field, anchored
+        self.regex: List[Tuple[str, bool]] = []
+
+    @property
+    def indexable(self) -> Set[str]:
+        fields = set(self.equality) | set(self.range)
+        fields.update(field for field, anchored in self.regex if anchored)
+        return fields
+
+
+def _collect_condition(fields: _FilterFields, field: str, condition: Any) -> None:
+    regex = _regex_pattern(condition)
+    if regex is not None:
+        fields.regex.append((field, _is_anchored(*regex)))
+        return
+    if not isinstance(condition, Mapping) or not any(
+        key.startswith("$") for key in condition
+    ):
+        fields.equality.append(field)
+        return
+    for operator, value in condition.items():
+        if operator == "$regex":
+            regex = _regex_pattern(value)
+            pattern, flags = regex if regex else (value, condition.get("$options", ""))
+            fields.regex.append((field, _is_anchored(pattern, flags)))
+        elif operator in _EQUALITY_OPERATORS:
+            fields.equality.append(field)
+        elif operator in _RANGE_OPERATORS or operator == "$elemMatch":
+            fields.range.append(field)
+        elif operator == "$not" and _regex_pattern(value) is not None:
+            # negated regex can't use index bounds
+            fields.regex.append((field, False))
+
+
+def _collect_fields(query: Mapping, fields: _FilterFields) -> List[Mapping]:
+    """collect top level conditions, returns $or/$nor branches"""
+    branches: List[Mapping] = []
+    for key, value in query.items():
+        if key == "$and":
+            for sub_query in value:
+                branches.extend(_collect_fields(sub_query, fields))
+        elif key in ("$or", "$nor"):
+            branches.extend(value)
+        elif not key.startswith("$"):
+            _collect_condition(fields, key, value)
+    return branches
+
+
+def _index_supports_sort(
+    index: IndexKeys, equality: Set[str], sort: Sequence[Tuple[str, Any]]
+) -> bool:
+    keys = list(index)
+    # leading equality fields don't change order of the rest keys
+    while keys and keys[0][0] in equality and keys[0][0] not in dict(sort):
+        keys.pop(0)
+    if len(keys) < len(sort):
+        return False
+    directions = []
+    for (sort_field, sort_direction), (index_field, index_direction) in zip(sort, keys):
+        if sort_field != index_field or not isinstance(index_direction, int):
+            return False
+        directions.append(sort_direction == index_direction)
+    return all(directions) or not any(directions)
+
+
+def _lint_filter(
+    collection: str,
+    query: Mapping,
+    indexes: List[IndexKeys],
+    issues: List[QueryLintIssue],
+    parent_indexed: bool = False,
+) -> _FilterFields:
+    fields = _FilterFields()
+    branches = _collect_fields(query, fields)
+    for field, anchored in fields.regex:
+        if not anchored:
+            issues.append(
+                QueryLintIssue(
+                    "unanchored_regex",
+                    collection,
+                    f"regex on {field} is not anchored with ^ or is case insensitive, "
+                    "it scans all index keys or documents",
+                    field,
+                )
+            )
+    indexable = fields.indexable
+    indexed = parent_indexed or any(index[0][0] in indexable for index in indexes)
+    if indexable and not indexed:
+        issues.append(
+            QueryLintIssue(
+                "no_index",
+                collection,
+                f"no declared index starts with any of {sorted(indexable)}",
+            )
+        )
+    for branch in branches:
+        # $or branch is planned separately unless conditions around it use an index
+        _lint_filter(collection, branch, indexes, issues, indexed)
+    return fields
+
+
+def lint_query(
+    document_class: "Document",
+    query: Optional[Mapping] = None,
+    sort: Optional[Sequence[Tuple[str, Any]]] = None,
+    indexes: Optional[List[IndexKeys]] = None,
+) -> List[QueryLintIssue]:
+    """check compiled filter and sort against declared indexes
+
+    Args:
+        document_class (Document): queried document class
+        query (Optional[Mapping], optional): compiled filter like Builder._compile_query returns. Defaults to None.
+        sort (Optional[Sequence[Tuple[str, Any]]], optional): sort spec [(field, 1 | -1)]. Defaults to None.
+        indexes (Optional[List[IndexKeys]], optional): index key specs, declared_indexes if None. Defaults to None.
+
+    Returns:
+        List[QueryLintIssue]: found issues, empty if query can use an index
+    """
+    collection = document_class.get_collection_name()
+    if indexes is None:
+        indexes = declared_indexes(document_class)
+    issues: List[QueryLintIssue] = []
+    fields = _lint_filter(collection, query or {}, indexes, issues)
+    if sort:
+        sort = [(field, direction) for field, direction in sort]
+        equality = set(fields.equality)
+        if not any(_index_supports_sort(index, equality, sort) for index in indexes):
+            issues.append(
+                QueryLintIssue(
+                    "sort_not_indexed",
+                    collection,
+                    f"sort {sort} can't use any declared index, it sorts in memory",
+                )
+            )
+    return issues
+
+
+def lint_find(
+    document_class: "Document",
+    logical_query: Union["Q", "QCombination", None] = None,
+    sort_fields: Optional[Union[Tuple, List]] = None,
+    sort: Optional[int] = None,
+    **query,
+) -> List[QueryLintIssue]:
+    """lint find arguments without running query, for tests and CI checks
+
+    Args:
+        document_class (Document): queried document class
+        logical_query (Union[Q, QCombination, None], optional): Query | QueryCombination. Defaults to None.
+        sort_fields (Optional[Union[Tuple, List]], optional): iterable from sort fields. Defaults to None.
+        sort (Optional[int], optional): sort value -1 or 1. Defaults to None.
+
+    Returns:
+        List[QueryLintIssue]: found issues
+    """
+    sort, sort_fields = document_class.Q._sort_validation(sort, sort_fields)
+    compiled = document_class.Q._compile_query(
+        logical_query or query, bool(logical_query)
+    )
+    sort_spec = [(field, sort) for field in sort_fields] if sort else None
+    return lint_query(document_class, compiled, sort_spec)
+
+
+def _aggregate_filter_and_sort(
+    pipeline: Sequence[Mapping],
+) -> Tuple[Optional[Mapping], Optional[List[Tuple[str, Any]]]]:
+    """leading $match and $sort stages, the only ones which use indexes"""
+    query, sort = None, None
+    for stage in pipeline[:2]:
+        if "$match" in stage and query is None and sort is None:
+            query = stage["$match"]
+        elif "$sort" in stage and sort is None:
+            sort = list(stage["$sort"].items())
+        else:
+            break
+    return query, sort
+
+
+def lint_event(
+    event: QueryEvent, indexes: Optional[List[IndexKeys]] = None
+) -> List[QueryLintIssue]:
+    """lint query event from Builder, non read operations are skipped"""
+    if event.operation not in _LINTED_OPERATIONS or event.document is None:
+        return []
+    if event.operation == "aggregate":
+        query, sort = _aggregate_filter_and_sort(event.filter or [])
+    else:
+        query, sort = event.filter, (event.options or {}).get("sort")
+    return lint_query(event.document, query, sort, indexes)
+
+
+class QueryLinter(object):
+    """query events listener collecting lint issues of executed queries
+
+    Use in tests or CI runs as context manager and assert on issues, or
+    start() it at runtime to log each distinct issue once.
+
+        with QueryLinter() as linter:
+            await User.Q.find(name="x")
+        assert not linter.issues
+    """
+
+    __slots__ = ("issues", "log", "_seen")
+
+    def __init__(self, log: bool = False):
+        self.issues: List[QueryLintIssue] = []
+        self.log = log
+        self._seen: Set[Tuple[QueryLintIssue, str]] = set()
+
+    def __call__(self, event: QueryEvent) -> None:
+        issues = lint_event(event)
+        if not issues:
+            return
+        shape = json.dumps(event.filter_shape, default=str, sort_keys=True)
+        for issue in issues:
+            key = (issue, shape)
+            if key in self._seen:
+                continue
+            self._seen.add(key)
+            self.issues.append(issue)
+            if self.log:
+                logger.warning(
+                    "%s on %s: %s, filter=%s",
+                    issue.code,
+                    issue.collection,
+                    issue.message,
+                    shape,
+                )
+
+    def start(self) -> "QueryLinter":
+        add_listener(self)
+        return self
+
+    def stop(self) -> None:
+        remove_listener(self)
+
+    def __enter__(self) -> "QueryLinter":
+        return self.start()
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    def issues_by_code(self) -> Dict[str, List[QueryLintIssue]]:
+        grouped: Dict[str, List[QueryLintIssue]] = {code: [] for code in LINT_CODES}
+        for issue in self.issues:
+            grouped[issue.code].append(issue)
+        return grouped
@@ -0,0 +1,396 @@
+import re
+import datetime
+from decimal import Decimal
+from uuid import UUID
+from typing import Any, Callable, Dict, List, Mapping, Tuple, Union
+
+from bson import ObjectId, Regex, Decimal128, Timestamp, MinKey, MaxKey
+from bson.binary import Binary
+from pydantic import BaseModel
+
+from ..exceptions import MotordanticValidationError
+from ..types import Relation
+from ..row import DocumentRow
+from ..utils.pydantic import get_model_dump
+
+__all__ = (
+    "MISSING",
+    "compile_filter",
+    "resolve_path",
+    "normalize_value",
+    "sort_key",
+    "values_equal",
+)
+
+
+class _Missing(object):
+    __slots__ = ()
+
+    def __repr__(self):
+        return "MISSING"
+
+    def __bool__(self):
+        return False
+
+
+MISSING = _Missing()
+
+Predicate = Callable[[Any], bool]
+
+
+def normalize_value(value: Any) -> Any:
+    """bring python values to the form they have in a compiled query"""
+    if isinstance(value, Relation):
+        return value.to_ref()
+    if isinstance(value, UUID):
+        return value.hex
+    if isinstance(value, Decimal128):
+        return value.to_decimal()
+    return value
+
+
+def _get_item(value: Any, key: str) -> Any:
+    if isinstance(value, Mapping):
+        return value.get(key, MISSING)
+    if isinstance(value, (BaseModel, DocumentRow)):
+        # compiled queries use db field names
+        mapping = getattr(value, "__mapping_from_fields__", None)
+        return getattr(value, mapping.get(key, key) if mapping else key, MISSING)
+    if isinstance(value, (list, tuple)) and key.isdigit():
+        index = int(key)
+        return value[index] if index < len(value) else MISSING
+    return MISSING
+
+
+def _lookup(value: Any, parts: Tuple[str, ...], position: int, out: list) -> None:
+    if position == len(parts):
+        out.append(normalize_value(value))
+        return
+    key = parts[position]
+    if isinstance(value, (list, tuple)) and not key.isdigit():
+        for item in value:
+            if isinstance(item, (Mapping, BaseModel, DocumentRow)):
+                _lookup(item, parts, position, out)
+        return
+    item = _get_item(value, key)
+    if item is MISSING:
+        return
+    _lookup(item, parts, position + 1, out)
+
+
+def resolve_path(obj: Any, path: str) -> List[Any]:
+    """resolve dotted path, arrays on the way are expanded like mongodb does
+
+    Args:
+        obj (Any): dict, Document, DocumentRow or pydantic model
+        path (str): dotted path like config.url
+
+    Returns:
+        List[Any]: found values, empty list if path does not exist
+    """
+    out: list = []
+    parts = tuple(path.split("."))
+    if parts[0] == "_id" and not isinstance(obj, Mapping):
+        value = getattr(obj, "_id", MISSING)
+        if value is not MISSING:
+            _lookup(value, parts, 1, out)
+        return out
+    _lookup(obj, parts, 0, out)
+    return out
+
+
+_TYPE_ORDER = (
+    (MinKey, 0),
+    (type(None), 1),
+    (bool, 8),
+    ((int, float, Decimal), 2),
+    (str, 3),
+    (Mapping, 4),
+    (BaseModel, 4),
+    ((list, tuple), 5),
+    ((bytes, Binary), 6),
+    (ObjectId, 7),
+    (datetime.datetime, 9),
+    (Timestamp, 10),
+    ((Regex, re.Pattern), 11),
+    (MaxKey, 12),
+)
+
+
+def _type_rank(value: Any) -> int:
+    if value is MISSING:
+        return 1
+    for types, rank in _TYPE_ORDER:
+        if isinstance(value, types):
+            return rank
+    return 3
+
+
+def sort_key(value: Any) -> tuple:
+    """key for sorting values of mixed types in mongodb order"""
+    rank = _type_rank(value)
+    if rank in (0, 1, 12):
+        return (rank, 0)
+    if rank == 4:
+        items = value.items() if isinstance(value, Mapping) else dict(value).items()
+        return (rank, tuple((k, sort_key(v)) for k, v in items))
+    if rank == 5:
+        return (rank, tuple(sort_key(v) for v in value))
+    if rank == 7:
+        return (rank, value.binary)
+    if rank == 11:
+        return (rank, str(value.pattern))
+    return (rank, value)
+
+
+def values_equal(left: Any, right: Any) -> bool:
+    if isinstance(left, bool) is not isinstance(right, bool):
+        return False
+    if isinstance(left, BaseModel):
+        left = get_model_dump(left)
+    try:
+        return bool(left == right)
+    except TypeError:
+        return False
+
+
+def _compare(left: Any, right: Any) -> Union[int, None]:
+    if _type_rank(left) != _type_rank(right):
+        return None
+    try:
+        if left < right:
+            return -1
+        if left > right:
+            return 1
+    except TypeError:
+        return None
+    return 0
+
+
+def _candidates(values: List[Any]) -> List[Any]:
+    """values and elements of array values"""
+    result = []
+    for value in values:
+        result.append(value)
+        if isinstance(value, (list, tuple)):
+            result.extend(normalize_value(v) for v in value)
+    return result
+
+
+def _to_pattern(value: Any, options: str = "") -> "re.Pattern":
+    if isinstance(value, Regex):
+        value = value.try_compile()
+    if isinstance(value, re.Pattern):
+        flags = value.flags
+        pattern = value.pattern
+    else:
+        flags = 0
+        pattern = value
+    if "i" in options:
+        flags |= re.IGNORECASE
+    if "m" in options:
+        flags |= re.MULTILINE
+    if "s" in options:
+        flags |= re.DOTALL
+    if "x" in options:
+        flags |= re.VERBOSE
+    return re.compile(pattern, flags)
+
+
+def _eq(expected: Any) -> Callable[[List[Any]], bool]:
+    if isinstance(expected, (Regex, re.Pattern)):
+        return _regex(expected)
+
+    def check(values: List[Any]) -> bool:
+        if not values:
+            return expected is None
+        return any(values_equal(v, expected) for v in _candidates(values))
+
+    return check
+
+
+def _regex(expected: Any, options: str = "") -> Callable[[List[Any]], bool]:
+    pattern = _to_pattern(expected, options)
+
+    def check(values: List[Any]) -> bool:
+        return any(
+            isinstance(v, str) and pattern.search(v) is not None
+            for v in _candidates(values)
+        )
+
+    return check
+
+
+def _cmp(expected: Any, accept: Callable[[int], bool]) -> Callable[[List[Any]], bool]:
+    def check(values: List[Any]) -> bool:
+        for value in _candidates(values):
+            result = _compare(value, expected)
+            if result is not None and accept(result):
+                return True
+        return False
+
+    return check
+
+
+def _in(expected: list) -> Callable[[List[Any]], bool]:
+    checks = [_eq(e) for e in expected]
+
+    def check(values: List[Any]) -> bool:
+        return any(c(values) for c in checks)
+
+    return check
+
+
+def _not(check: Callable[[List[Any]], bool]) -> Callable[[List[Any]], bool]:
+    return lambda values: not check(values)
+
+
+def _exists(expected: Any) -> Callable[[List[Any]], bool]:
+    expected = bool(expected)
+    return lambda values: bool(values) is expected
+
+
+def _size(expected: int) -> Callable[[List[Any]], bool]:
+    return lambda values: any(
+        isinstance(v, (list, tuple)) and len(v) == expected for v in values
+    )
+
+
+def _all(expected: list) -> Callable[[List[Any]], bool]:
+    checks = [_eq(e) for e in expected]
+    return lambda values: bool(checks) and all(c(values) for c in checks)
+
+
+def _elem_match(expected: dict) -> Callable[[List[Any]], bool]:
+    if all(k.startswith("$") for k in expected):
+        sub = _compile_operators(expected)
+        element_check = lambda element: sub([element])  # noqa: E731
+    else:
+        element_check = compile_filter(expected)
+
+    def check(values: List[Any]) -> bool:
+        for value in values:
+            if isinstance(value, (list, tuple)) and any(
+                element_check(normalize_value(e)) for e in value
+            ):
+                return True
+        return False
+
+    return check
+
+
+def _type(expected: Any) -> Callable[[List[Any]], bool]:
+    aliases: Dict[Any, tuple] = {
+        "double": (float,),
+        1: (float,),
+        "string": (str,),
+        2: (str,),
+        "object": (Mapping,),
+        3: (Mapping,),
+        "array": (list, tuple),
+        4: (list, tuple),
+        "objectId": (ObjectId,),
+        7: (ObjectId,),
+        "bool": (bool,),
+        8: (bool,),
+        "date": (datetime.datetime,),
+        9: (datetime.datetime,),
+        "null": (type(None),),
+        10: (type(None),),
+        "int": (int,),
+        16: (int,),
+        "long": (int,),
+        18: (int,),
+        "number": (int, float, Decimal),
+    }
+    expected_types = expected if isinstance(expected, list) else [expected]
+    types = tuple(t for e in expected_types for t in aliases.get(e, ()))
+    return lambda values: any(isinstance(v, types) for v in values)
+
+
+def _compile_operators(operators: Mapping) -> Callable[[List[Any]], bool]:
+    checks: List[Callable[[List[Any]], bool]] = []
+    options = operators.get("$options", "")
+    for operator, expected in operators.items():
+        if operator == "$eq":
+            checks.append(_eq(expected))
+        elif operator == "$ne":
+            checks.append(_not(_eq(expected)))
+        elif operator == "$gt":
+            checks.append(_cmp(expected, lambda r: r > 0))
+        elif operator == "$gte":
+            checks.append(_cmp(expected, lambda r: r >= 0))
+        elif operator == "$lt":
+            checks.append(_cmp(expected, lambda r: r < 0))
+        elif operator == "$lte":
+            checks.append(_cmp(expected, lambda r: r <= 0))
+        elif operator == "$in":
+            checks.append(_in(expected))
+        elif operator == "$nin":
+            checks.append(_not(_in(expected)))
+        elif operator == "$regex":
+            checks.append(_regex(expected, options))
+        elif operator == "$options":
+            continue
+        elif operator == "$not":
+            if isinstance(expected, Mapping):
+                checks.append(_not(_compile_operators(expected)))
+            else:
+                checks.append(_not(_regex(expected)))
+        elif operator == "$exists":
+            checks.append(_exists(expected))
+        elif operator == "$size":
+            checks.append(_size(expected))
+        elif operator == "$all":
+            checks.append(_all(expected))
+        elif operator == "$elemMatch":
+            checks.append(_elem_match(expected))
+        elif operator == "$type":
+            checks.append(_type(expected))
+        else:
+            raise MotordanticValidationError(
+                f"unsupported query operator - {operator}"
+            )
+    return lambda values: all(check(values) for check in checks)
+
+
+def _compile_field(path: str, condition: Any) -> Predicate:
+    if isinstance(condition, Mapping) and any(k.startswith("$") for k in condition):
+        check = _compile_operators(condition)
+    else:
+        check = _eq(condition)
+    return lambda obj: check(resolve_path(obj, path))
+
+
+def compile_filter(query: Mapping) -> Predicate:
+    """compile mongodb filter document to python predicate
+
+    Args:
+        query (Mapping): compiled query like {"name": {"$in": ["a", "b"]}}
+
+    Raises:
+        MotordanticValidationError: operator is not supported
+
+    Returns:
+        Callable[[Any], bool]: predicate for dicts, Documents or pydantic models
+    """
+    predicates: List[Predicate] = []
+    for key, condition in query.items():
+        if key == "$and":
+            subs = [compile_filter(c) for c in condition]
+            predicates.append(lambda obj, subs=subs: all(s(obj) for s in subs))
+        elif key == "$or":
+            subs = [compile_filter(c) for c in condition]
+            predicates.append(lambda obj, subs=subs: any(s(obj) for s in subs))
+        elif key == "$nor":
+            subs = [compile_filter(c) for c in condition]
+            predicates.append(lambda obj, subs=subs: not any(s(obj) for s in subs))
+        elif key.startswith("$"):
+            raise MotordanticValidationError(f"unsupported query operator - {key}")
+        else:
+            predicates.append(_compile_field(key, condition))
+    if not predicates:
+        return lambda obj: True
+    if len(predicates) == 1:
+        return predicates[0]
+    return lambda obj: all(p(obj) for p in predicates)
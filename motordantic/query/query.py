@@ -3,9 +3,10 @@ from typing import TYPE_CHECKING, Union
 
 from .extra import ExtraQueryMapper
 
+from ..field_paths import resolve_field_path
+from ..exceptions import MotordanticValidationError
 from ..validation import validate_field_value, validate_object_id
 
-
 __all__ = (
     "Q",
     "QCombination",
@@ -212,20 +213,30 @@ def generate_basic_query(
         inners, extra_params = manager._parse_extra_params(extra_params)
         if with_validate_document_fields and not manager._validate_field(field):
             continue
-        query_field_name = manager.document.__mapping_query_fields__[field]
-        extra = ExtraQueryMapper(manager.document, field).query(extra_params, value)
+        field_path = (
+            resolve_field_path(manager.document, field, inners) if inners else None
+        )
+        query_field_name = (
+            field_path.db_path
+            if field_path is not None
+            else manager.document.__mapping_query_fields__[field]
+        )
+        extra = ExtraQueryMapper(manager.document, field, field_path).query(
+            extra_params, value
+        )
+        if extra and field not in extra:
+            # inc and unset mapper methods build update operators
+            raise MotordanticValidationError(
+                f"{query_field} is an update operator, not a filter"
+            )
         if extra:
             value = extra[field]
         elif field == "_id":
             value = validate_object_id(manager.document, value)
+        elif field_path is not None:
+            value = field_path.validate(value)
         else:
-            value = (
-                validate_field_value(manager.document, field, value)
-                if not inners
-                else value
-            )
-        if inners:
-            query_field_name = f'{query_field_name}.{".".join(i for i in inners)}'
+            value = validate_field_value(manager.document, field, value)
         if (
             extra
             and query_field_name in query_params
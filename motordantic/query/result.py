@@ -1,8 +1,23 @@
-from json import dumps
-from typing import Generator, List, Union, Any, Tuple, List, TYPE_CHECKING, Union
+from typing import (
+    Generator,
+    Iterator,
+    List,
+    Union,
+    Any,
+    Tuple,
+    List,
+    TYPE_CHECKING,
+    Union,
+    Optional,
+)
+
+from ..encoders import dumps, dumps_bytes, JsonEncoder
+from .columns import ColumnBuilder
+from .matcher import Predicate, compile_filter
 
 if TYPE_CHECKING:
     from ..document import Document
+    from .query import Q, QCombination
 
 
 class AggregateResult(object):
@@ -116,6 +131,85 @@ class FindResult(object):
     def json(self) -> str:
         return dumps(self.data)
 
+    def iter_json(
+        self, chunk_size: int = 100, encoder: Optional[JsonEncoder] = None
+    ) -> Iterator[bytes]:
+        """stream json array, rows encoded straight from documents
+
+        Args:
+            chunk_size (int, optional): rows per yielded chunk. Defaults to 100.
+            encoder (Optional[JsonEncoder], optional): json encoder returning bytes. Defaults to None.
+
+        Yields:
+            Iterator[bytes]: json chunks
+        """
+        chunk = [b"["]
+        for i, obj in enumerate(self.__iter__()):
+            if i:
+                chunk.append(b",")
+            chunk.append(dumps_bytes(obj, encoder))
+            if len(chunk) >= chunk_size * 2:
+                yield b"".join(chunk)
+                chunk = []
+        chunk.append(b"]")
+        yield b"".join(chunk)
+
+    def json_bytes(self, encoder: Optional[JsonEncoder] = None) -> bytes:
+        return b"".join(self.iter_json(chunk_size=len(self._data) or 1, encoder=encoder))
+
+    def _compile_predicate(
+        self, logical_query: Union["Q", "QCombination", None], query: dict
+    ) -> Predicate:
+        builder = self.document_class.Q
+        query_params = builder._compile_query(
+            logical_query or query, bool(logical_query)
+        )
+        return compile_filter(query_params)
+
+    def filter(
+        self, logical_query: Union["Q", "QCombination", None] = None, **query
+    ) -> "FindResult":
+        """filter fetched documents in memory with the same query language as find
+
+        Args:
+            logical_query (Union[Q, QCombination, None], optional): Query | QueryCombination. Defaults to None.
+
+        Returns:
+            FindResult: new result with matched documents
+        """
+        predicate = self._compile_predicate(logical_query, query)
+        return self.__class__(
+            self.document_class, [obj for obj in self._data if predicate(obj)]
+        )
+
+    def exclude(
+        self, logical_query: Union["Q", "QCombination", None] = None, **query
+    ) -> "FindResult":
+        """opposite of filter, drop matched documents
+
+        Args:
+            logical_query (Union[Q, QCombination, None], optional): Query | QueryCombination. Defaults to None.
+
+        Returns:
+            FindResult: new result without matched documents
+        """
+        predicate = self._compile_predicate(logical_query, query)
+        return self.__class__(
+            self.document_class, [obj for obj in self._data if not predicate(obj)]
+        )
+
+    def to_columns(self, fields: Union[Tuple, List], as_numpy: bool = False) -> dict:
+        """transpose result to columns
+
+        Args:
+            fields (Union[Tuple, List]): document fields, dotted path for inner values
+            as_numpy (bool, optional): return numpy arrays, numpy must be installed. Defaults to False.
+
+        Returns:
+            dict: field name to array.array (int, float, bool fields) or list
+        """
+        return ColumnBuilder.from_rows(self.document_class, fields, self._data, as_numpy)
+
     def first(self) -> Any:
         return next(self.__iter__())
 
@@ -0,0 +1,217 @@
+import functools
+from decimal import Decimal
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from ..exceptions import MotordanticValidationError
+from ..field_paths import resolve_field_path
+from ..validation import validate_field_value
+
+__all__ = (
+    "UPDATE_OPERATORS",
+    "UPDATE_PIPELINE_STAGES",
+    "split_update_field",
+    "compile_update",
+    "compile_update_pipeline",
+)
+
+if TYPE_CHECKING:
+    from ..aggregate.aggregate import Aggregate
+    from ..document import Document
+    from ..manager import ODMManager
+
+# field__<suffix> -> mongodb update operator
+UPDATE_OPERATORS: Dict[str, str] = {
+    "set": "$set",
+    "set_on_insert": "$setOnInsert",
+    "unset": "$unset",
+    "inc": "$inc",
+    "mul": "$mul",
+    "min": "$min",
+    "max": "$max",
+    "current_date": "$currentDate",
+    "push": "$push",
+    "add_to_set": "$addToSet",
+    "pull": "$pull",
+    "pull_all": "$pullAll",
+    "pop": "$pop",
+}
+
+# stages mongodb accepts in update pipelines
+UPDATE_PIPELINE_STAGES = frozenset(
+    ("$addFields", "$set", "$project", "$unset", "$replaceRoot", "$replaceWith")
+)
+
+Validator = Callable[[Any], Any]
+
+
+@functools.lru_cache(maxsize=1024)
+def split_update_field(name: str) -> Tuple[str, Optional[str]]:
+    """split update argument name into field path and operator suffix
+
+    Returns:
+        Tuple[str, Optional[str]]: path like address__city and operator suffix or None for filter arguments
+    """
+    path, separator, suffix = name.rpartition("__")
+    if separator and suffix in UPDATE_OPERATORS:
+        return path, suffix
+    return name, None
+
+
+def _resolve(manager: "ODMManager", path: str) -> Optional[Tuple[str, Validator]]:
+    """database path and value validator of document field path, None for excluded fields"""
+    document: "Document" = manager.document
+    field, *inners = path.split("__")
+    if not manager._validate_field(field):
+        return None
+    if field == "_id":
+        raise MotordanticValidationError("_id can't be updated")
+    if inners:
+        field_path = resolve_field_path(document, field, inners)
+        return field_path.db_path, field_path.validate
+    return (
+        document.get_db_field(field),
+        functools.partial(validate_field_value, document, field),
+    )
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float, Decimal)) and not isinstance(value, bool)
+
+
+def _compile_value(operator: str, path: str, value: Any, validate: Validator) -> Any:
+    if operator in ("set", "set_on_insert", "min", "max"):
+        return validate(value)
+    if operator == "unset":
+        return ""
+    if operator in ("inc", "mul"):
+        if not _is_number(value) or validate(value) != value:
+            raise MotordanticValidationError(
+                f"{path}__{operator} value must be a number of field type, not {value!r}"
+            )
+        return value
+    if operator == "current_date":
+        if value is True:
+            return True
+        if value in ("date", "timestamp"):
+            return {"$type": value}
+        raise MotordanticValidationError(
+            f"{path}__current_date value must be True, 'date' or 'timestamp'"
+        )
+    if operator == "pop":
+        if value not in (1, -1) or isinstance(value, bool):
+            raise MotordanticValidationError(f"{path}__pop value must be 1 or -1")
+        return value
+    if operator in ("push", "add_to_set"):
+        # list value adds each item
+        if isinstance(value, (list, tuple)):
+            return {"$each": validate(list(value))}
+        return validate([value])[0]
+    if operator == "pull":
+        # mapping is a condition for items, like {'score': {'$lt': 5}}
+        if isinstance(value, Mapping):
+            return dict(value)
+        return validate([value])[0]
+    # pull_all
+    if not isinstance(value, (list, tuple)):
+        raise MotordanticValidationError(f"{path}__pull_all value must be a list")
+    return validate(list(value))
+
+
+def compile_update(
+    manager: "ODMManager", fields: Dict[str, Any]
+) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+    """split update arguments into filter arguments and update document
+
+        compile_update(manager, {'name': 'x', 'views__inc': 1, 'tags__push': 'new'})
+        # ({'name': 'x'}, {'$inc': {'views': 1}, '$push': {'tags': 'new'}})
+
+    Args:
+        manager (ODMManager): manager of updated document
+        fields (Dict[str, Any]): keyword arguments of update method
+
+    Raises:
+        MotordanticValidationError: no update operators or invalid value
+
+    Returns:
+        Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]: filter arguments and update document
+    """
+    query: Dict[str, Any] = {}
+    update: Dict[str, Dict[str, Any]] = {}
+    for name, value in fields.items():
+        path, operator = split_update_field(name)
+        if operator is None:
+            query[name] = value
+            continue
+        resolved = _resolve(manager, path)
+        if resolved is None:
+            continue
+        db_path, validate = resolved
+        update.setdefault(UPDATE_OPERATORS[operator], {})[db_path] = _compile_value(
+            operator, path, value, validate
+        )
+    if not update:
+        raise MotordanticValidationError("not fields for updating!")
+    return query, update
+
+
+def compile_update_pipeline(
+    manager: "ODMManager",
+    pipeline: Union["Aggregate", Sequence[Mapping]],
+    fields: Dict[str, Any],
+) -> Tuple[Dict[str, Any], List[Mapping]]:
+    """check update pipeline stages, arguments are filter only
+
+        pipeline = Order.manager.aggregate().set(total={'$multiply': ['$price', '$qty']})
+        compile_update_pipeline(Order.manager, pipeline, {'status': 'new'})
+
+    Args:
+        manager (ODMManager): manager of updated document
+        pipeline (Union[Aggregate, Sequence[Mapping]]): Aggregate of the document or raw stages with db field names
+        fields (Dict[str, Any]): keyword arguments of update method
+
+    Raises:
+        MotordanticValidationError: empty pipeline, stage not allowed in updates or update operator in arguments
+
+    Returns:
+        Tuple[Dict[str, Any], List[Mapping]]: filter arguments and pipeline stages
+    """
+    from ..aggregate.aggregate import Aggregate
+
+    if isinstance(pipeline, Aggregate):
+        if pipeline.document_class is not manager.document:
+            raise MotordanticValidationError(
+                f"pipeline is built for {pipeline.document_class.__name__}, "
+                f"not {manager.document.__name__}"
+            )
+        stages = list(pipeline.pipeline)
+    else:
+        stages = list(pipeline)
+    if not stages:
+        raise MotordanticValidationError("empty update pipeline")
+    for stage in stages:
+        if (
+            not isinstance(stage, Mapping)
+            or len(stage) != 1
+            or next(iter(stage)) not in UPDATE_PIPELINE_STAGES
+        ):
+            raise MotordanticValidationError(
+                f"invalid update pipeline stage {stage!r}, "
+                f"use one of {sorted(UPDATE_PIPELINE_STAGES)}"
+            )
+    for name in fields:
+        if split_update_field(name)[1] is not None:
+            raise MotordanticValidationError(
+                f"{name} can't be used with update pipeline, use pipeline stages"
+            )
+    return fields, stages
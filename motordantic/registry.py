@@ -0,0 +1,55 @@
+from typing import TYPE_CHECKING, Dict, Optional, Tuple, Type
+
+__all__ = (
+    "register_document",
+    "unregister_document",
+    "get_documents",
+    "get_document",
+    "declares_abstract",
+)
+
+if TYPE_CHECKING:
+    from .document import Document
+
+# module.qualname -> class, redefined class replaces previous one
+_documents: Dict[str, Type["Document"]] = {}
+
+
+def _document_key(document_class: Type["Document"]) -> str:
+    return f"{document_class.__module__}.{document_class.__qualname__}"
+
+
+def declares_abstract(namespace: dict) -> bool:
+    """class namespace declares Config.abstract, abstract documents are not registered
+
+    Only the declaring class is abstract, subclasses are registered.
+    """
+    config = namespace.get("model_config", namespace.get("Config"))
+    if isinstance(config, dict):
+        return config.get("abstract") is True
+    return getattr(config, "abstract", None) is True
+
+
+def register_document(document_class: Type["Document"]) -> None:
+    _documents[_document_key(document_class)] = document_class
+
+
+def unregister_document(document_class: Type["Document"]) -> None:
+    key = _document_key(document_class)
+    if _documents.get(key) is document_class:
+        del _documents[key]
+
+
+def get_documents() -> Tuple[Type["Document"], ...]:
+    """registered concrete documents in declaration order"""
+    return tuple(_documents.values())
+
+
+def get_document(name: str) -> Optional[Type["Document"]]:
+    """registered document by class name or module.qualname"""
+    if name in _documents:
+        return _documents[name]
+    for key, document_class in _documents.items():
+        if document_class.__name__ == name:
+            return document_class
+    return None
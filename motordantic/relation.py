@@ -1,7 +1,9 @@
 import asyncio
+from time import perf_counter
 from typing import TYPE_CHECKING, List
 
 from .types import RelationTypes
+from .events import QueryEvent, listeners, emit
 
 __all__ = ("RelationManager",)
 
@@ -95,6 +97,8 @@ class RelationManager(object):
         Returns:
             Document: mapped mongo model
         """
+        if listeners:
+            return (await self._map_relations_with_event([document_instance]))[0]
         pre_relation: "DictStrList" = self._get_pre_relation([document_instance])
         relation_objects = await self.get_relation_objects(pre_relation)
         return self._relation_data_setter(document_instance, relation_objects)
@@ -108,9 +112,38 @@ class RelationManager(object):
         Returns:
             List: mapped list
         """
+        if listeners:
+            return await self._map_relations_with_event(result)
         pre_relation: "DictStrList" = self._get_pre_relation(result)
         relation_objects = await self.get_relation_objects(pre_relation)
         generated_result = [
             self._relation_data_setter(r, relation_objects) for r in result
         ]
         return generated_result
+
+    async def _map_relations_with_event(self, result: List) -> List["Document"]:
+        """map_relation_for_array with "relations" query event, child queries emit own events"""
+        event = QueryEvent(
+            "relations",
+            self.document_class.get_collection_name(),
+            document=self.document_class,
+        )
+        start = perf_counter()
+        try:
+            pre_relation: "DictStrList" = self._get_pre_relation(result)
+            fetched = perf_counter()
+            event.compile_ms = (fetched - start) * 1000
+            relation_objects = await self.get_relation_objects(pre_relation)
+            start = perf_counter()
+            event.server_ms = (start - fetched) * 1000
+            generated_result = [
+                self._relation_data_setter(r, relation_objects) for r in result
+            ]
+            event.hydrate_ms = (perf_counter() - start) * 1000
+            event.rows = sum(len(objects) for objects in relation_objects.values())
+            return generated_result
+        except Exception as e:
+            event.error = e
+            raise
+        finally:
+            emit(event)
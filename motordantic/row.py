@@ -0,0 +1,97 @@
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple, Type, Union
+
+from bson import decode as bson_decode
+from bson.raw_bson import RawBSONDocument
+
+from .utils.pydantic import get_model_fields
+
+__all__ = ("DocumentRow", "build_row_class")
+
+if TYPE_CHECKING:
+    from .document import Document
+    from .custom_typing import DictStrAny
+
+_set_attribute = object.__setattr__
+
+
+class DocumentRow(object):
+    """read-only row with document fields as slots, no validation"""
+
+    __slots__ = ()
+    __row_fields__: Tuple[str, ...] = ()
+    __row_mapping__: Tuple[Tuple[str, str], ...] = ()
+    __document_class__: Optional[Type["Document"]] = None
+
+    def __init__(self, **data):
+        for field in self.__row_fields__:
+            _set_attribute(self, field, data.get(field))
+
+    def __setattr__(self, key, value):
+        raise AttributeError(f"{self.__class__.__name__} is read-only")
+
+    def __delattr__(self, key):
+        raise AttributeError(f"{self.__class__.__name__} is read-only")
+
+    def __repr__(self) -> str:
+        values = ", ".join(
+            f"{field}={getattr(self, field)!r}" for field in self.__row_fields__
+        )
+        return f"{self.__class__.__name__}({values})"
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, DocumentRow):
+            return NotImplemented
+        return self.__class__ is other.__class__ and all(
+            getattr(self, f) == getattr(other, f) for f in self.__row_fields__
+        )
+
+    @classmethod
+    def from_bson(cls, bson_raw_data: Union[RawBSONDocument, dict]) -> "DocumentRow":
+        data = (
+            bson_decode(bson_raw_data.raw)
+            if isinstance(bson_raw_data, RawBSONDocument)
+            else bson_raw_data
+        )
+        obj = object.__new__(cls)
+        for db_field, field in cls.__row_mapping__:
+            _set_attribute(obj, field, data.get(db_field))
+        return obj
+
+    @property
+    def pk(self) -> Any:
+        return self._id  # type: ignore
+
+    def to_dict(self) -> "DictStrAny":
+        return {field: getattr(self, field) for field in self.__row_fields__}
+
+    @property
+    def data(self) -> "DictStrAny":
+        return self.to_dict()
+
+    def serialize(self, fields: Union[Tuple, list]) -> "DictStrAny":
+        return {field: getattr(self, field) for field in fields}
+
+    def to_document(self) -> "Document":
+        """validate row to document instance"""
+        assert self.__document_class__ is not None
+        data = self.to_dict()
+        object_id = data.pop("_id")
+        obj = self.__document_class__(**data)
+        obj._id = object_id
+        return obj
+
+
+def build_row_class(document_class: Type["Document"]) -> Type[DocumentRow]:
+    """generate DocumentRow subclass with slots for document fields and _id"""
+    mapping: Dict[str, str] = document_class.__mapping_query_fields__
+    fields = tuple(get_model_fields(document_class)) + ("_id",)
+    namespace = {
+        "__slots__": fields,
+        "__row_fields__": fields,
+        "__row_mapping__": tuple((mapping.get(f, f), f) for f in fields),
+        "__mapping_from_fields__": document_class.__mapping_from_fields__,
+        "__document_class__": document_class,
+        "__module__": document_class.__module__,
+        "__qualname__": f"{document_class.__qualname__}Row",
+    }
+    return type(f"{document_class.__name__}Row", (DocumentRow,), namespace)
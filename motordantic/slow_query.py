@@ -0,0 +1,193 @@
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set
+
+from .events import QueryEvent, add_listener, listeners
+
+__all__ = (
+    "SLOW_QUERY_OPERATIONS",
+    "enable_slow_query_log",
+    "log_slow_query",
+    "explain_command",
+    "summarize_explain",
+    "explain_query",
+)
+
+if TYPE_CHECKING:
+    from .manager import ODMManager
+
+logger = logging.getLogger(__name__)
+
+SLOW_QUERY_OPERATIONS = frozenset(
+    (
+        "find",
+        "find_one",
+        "count_documents",
+        "estimated_document_count",
+        "aggregate",
+    )
+)
+
+# strong references to running explain tasks, asyncio keeps only weak ones
+_explain_tasks: Set[asyncio.Future] = set()
+
+
+def enable_slow_query_log() -> None:
+    """subscribe log_slow_query to query events once"""
+    if log_slow_query not in listeners:
+        add_listener(log_slow_query)
+
+
+def explain_command(event: QueryEvent) -> Optional[Dict[str, Any]]:
+    """explain command body for query event, None if operation can't be explained"""
+    options = event.options or {}
+    if event.operation in ("find", "find_one"):
+        command: Dict[str, Any] = {
+            "find": event.collection,
+            "filter": event.filter or {},
+        }
+        if options.get("sort"):
+            command["sort"] = dict(options["sort"])
+        if options.get("skip"):
+            command["skip"] = options["skip"]
+        if event.operation == "find_one":
+            command["limit"] = 1
+        elif options.get("limit"):
+            command["limit"] = options["limit"]
+        return command
+    if event.operation in ("count_documents", "estimated_document_count"):
+        return {"count": event.collection, "query": event.filter or {}}
+    if event.operation == "aggregate":
+        return {"aggregate": event.collection, "pipeline": event.filter, "cursor": {}}
+    return None
+
+
+def _find_dict(data: Any, key: str) -> Optional[dict]:
+    """first nested dict which has key"""
+    if isinstance(data, dict):
+        if key in data:
+            return data
+        values = data.values()
+    elif isinstance(data, list):
+        values = data
+    else:
+        return None
+    for value in values:
+        found = _find_dict(value, key)
+        if found is not None:
+            return found
+    return None
+
+
+def _plan_stages(plan: Any) -> List[str]:
+    stages: List[str] = []
+    while isinstance(plan, dict):
+        if isinstance(plan.get("stage"), str):
+            stages.append(plan["stage"])
+        for input_stage in plan.get("inputStages", ()):
+            stages.extend(_plan_stages(input_stage))
+        plan = plan.get("inputStage", plan.get("queryPlan"))
+    return stages
+
+
+def summarize_explain(explain: dict) -> Dict[str, Any]:
+    """short summary of explain("executionStats") output
+
+    Returns:
+        Dict[str, Any]: collscan, stages, docs_examined, keys_examined, returned, execution_ms
+    """
+    planner = _find_dict(explain, "winningPlan") or {}
+    stages = _plan_stages(planner.get("winningPlan"))
+    execution_stats = _find_dict(explain, "totalDocsExamined") or {}
+    return {
+        "collscan": "COLLSCAN" in stages,
+        "stages": stages,
+        "docs_examined": execution_stats.get("totalDocsExamined"),
+        "keys_examined": execution_stats.get("totalKeysExamined"),
+        "returned": execution_stats.get("nReturned"),
+        "execution_ms": execution_stats.get("executionTimeMillis"),
+    }
+
+
+async def explain_query(
+    manager: "ODMManager", event: QueryEvent
+) -> Optional[Dict[str, Any]]:
+    """run explain("executionStats") for query event
+
+    Args:
+        manager (ODMManager): manager of queried document
+        event (QueryEvent): slow query event
+
+    Returns:
+        Optional[Dict[str, Any]]: summarize_explain result or None
+    """
+    command = explain_command(event)
+    if command is None:
+        return None
+    explain = await manager.database.command(
+        {"explain": command, "verbosity": "executionStats"}
+    )
+    return summarize_explain(explain)
+
+
+async def _log_explain(manager: "ODMManager", event: QueryEvent) -> None:
+    try:
+        summary = await explain_query(manager, event)
+    except Exception:
+        logger.warning(
+            "explain of slow %s on %s failed",
+            event.operation,
+            event.collection,
+            exc_info=True,
+        )
+        return
+    if summary is None:
+        return
+    logger.warning(
+        "slow %s on %s explain: collscan=%s stages=%s docs_examined=%s "
+        "keys_examined=%s returned=%s execution_ms=%s",
+        event.operation,
+        event.collection,
+        summary["collscan"],
+        ",".join(summary["stages"]),
+        summary["docs_examined"],
+        summary["keys_examined"],
+        summary["returned"],
+        summary["execution_ms"],
+    )
+
+
+def log_slow_query(event: QueryEvent) -> None:
+    """query events listener, logs reads slower than manager slow_query_ms"""
+    if event.operation not in SLOW_QUERY_OPERATIONS or event.document is None:
+        return
+    manager = event.document.manager
+    threshold = manager.slow_query_ms
+    if threshold is None or event.total_ms < threshold:
+        return
+    options = event.options or {}
+    logger.warning(
+        "slow %s on %s: %.1f ms (compile %.1f, server %.1f, decode %.1f, "
+        "hydrate %.1f), rows=%s filter=%s sort=%s skip=%s limit=%s",
+        event.operation,
+        event.collection,
+        event.total_ms,
+        event.compile_ms,
+        event.server_ms,
+        event.decode_ms,
+        event.hydrate_ms,
+        event.rows,
+        event.filter_shape,
+        options.get("sort"),
+        options.get("skip"),
+        options.get("limit"),
+    )
+    if not manager.slow_query_explain or event.error is not None:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    task = loop.create_task(_log_explain(manager, event))
+    _explain_tasks.add(task)
+    task.add_done_callback(_explain_tasks.discard)
@@ -0,0 +1,177 @@
+import json
+import functools
+from inspect import iscoroutinefunction
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Tuple
+
+from .events import QueryEvent, add_listener, remove_listener
+from .exceptions import BaseMotorDanticException
+
+try:
+    from opentelemetry import trace
+    from opentelemetry.trace import SpanKind
+except ImportError:  # pragma: no cover
+    trace = None  # type: ignore
+    SpanKind = None  # type: ignore
+
+__all__ = ("is_available", "instrument", "uninstrument", "is_instrumented")
+
+if TYPE_CHECKING:
+    from .query.builder import Builder
+    from .aggregate.aggregate import Aggregate
+    from .relation import RelationManager
+
+_SKIP_METHODS = frozenset(("from_bson", "watch"))
+
+# (owner class, attribute name) -> original function
+_originals: Dict[Tuple[type, str], Callable] = {}
+
+
+def is_available() -> bool:
+    """opentelemetry-api is importable"""
+    return trace is not None
+
+
+def is_instrumented() -> bool:
+    return bool(_originals)
+
+
+def _shape_json(shape: Any) -> str:
+    return json.dumps(shape, default=str, separators=(",", ":"))
+
+
+def _result_rows(result: Any) -> Optional[int]:
+    if isinstance(result, (bool, tuple)) or result is None:
+        return None
+    if isinstance(result, int):
+        return result
+    data = getattr(result, "_data", None)
+    if isinstance(data, list):
+        return len(data)
+    if hasattr(result, "__len__"):
+        return len(result)
+    return None
+
+
+def _record_event(event: QueryEvent) -> None:
+    """add query event details to current span"""
+    span = trace.get_current_span()
+    if not span.is_recording():
+        return
+    if event.operation == "relations":
+        prefix = "motordantic.relations"
+    else:
+        prefix = "motordantic"
+        if event.filter is not None:
+            span.set_attribute("db.statement", _shape_json(event.filter_shape))
+    span.set_attribute(f"{prefix}.rows", event.rows)
+    span.set_attribute(f"{prefix}.bytes", event.bytes)
+    span.set_attribute(f"{prefix}.compile_ms", event.compile_ms)
+    span.set_attribute(f"{prefix}.server_ms", event.server_ms)
+    span.set_attribute(f"{prefix}.decode_ms", event.decode_ms)
+    span.set_attribute(f"{prefix}.hydrate_ms", event.hydrate_ms)
+
+
+def _start_span(tracer: Any, operation: str, document_class: Any) -> Any:
+    collection = document_class.get_collection_name()
+    attributes = {
+        "db.system": "mongodb",
+        "db.operation": operation,
+        "db.mongodb.collection": collection,
+        "motordantic.document": document_class.__name__,
+    }
+    connection = document_class.manager.__connection__
+    if connection is not None and connection.database_name:
+        attributes["db.name"] = connection.database_name
+    return tracer.start_as_current_span(
+        f"{operation} {collection}", kind=SpanKind.CLIENT, attributes=attributes
+    )
+
+
+def _wrap_builder_method(tracer: Any, operation: str, method: Callable) -> Callable:
+    @functools.wraps(method)
+    async def wrapper(self: "Builder", *args, **kwargs):
+        with _start_span(tracer, operation, self.odm_manager.document) as span:
+            result = await method(self, *args, **kwargs)
+            rows = _result_rows(result)
+            if rows is not None and span.is_recording():
+                span.set_attribute("motordantic.rows", rows)
+            return result
+
+    return wrapper
+
+
+def _wrap_aggregate_result(tracer: Any, method: Callable) -> Callable:
+    @functools.wraps(method)
+    async def wrapper(self: "Aggregate", *args, **kwargs):
+        with _start_span(tracer, "aggregate", self.document_class) as span:
+            result = await method(self, *args, **kwargs)
+            if span.is_recording():
+                span.set_attribute("motordantic.rows", len(result))
+            return result
+
+    return wrapper
+
+
+def _wrap_relation_objects(tracer: Any, method: Callable) -> Callable:
+    @functools.wraps(method)
+    async def wrapper(self: "RelationManager", pre_relation: dict):
+        with _start_span(tracer, "relations", self.document_class) as span:
+            if span.is_recording():
+                span.set_attribute(
+                    "motordantic.relation_fields", tuple(sorted(pre_relation))
+                )
+            return await method(self, pre_relation)
+
+    return wrapper
+
+
+def instrument(tracer_provider: Any = None) -> None:
+    """wrap Builder public methods, Aggregate.result and relation loading in spans
+
+    Spans are CLIENT spans with db.* attributes, redacted filter shape in
+    db.statement, row count and timing breakdown from query events.
+    Relation queries are children of the relations span.
+
+    Args:
+        tracer_provider (Any, optional): opentelemetry TracerProvider, global provider if None. Defaults to None.
+
+    Raises:
+        BaseMotorDanticException: opentelemetry is not installed
+    """
+    if trace is None:
+        raise BaseMotorDanticException(
+            "opentelemetry is not installed, install opentelemetry-api"
+        )
+    if _originals:
+        return
+    from .query.builder import Builder
+    from .aggregate.aggregate import Aggregate
+    from .relation import RelationManager
+
+    tracer = trace.get_tracer("motordantic", tracer_provider=tracer_provider)
+    for name, method in list(vars(Builder).items()):
+        if (
+            name.startswith("_")
+            or name in _SKIP_METHODS
+            or not iscoroutinefunction(method)
+        ):
+            continue
+        _originals[(Builder, name)] = method
+        setattr(Builder, name, _wrap_builder_method(tracer, name, method))
+    _originals[(Aggregate, "result")] = Aggregate.result
+    Aggregate.result = _wrap_aggregate_result(tracer, Aggregate.result)  # type: ignore
+    _originals[(RelationManager, "get_relation_objects")] = (
+        RelationManager.get_relation_objects
+    )
+    RelationManager.get_relation_objects = _wrap_relation_objects(  # type: ignore
+        tracer, RelationManager.get_relation_objects
+    )
+    add_listener(_record_event)
+
+
+def uninstrument() -> None:
+    """restore original methods"""
+    for (owner, name), method in _originals.items():
+        setattr(owner, name, method)
+    _originals.clear()
+    remove_listener(_record_event)
@@ -4,7 +4,7 @@ from bson import ObjectId
 from bson.errors import InvalidId
 from pydantic import BaseModel, ValidationError
 
-from .utils.pydantic import IS_PYDANTIC_V2, get_model_fields
+from .utils.pydantic import IS_PYDANTIC_V2, get_model_dump, get_model_fields
 from .types import ObjectIdStr, UUID
 from .exceptions import MotordanticValidationError
 
@@ -64,7 +64,7 @@ def validate_field_value(
     """extra helper value validation
 
     Args:
-        cls ('Document'): mongo document class
+        cls ('Document'): mongo document class or nested model
         field_name (str): name of field
         value (Any): value
 
@@ -84,13 +84,17 @@ def validate_field_value(
             raise MotordanticValidationError(
                 pydantic_validation_error.errors(), pydantic_validation_error
             )
-    if field_name in document.__db_refs__:  # type: ignore
+    # nested models of inner query paths have no relations
+    if field_name in (getattr(document, "__db_refs__", None) or ()):
         if isinstance(value, list):
             s = [v.to_ref() for v in value]
             return s
         return value.to_ref() if value else None
     elif isinstance(value, UUID):
         return value.hex
+    elif isinstance(value, list):
+        # arrays of nested models
+        return [get_model_dump(v) if isinstance(v, BaseModel) else v for v in value]
     else:
         if IS_PYDANTIC_V2:
             return value.model_dump() if isinstance(value, BaseModel) else value  # type: ignore
@@ -0,0 +1,190 @@
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
+
+from bson import decode as bson_decode
+from bson.raw_bson import RawBSONDocument
+
+__all__ = (
+    "ChangeEvent",
+    "ChangeStream",
+    "BaseResumeTokenStore",
+    "MemoryResumeTokenStore",
+)
+
+if TYPE_CHECKING:
+    from motor.core import AgnosticClientSession
+    from .document import Document
+    from .aggregate.aggregate import Aggregate
+
+
+def _decode(value: Any) -> Any:
+    if isinstance(value, RawBSONDocument):
+        return bson_decode(value.raw)
+    return value
+
+
+class BaseResumeTokenStore(ABC):
+    """interface for persisting change stream resume tokens"""
+
+    @abstractmethod
+    async def load(self, name: str) -> Optional[Any]:
+        """return saved token of stream or None"""
+
+    @abstractmethod
+    async def save(self, name: str, token: Any) -> None:
+        """persist last seen token of stream"""
+
+
+class MemoryResumeTokenStore(BaseResumeTokenStore):
+    """keep resume tokens in process memory, survives stream reconnects"""
+
+    __slots__ = ("_tokens",)
+
+    def __init__(self):
+        self._tokens: Dict[str, Any] = {}
+
+    async def load(self, name: str) -> Optional[Any]:
+        return self._tokens.get(name)
+
+    async def save(self, name: str, token: Any) -> None:
+        self._tokens[name] = token
+
+
+class ChangeEvent(object):
+    """change stream event with hydrated document"""
+
+    __slots__ = (
+        "operation_type",
+        "document_key",
+        "document",
+        "update_description",
+        "resume_token",
+        "raw",
+    )
+
+    def __init__(
+        self,
+        operation_type: str,
+        document_key: Optional[dict],
+        document: Optional["Document"],
+        update_description: Optional[dict],
+        resume_token: Any,
+        raw: Any,
+    ):
+        self.operation_type = operation_type
+        self.document_key = document_key
+        self.document = document
+        self.update_description = update_description
+        self.resume_token = resume_token
+        self.raw = raw
+
+    def __repr__(self) -> str:
+        return f"ChangeEvent({self.operation_type}, {self.document_key})"
+
+    @property
+    def pk(self) -> Any:
+        return self.document_key.get("_id") if self.document_key else None
+
+    @classmethod
+    def from_raw(cls, document_class: "Document", raw: Any) -> "ChangeEvent":
+        full_document = raw.get("fullDocument")
+        if full_document is not None:
+            document = (
+                document_class.from_bson(full_document)
+                if isinstance(full_document, RawBSONDocument)
+                else document_class._from_data(dict(full_document))
+            )
+        else:
+            document = None
+        return cls(
+            operation_type=raw["operationType"],
+            document_key=_decode(raw.get("documentKey")),
+            document=document,
+            update_description=_decode(raw.get("updateDescription")),
+            resume_token=raw["_id"],
+            raw=raw,
+        )
+
+
+class ChangeStream(object):
+    """async iterator of ChangeEvent over motor change stream
+
+    Resume token of every consumed event is saved to resume_token_store,
+    a new stream with the same name continues after the last consumed event.
+    """
+
+    def __init__(
+        self,
+        document_class: "Document",
+        pipeline: Union[List[Dict], "Aggregate", None] = None,
+        full_document: Optional[str] = None,
+        resume_token_store: Optional[BaseResumeTokenStore] = None,
+        name: Optional[str] = None,
+        session: Optional["AgnosticClientSession"] = None,
+        **kwargs,
+    ):
+        self.document_class = document_class
+        self.pipeline = getattr(pipeline, "pipeline", pipeline) or []
+        self.full_document = full_document
+        self.resume_token_store = resume_token_store
+        self.name = name or document_class.get_collection_name()
+        self.session = session
+        self.kwargs = kwargs
+        self._stream: Any = None
+        self._pending: List[Any] = []
+        self._consumed_token: Any = None
+
+    async def _open(self) -> None:
+        if self._stream is not None:
+            return
+        resume_after = None
+        if self.resume_token_store is not None:
+            resume_after = await self.resume_token_store.load(self.name)
+        self._stream = self.document_class.manager.collection.watch(
+            pipeline=self.pipeline,
+            full_document=self.full_document,
+            resume_after=resume_after,
+            session=self.session,
+            **self.kwargs,
+        )
+        # starts server cursor, so changes after open are not missed
+        first = await self._stream.try_next()
+        if first is not None:
+            self._pending.append(first)
+
+    async def _save_token(self) -> None:
+        if self.resume_token_store is not None and self._consumed_token is not None:
+            await self.resume_token_store.save(self.name, self._consumed_token)
+            self._consumed_token = None
+
+    def __aiter__(self) -> "ChangeStream":
+        return self
+
+    async def __anext__(self) -> ChangeEvent:
+        await self._open()
+        # previous event was handled by consumer
+        await self._save_token()
+        if self._pending:
+            raw = self._pending.pop(0)
+        else:
+            raw = await self._stream.next()
+        event = ChangeEvent.from_raw(self.document_class, raw)
+        self._consumed_token = event.resume_token
+        return event
+
+    @property
+    def resume_token(self) -> Any:
+        return self._stream.resume_token if self._stream is not None else None
+
+    async def close(self) -> None:
+        await self._save_token()
+        if self._stream is not None:
+            await self._stream.close()
+            self._stream = None
+
+    async def __aenter__(self) -> "ChangeStream":
+        await self._open()
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
@@ -15,6 +15,7 @@ setup(
         "pymongo==4.1",
         "motor==3.0.0",
     ],
+    extras_require={"tracing": ["opentelemetry-api"]},
     description="Mongo ODM, based on motor+pydantic",
     author="bzdvdn",
     author_email="bzdv.dn@gmail.com",
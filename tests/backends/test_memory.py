@@ -0,0 +1,399 @@
+import datetime
+
+import pytest
+import pytest_asyncio
+from pymongo import IndexModel, ReturnDocument
+from pymongo.errors import DuplicateKeyError, OperationFailure
+
+from motordantic.backends.memory import MemoryClient, MemorySession
+from motordantic.exceptions import MotordanticUnsupportedOperation
+
+DOCUMENTS = [
+    {
+        "_id": 1,
+        "name": "alpha",
+        "qty": 5,
+        "tags": ["a", "b"],
+        "size": {"h": 10},
+        "items": [{"k": 1}, {"k": 5}],
+    },
+    {"_id": 2, "name": "Beta", "qty": 15, "tags": ["b"], "items": [{"k": 3}]},
+    {"_id": 3, "name": "gamma", "qty": None, "tags": [], "size": {"h": 20}},
+]
+
+
+@pytest_asyncio.fixture
+async def collection():
+    collection = MemoryClient()["test"]["memory"]
+    await collection.insert_many(DOCUMENTS)
+    return collection
+
+
+async def _ids(cursor) -> list:
+    return [doc["_id"] for doc in await cursor.to_list(None)]
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ({"qty": 5}, [1]),
+        ({"tags": "b"}, [1, 2]),
+        ({"size.h": 20}, [3]),
+        ({"items.k": 3}, [2]),
+        ({"qty": {"$eq": 15}}, [2]),
+        ({"qty": {"$ne": 5}}, [2, 3]),
+        ({"qty": {"$gt": 5}}, [2]),
+        ({"qty": {"$gte": 5}}, [1, 2]),
+        ({"qty": {"$lt": 15}}, [1]),
+        ({"qty": {"$lte": 15}}, [1, 2]),
+        ({"name": {"$in": ["alpha", "gamma"]}}, [1, 3]),
+        ({"name": {"$nin": ["alpha", "gamma"]}}, [2]),
+        ({"name": {"$regex": "^b", "$options": "i"}}, [2]),
+        ({"qty": {"$not": {"$gt": 5}}}, [1, 3]),
+        ({"size": {"$exists": False}}, [2]),
+        ({"tags": {"$size": 1}}, [2]),
+        ({"tags": {"$all": ["a", "b"]}}, [1]),
+        ({"items": {"$elemMatch": {"k": {"$gt": 2}}}}, [1, 2]),
+        ({"qty": {"$type": "null"}}, [3]),
+        ({"$and": [{"qty": {"$gte": 5}}, {"tags": "a"}]}, [1]),
+        ({"$or": [{"qty": 15}, {"name": "gamma"}]}, [2, 3]),
+        ({"$nor": [{"qty": 15}, {"name": "gamma"}]}, [1]),
+    ],
+)
+@pytest.mark.asyncio
+async def test_query_operators(collection, query, expected):
+    assert await _ids(collection.find(query)) == expected
+    assert await collection.count_documents(query) == len(expected)
+
+
+@pytest.mark.asyncio
+async def test_cursor_options(collection):
+    cursor = collection.find({}, {"name": 1, "_id": 0}).sort("_id", -1).skip(1)
+    assert await cursor.to_list(None) == [{"name": "Beta"}, {"name": "alpha"}]
+    assert await _ids(collection.find({}).sort([("qty", -1)]).limit(1)) == [2]
+    assert await collection.find_one(3, {"tags": 0, "size": 0, "name": 0}) == {
+        "_id": 3,
+        "qty": None,
+    }
+    assert await collection.distinct("tags") == ["a", "b"]
+    assert await collection.estimated_document_count() == 3
+
+
+@pytest.mark.parametrize(
+    "update, expected",
+    [
+        ({"$set": {"nested.y": 2}}, {"nested": {"x": 1, "y": 2}}),
+        ({"$unset": {"nested.x": ""}}, {"nested": {}}),
+        ({"$inc": {"n": 2}}, {"n": 3}),
+        ({"$mul": {"n": 3}}, {"n": 3}),
+        ({"$min": {"n": 0}}, {"n": 0}),
+        ({"$max": {"n": 5}}, {"n": 5}),
+        (
+            {"$push": {"tags": {"$each": ["b", "c"], "$slice": -2}}},
+            {"tags": ["b", "c"]},
+        ),
+        ({"$addToSet": {"tags": {"$each": ["a", "b"]}}}, {"tags": ["a", "b"]}),
+        ({"$pull": {"scores": {"$gte": 5}}}, {"scores": [1]}),
+        ({"$pullAll": {"scores": [1, 9]}}, {"scores": [5]}),
+        ({"$pop": {"scores": -1}}, {"scores": [5, 9]}),
+        ({"$rename": {"n": "m"}}, {"m": 1}),
+        ([{"$set": {"total": {"$multiply": ["$n", 2]}}}], {"total": 2}),
+    ],
+)
+@pytest.mark.asyncio
+async def test_update_operators(update, expected):
+    collection = MemoryClient()["test"]["updates"]
+    await collection.insert_one(
+        {"_id": 1, "n": 1, "tags": ["a"], "scores": [1, 5, 9], "nested": {"x": 1}}
+    )
+    result = await collection.update_one({"_id": 1}, update)
+    assert (result.matched_count, result.modified_count) == (1, 1)
+    doc = await collection.find_one({"_id": 1}, {key: 1 for key in expected})
+    assert doc == {"_id": 1, **expected}
+
+
+@pytest.mark.asyncio
+async def test_update_upsert_and_find_and_modify(collection):
+    await collection.update_one({"_id": 9}, {"$set": {"current": True}}, upsert=False)
+    assert await collection.find_one({"_id": 9}) is None
+    result = await collection.update_one(
+        {"name": "delta"},
+        {"$setOnInsert": {"qty": 1}, "$currentDate": {"seen": True}},
+        upsert=True,
+    )
+    doc = await collection.find_one({"_id": result.upserted_id})
+    assert (doc["name"], doc["qty"]) == ("delta", 1)
+    assert isinstance(doc["seen"], datetime.datetime)
+
+    assert (await collection.update_many({}, {"$inc": {"views": 1}})).matched_count == 4
+    before = await collection.find_one_and_update(
+        {}, {"$inc": {"views": 1}}, sort=[("_id", -1)], projection={"views": 1}
+    )
+    assert before["views"] == 1
+    after = await collection.find_one_and_replace(
+        {"_id": 1}, {"name": "one"}, return_document=ReturnDocument.AFTER
+    )
+    assert after == {"_id": 1, "name": "one"}
+    assert (await collection.find_one_and_delete({"_id": 1}))["name"] == "one"
+    assert (await collection.delete_many({"qty": {"$gte": 1}})).deleted_count == 2
+    with pytest.raises(ValueError):
+        await collection.update_one({}, {"name": "no operator"})
+
+
+@pytest.mark.parametrize(
+    "expression, expected",
+    [
+        ({"$add": ["$qty", 1]}, 6),
+        ({"$subtract": ["$qty", 1]}, 4),
+        ({"$multiply": ["$qty", 2]}, 10),
+        ({"$divide": ["$qty", 2]}, 2.5),
+        ({"$mod": ["$qty", 3]}, 2),
+        ({"$concat": ["$name", "-", "x"]}, "alpha-x"),
+        ({"$toUpper": "$name"}, "ALPHA"),
+        ({"$toLower": "ABC"}, "abc"),
+        ({"$toString": "$qty"}, "5"),
+        ({"$ifNull": ["$missing", "default"]}, "default"),
+        ({"$eq": ["$qty", 5]}, True),
+        ({"$ne": ["$qty", 5]}, False),
+        ({"$gt": ["$qty", 5]}, False),
+        ({"$gte": ["$qty", 5]}, True),
+        ({"$lt": ["$qty", 6]}, True),
+        ({"$lte": ["$qty", 4]}, False),
+        ({"$cmp": ["$qty", 1]}, 1),
+        ({"$and": [True, "$qty"]}, True),
+        ({"$or": [False, None]}, False),
+        ({"$not": [False]}, True),
+        ({"$in": ["a", "$tags"]}, True),
+        ({"$size": "$tags"}, 2),
+        (
+            {"$cond": {"if": {"$gt": ["$qty", 1]}, "then": "big", "else": "small"}},
+            "big",
+        ),
+        ({"$cond": [False, 1, 2]}, 2),
+        ({"$sum": "$items.k"}, 6),
+        ({"$avg": "$items.k"}, 3),
+        ({"$min": "$items.k"}, 1),
+        ({"$max": "$items.k"}, 5),
+        ({"$literal": "$qty"}, "$qty"),
+        ("$size.h", 10),
+        ("$$ROOT.name", "alpha"),
+    ],
+)
+@pytest.mark.asyncio
+async def test_expression_operators(collection, expression, expected):
+    pipeline = [{"$match": {"_id": 1}}, {"$project": {"value": expression}}]
+    assert await collection.aggregate(pipeline).to_list(None) == [
+        {"_id": 1, "value": expected}
+    ]
+
+
+@pytest.mark.asyncio
+async def test_date_expression(collection):
+    day = datetime.datetime(2024, 1, 1)
+    pipeline = [{"$limit": 1}, {"$project": {"_id": 0, "at": {"$add": [day, 1000]}}}]
+    assert await collection.aggregate(pipeline).to_list(None) == [
+        {"at": day + datetime.timedelta(seconds=1)}
+    ]
+
+
+@pytest.mark.asyncio
+async def test_group_accumulators(collection):
+    accumulators = {
+        "sum": {"$sum": "$qty"},
+        "avg": {"$avg": "$qty"},
+        "min": {"$min": "$qty"},
+        "max": {"$max": "$qty"},
+        "first": {"$first": "$name"},
+        "last": {"$last": "$name"},
+        "push": {"$push": "$qty"},
+        "set": {"$addToSet": {"$size": "$tags"}},
+        "count": {"$count": {}},
+    }
+    pipeline = [{"$group": {"_id": None, **accumulators}}]
+    assert await collection.aggregate(pipeline).to_list(None) == [
+        {
+            "_id": None,
+            "sum": 20,
+            "avg": 10,
+            "min": 5,
+            "max": 15,
+            "first": "alpha",
+            "last": "gamma",
+            "push": [5, 15, None],
+            "set": [2, 1, 0],
+            "count": 3,
+        }
+    ]
+
+
+@pytest.mark.parametrize(
+    "pipeline, expected",
+    [
+        (
+            [{"$match": {"qty": {"$gt": 5}}}, {"$project": {"qty": 1}}],
+            [{"_id": 2, "qty": 15}],
+        ),
+        (
+            [
+                {"$addFields": {"double": {"$multiply": ["$qty", 2]}}},
+                {"$match": {"_id": 1}},
+                {"$project": {"double": 1}},
+            ],
+            [{"_id": 1, "double": 10}],
+        ),
+        (
+            [
+                {"$set": {"size.w": 1}},
+                {"$unset": ["name", "qty", "tags", "items"]},
+                {"$limit": 1},
+            ],
+            [{"_id": 1, "size": {"h": 10, "w": 1}}],
+        ),
+        (
+            [
+                {"$sort": {"qty": -1}},
+                {"$skip": 1},
+                {"$limit": 1},
+                {"$project": {"_id": 1}},
+            ],
+            [{"_id": 1}],
+        ),
+        ([{"$match": {"tags": "b"}}, {"$count": "total"}], [{"total": 2}]),
+        (
+            [{"$unwind": "$tags"}, {"$project": {"tags": 1}}],
+            [{"_id": 1, "tags": "a"}, {"_id": 1, "tags": "b"}, {"_id": 2, "tags": "b"}],
+        ),
+        (
+            [
+                {"$unwind": {"path": "$tags", "preserveNullAndEmptyArrays": True}},
+                {"$count": "rows"},
+            ],
+            [{"rows": 4}],
+        ),
+        (
+            [
+                {
+                    "$facet": {
+                        "total": [{"$count": "n"}],
+                        "first": [{"$limit": 1}, {"$project": {"_id": 1}}],
+                    }
+                }
+            ],
+            [{"total": [{"n": 3}], "first": [{"_id": 1}]}],
+        ),
+        (
+            [{"$match": {"_id": 2}}, {"$replaceRoot": {"newRoot": {"n": "$name"}}}],
+            [{"n": "Beta"}],
+        ),
+        ([{"$match": {"_id": 3}}, {"$replaceWith": "$size"}], [{"h": 20}]),
+        ([{"$sample": {"size": 5}}, {"$count": "rows"}], [{"rows": 3}]),
+        (
+            [
+                {"$match": {"_id": 2}},
+                {
+                    "$lookup": {
+                        "from": "memory",
+                        "localField": "tags",
+                        "foreignField": "tags",
+                        "as": "same",
+                    }
+                },
+                {"$project": {"same": "$same._id"}},
+            ],
+            [{"_id": 2, "same": [1, 2]}],
+        ),
+    ],
+)
+@pytest.mark.asyncio
+async def test_aggregation_stages(collection, pipeline, expected):
+    assert await collection.aggregate(pipeline).to_list(None) == expected
+
+
+@pytest.mark.parametrize(
+    "call",
+    [
+        lambda c: c.update_one({}, {"$bit": {"qty": {"and": 1}}}),
+        lambda c: c.update_one({}, [{"$lookup": {"from": "memory"}}]),
+        lambda c: c.aggregate([{"$bucket": {"groupBy": "$qty"}}]).to_list(None),
+        lambda c: c.aggregate(
+            [{"$project": {"v": {"$trim": {"input": "$name"}}}}]
+        ).to_list(None),
+        lambda c: c.aggregate(
+            [{"$group": {"_id": None, "v": {"$stdDevPop": "$qty"}}}]
+        ).to_list(None),
+        lambda c: c.database.command("dbStats"),
+    ],
+)
+@pytest.mark.asyncio
+async def test_unsupported_operations(collection, call):
+    with pytest.raises(MotordanticUnsupportedOperation) as error:
+        await call(collection)
+    assert error.value.name.lstrip("$") in str(error.value)
+
+
+@pytest.mark.asyncio
+async def test_indexes(collection):
+    name = await collection.create_index([("name", 1)], unique=True)
+    assert name == "name_1"
+    assert (await collection.index_information())["name_1"]["unique"] is True
+    with pytest.raises(DuplicateKeyError):
+        await collection.insert_one({"name": "alpha"})
+    with pytest.raises(DuplicateKeyError):
+        await collection.update_one({"_id": 2}, {"$set": {"name": "alpha"}})
+    with pytest.raises(OperationFailure):
+        await collection.create_index([("name", 1)])
+    await collection.insert_one({"_id": 4, "qty": 5})
+    with pytest.raises(DuplicateKeyError):
+        await collection.create_indexes([IndexModel([("qty", 1)], unique=True)])
+    await collection.drop_index("name_1")
+    assert [
+        index["name"] for index in await collection.list_indexes().to_list(None)
+    ] == ["_id_"]
+    with pytest.raises(OperationFailure):
+        await collection.drop_index("name_1")
+
+
+@pytest.mark.asyncio
+async def test_change_stream(collection):
+    stream = collection.watch(
+        pipeline=[{"$match": {"operationType": {"$ne": "delete"}}}]
+    )
+    await collection.insert_one({"_id": 4, "name": "delta"})
+    await collection.delete_one({"_id": 4})
+    await collection.update_one({"_id": 1}, {"$set": {"qty": 6}})
+    insert = await stream.next()
+    assert (insert["operationType"], insert["fullDocument"]["name"]) == (
+        "insert",
+        "delta",
+    )
+    update = await stream.next()
+    assert update["updateDescription"]["updatedFields"] == {"qty": 6}
+    assert "fullDocument" not in update
+    assert await stream.try_next() is None
+    await stream.close()
+    assert not stream.alive
+
+    async with collection.watch(resume_after=insert["_id"]) as resumed:
+        assert (await resumed.next())["operationType"] == "delete"
+
+
+@pytest.mark.asyncio
+async def test_session_and_commands(collection):
+    client = collection.database.client
+    session = await client.start_session()
+    assert isinstance(session, MemorySession)
+    async with session.start_transaction():
+        assert session.in_transaction
+        await collection.insert_one({"_id": 4}, session=session)
+    assert not session.in_transaction
+    await session.end_session()
+    assert session.has_ended
+
+    assert await collection.database.command("ping") == {"ok": 1.0}
+    explain = await collection.database.command(
+        {"explain": {"find": "memory", "filter": {"qty": 5}}}
+    )
+    assert explain["executionStats"]["nReturned"] == 1
+    assert await collection.database.list_collection_names() == ["memory"]
+    await collection.drop()
+    assert await collection.count_documents({}) == 0
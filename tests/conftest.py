@@ -1,4 +1,5 @@
 import asyncio
+import os
 
 import pytest
 from motordantic.connection import connect
@@ -6,9 +7,27 @@ from motordantic.connection import connect
 # from motordantic.models import MongoModel
 
 
+TEST_BACKEND = os.getenv("MOTORDANTIC_TEST_BACKEND", "motor")
+
+
+def pytest_collection_modifyitems(config, items):
+    if TEST_BACKEND == "motor":
+        return
+    skip_motor = pytest.mark.skip(
+        reason=f"needs motor client, backend is {TEST_BACKEND}"
+    )
+    for item in items:
+        if item.get_closest_marker("motor") is not None:
+            item.add_marker(skip_motor)
+
+
 @pytest.fixture(scope="session", autouse=True)
 async def connection():
-    connection = connect("mongodb://127.0.0.1:27017", "test")
+    connection = connect(
+        "mongodb://127.0.0.1:27017",
+        "test",
+        backend=TEST_BACKEND,
+    )
     # MongoModel.use(connection)
     yield connection
 
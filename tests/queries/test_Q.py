@@ -2,6 +2,8 @@ import pytest
 import pytest_asyncio
 
 from motordantic.document import Document
+from motordantic.exceptions import MotordanticValidationError
+from motordantic.query.matcher import compile_filter
 from motordantic.query.query import Q
 
 
@@ -49,3 +51,36 @@ async def test_query_result(connection):
     query = Q(position=3) | Q(position=2) & Q(name="second")
     data = await TicketForQuery.Q.find_one(query)
     assert data.name == "second"
+
+
+@pytest.mark.asyncio
+async def test_find_result_filter(connection):
+    from motordantic.query.result import FindResult
+
+    tickets = [
+        TicketForQuery(name=name, position=position)
+        for position, name in enumerate(["alpha", "Beta", "gamma", "delta"], start=1)
+    ]
+    result = FindResult(TicketForQuery, tickets)
+    assert [t.name for t in result.filter(position__in=[1, 3])] == ["alpha", "gamma"]
+    assert [t.name for t in result.filter(position__range=[2, 3])] == ["Beta", "gamma"]
+    assert [t.name for t in result.filter(name__istartswith="b")] == ["Beta"]
+    assert [t.name for t in result.filter(name__regex="ta$")] == ["Beta", "delta"]
+    assert [t.name for t in result.filter(position__gt=3)] == ["delta"]
+    assert [t.name for t in result.filter(position__nin=[1, 2, 3])] == ["delta"]
+    assert len(result.filter(name__exists=True).list) == 4
+    query = Q(name="alpha") | Q(position__gte=2) & Q(name__endswith="a")
+    assert [t.name for t in result.filter(query)] == ["alpha", "Beta", "gamma", "delta"]
+    assert [t.name for t in result.exclude(Q(position__lt=3))] == ["gamma", "delta"]
+
+    fetched = await TicketForQuery.Q.find()
+    query = Q(position=1) | Q(name="second")
+    expected = await TicketForQuery.Q.find(query)
+    assert fetched.filter(query).data == expected.data
+
+
+def test_filter_unsupported_operator():
+    with pytest.raises(MotordanticValidationError):
+        compile_filter({"position": {"$near": [1, 2]}})
+    with pytest.raises(MotordanticValidationError):
+        compile_filter({"$where": "this.position > 1"})
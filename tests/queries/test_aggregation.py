@@ -339,3 +339,35 @@ async def test_aggregation_math_operation(connection):
 #         {"_id": {"type_id": 2}, "count": 1, "names": ["2"]},
 #         {"_id": {"type_id": 1}, "count": 1, "names": ["1"]},
 #     ]
+
+
+@pytest.mark.asyncio
+async def test_raw_aggregate_decode_strategies(connection):
+    from bson.raw_bson import RawBSONDocument
+    from pydantic import BaseModel
+
+    class ProductCost(BaseModel):
+        title: str
+        cost: float
+
+    pipeline = [{"$match": {"title": "2"}}, {"$project": {"_id": 0, "config": 0}}]
+    raw = await Product.Q.raw_aggregate(pipeline, decode="raw")
+    assert isinstance(raw[0], RawBSONDocument)
+    assert raw[0]["title"] == "2"
+
+    assert await Product.Q.raw_aggregate(
+        pipeline, decode="dict", fields=["title", "cost"]
+    ) == [{"title": "2", "cost": 2.0}]
+    assert await Product.Q.raw_aggregate(
+        pipeline, decode="tuple", fields=("title", "quantity")
+    ) == [("2", 2)]
+    models = await Product.Q.raw_aggregate(pipeline, decode=ProductCost)
+    assert models == [ProductCost(title="2", cost=2.0)]
+
+    documents = await Product.Q.raw_aggregate(
+        [{"$match": {"title": "2"}}], decode="document"
+    )
+    assert isinstance(documents[0], Product) and documents[0].config == {"type_id": 2}
+
+    with pytest.raises(MotordanticValidationError):
+        await Product.Q.raw_aggregate(pipeline, decode="tuple")
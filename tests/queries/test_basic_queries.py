@@ -1,3 +1,6 @@
+import json
+from array import array
+
 import pytest
 import pytest_asyncio
 
@@ -94,6 +97,47 @@ async def test_queryset_serialize(connection):
     assert isinstance(data, list)
 
 
+@pytest.mark.asyncio
+async def test_queryset_json(connection):
+    result = await Ticket.Q.find(name="second")
+    expected = json.loads(result.json())
+    assert expected[0]["_id"] == str(result.first()._id)
+    assert json.loads(result.json_bytes()) == expected
+    assert json.loads(b"".join(result.iter_json(chunk_size=1))) == expected
+
+
+@pytest.mark.asyncio
+async def test_find_as_json(connection):
+    result = await Ticket.Q.find(name="second")
+    chunks = await Ticket.Q.find(name="second", as_json=True)
+    data = json.loads(b"".join([chunk async for chunk in chunks]))
+    assert data == json.loads(result.json())
+
+    chunks = await Ticket.Q.find(name="second", as_json=True, json_mode="relaxed")
+    data = json.loads(b"".join([chunk async for chunk in chunks]))
+    assert data[0]["_id"] == {"$oid": str(result.first()._id)}
+    assert data[0]["position"] == 2
+
+    chunks = await Ticket.Q.find(name="second", as_json=True, json_mode="canonical")
+    data = json.loads(b"".join([chunk async for chunk in chunks]))
+    assert data[0]["position"] == {"$numberInt": "2"}
+
+
+@pytest.mark.asyncio
+async def test_find_as_rows(connection):
+    documents = await Ticket.Q.find(name="second")
+    rows = await Ticket.Q.find(name="second", as_rows=True)
+    row = rows.first()
+    assert isinstance(row, Ticket.__row_class__)
+    assert not hasattr(row, "__dict__")
+    assert row.name == "second" and row.position == 2
+    assert row.pk == documents.first()._id
+    assert rows.data == [{**d.data} for d in documents]
+    assert row.to_document() == documents.first()
+    with pytest.raises(AttributeError):
+        row.name = "changed"
+
+
 @pytest.mark.asyncio
 async def test_find_one(connection):
     await test_insert_one(connection)  # type: ignore
@@ -203,6 +247,7 @@ async def test_find_and_update(connection):
     assert data_with_prejection["position"] == 12
 
 
+@pytest.mark.motor
 @pytest.mark.asyncio
 async def test_session_start(connection):
     session = await Ticket.manager._start_session()
@@ -234,6 +279,39 @@ async def test_session_context(connection):
         assert deleted == 1
 
 
+@pytest.mark.asyncio
+async def test_find_columns(connection):
+    result = await Ticket.Q.find(sort_fields=["position"], sort=1)
+    columns = result.to_columns(["name", "position", "config.param1"])
+    assert isinstance(columns["position"], array)
+    assert list(columns["position"]) == [t.position for t in result]
+    assert columns["name"] == [t.name for t in result]
+    assert columns["config.param1"] == [t.config.get("param1") for t in result]
+
+    batches = await Ticket.Q.find_columns(
+        ["position", "config"], batch_size=2, sort_fields=["position"], sort=1
+    )
+    batches = [batch async for batch in batches]
+    assert [len(b["position"]) for b in batches][0] == 2
+    positions = [p for b in batches for p in b["position"]]
+    assert positions == list(columns["position"])
+    assert batches[0]["config"][0] == result.first().config
+
+
+@pytest.mark.asyncio
+async def test_find_with_count(connection):
+    total = await Ticket.Q.count(name="third")
+    count, tickets = await Ticket.Q.find_with_count(
+        name="third", limit_rows=1, sort_fields=["position"], sort=-1
+    )
+    assert count == total == 2
+    assert [t.position for t in tickets] == [4]
+    assert isinstance(tickets.first(), Ticket)
+
+    count, tickets = await Ticket.Q.find_with_count(name="not_exists")
+    assert count == 0 and tickets.list == []
+
+
 @pytest.mark.asyncio
 async def test_delete_one(connection):
     deleted = await Ticket.Q.delete_one(name="second")
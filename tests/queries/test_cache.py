@@ -0,0 +1,143 @@
+import pytest
+import pytest_asyncio
+
+from motordantic.document import Document
+from motordantic.cache import BaseCacheBackend, MemoryCache, make_cache_key
+from motordantic.config import ConfigDict
+from motordantic.events import add_listener, remove_listener
+from motordantic.utils.pydantic import IS_PYDANTIC_V2
+
+
+class CachedCity(Document):
+    name: str
+    population: int
+
+    if IS_PYDANTIC_V2:
+        model_config = ConfigDict(cache=MemoryCache(ttl=60))  # type: ignore
+    else:
+
+        class Config:
+            cache = MemoryCache(ttl=60)
+
+
+class CountedCity(Document):
+    name: str
+
+    if IS_PYDANTIC_V2:
+        model_config = ConfigDict(count_cache_ttl=30)  # type: ignore
+    else:
+
+        class Config:
+            count_cache_ttl = 30
+
+
+@pytest_asyncio.fixture(scope="session", autouse=True)
+async def drop_city_collection(event_loop):
+    yield
+    await CachedCity.Q.drop_collection(force=True)
+    await CountedCity.Q.drop_collection(force=True)
+
+
+@pytest.mark.asyncio
+async def test_cached_reads_and_invalidation(connection):
+    await CachedCity.Q.insert_one(name="Moscow", population=12)
+    assert await CachedCity.Q.count() == 1
+    city = await CachedCity.Q.find_one(name="Moscow")
+    assert city.population == 12
+    assert len((await CachedCity.Q.find()).list) == 1
+
+    # write bypassing builder is not visible until invalidation
+    await CachedCity.manager.collection.insert_one({"name": "Kazan", "population": 1})
+    assert await CachedCity.Q.count() == 1
+    assert len((await CachedCity.Q.find()).list) == 1
+
+    await CachedCity.Q.update_one(name="Moscow", population__set=13)
+    assert await CachedCity.Q.count() == 2
+    city = await CachedCity.Q.find_one(name="Moscow")
+    assert city.population == 13
+
+    await city.delete()
+    assert await CachedCity.Q.find_one(name="Moscow") is None
+    assert len((await CachedCity.Q.find()).list) == 1
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_limits():
+    cache = MemoryCache(ttl=None, max_size=2)
+    await cache.set("city", b"1", 1)
+    await cache.set("city", b"2", 2)
+    assert await cache.get("city", b"1") == 1
+    await cache.set("city", b"3", 3)
+    assert await cache.get("city", b"2") is None
+    assert len(cache) == 2
+
+    await cache.invalidate("city")
+    assert len(cache) == 0
+    assert cache.size_bytes == 0
+
+    expired = MemoryCache(ttl=-1)
+    await expired.set("city", b"1", 1)
+    assert await expired.get("city", b"1") is None
+
+
+@pytest.mark.asyncio
+async def test_estimated_and_cached_counts(connection):
+    await CountedCity.Q.insert_many([{"name": "Omsk"}, {"name": "Tomsk"}])
+    assert await CountedCity.Q.estimated_count() == 2
+    assert await CountedCity.Q.count() == 2
+    assert await CountedCity.Q.count(name="Omsk") == 1
+
+    # counts are cached until ttl expires or write through builder
+    await CountedCity.manager.collection.insert_one({"name": "Omsk"})
+    assert await CountedCity.Q.count(name="Omsk") == 1
+    assert await CountedCity.Q.estimated_count() == 2
+    await CountedCity.Q.insert_one(name="Perm")
+    assert await CountedCity.Q.count(name="Omsk") == 2
+    assert await CountedCity.Q.count() == 4
+    assert await CountedCity.Q.count_documents() == 4
+
+
+@pytest.mark.asyncio
+async def test_write_during_fetch_is_not_cached(connection):
+    builder = CachedCity.Q
+
+    async def stale_fetch():
+        # write finishes while read is in flight
+        await builder._invalidate_cache()
+        return [{"name": "stale"}]
+
+    query = {"name": "race"}
+    assert await builder._read_through("find", query, stale_fetch) == [
+        {"name": "stale"}
+    ]
+    key = make_cache_key("find", query)
+    namespace = CachedCity.get_collection_name()
+    assert await CachedCity.manager.cache.get(namespace, key) is None
+
+
+def test_cache_backend_is_abstract():
+    class PartialCache(BaseCacheBackend):
+        async def get(self, namespace, key):
+            return None
+
+    with pytest.raises(TypeError):
+        PartialCache()
+
+
+@pytest.mark.asyncio
+async def test_cached_find_emits_query_event(connection):
+    events = []
+    listener = add_listener(events.append)
+    try:
+        await CachedCity.Q.insert_one(name="Samara", population=1)
+        events.clear()
+        result = await CachedCity.Q.find(name="Samara")
+        assert result.first().population == 1
+        assert [e.operation for e in events] == ["find"]
+        assert events[0].rows == 1 and events[0].bytes > 0
+        # cache hit does not query database
+        events.clear()
+        assert len((await CachedCity.Q.find(name="Samara")).list) == 1
+        assert events == []
+    finally:
+        remove_listener(listener)
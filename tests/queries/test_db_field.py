@@ -0,0 +1,139 @@
+import json
+
+import pytest_asyncio
+import pytest
+from pydantic import Field
+from pymongo import IndexModel
+
+from motordantic.aggregate.expressions import Sum
+from motordantic.config import ConfigDict
+from motordantic.document import Document
+from motordantic.query.query import Q
+from motordantic.utils.pydantic import IS_PYDANTIC_V2
+
+
+class Click(Document):
+    user_id: int = Field(db_field="u")
+    url: str = Field(db_field="l")
+    score: float = 0
+
+
+class Visit(Document):
+    url: str
+    token: str = Field("", db_field="t")
+
+    if IS_PYDANTIC_V2:
+        model_config = ConfigDict(exclude_fields=("token",))  # type: ignore
+    else:
+
+        class Config:
+            exclude_fields = ("token",)
+
+
+class Order(Document):
+    user_id: int = Field(db_field="u")
+    total: float = 0
+
+    if IS_PYDANTIC_V2:
+        model_config = ConfigDict(  # type: ignore
+            indexes=[IndexModel([("user_id", 1)], name="user_id_1")]
+        )
+    else:
+
+        class Config:
+            indexes = [IndexModel([("user_id", 1)], name="user_id_1")]
+
+
+@pytest_asyncio.fixture(scope="session", autouse=True)
+async def clicks(event_loop):
+    await Click.Q.insert_many(
+        [
+            {"user_id": 1, "url": "/a", "score": 1.5},
+            {"user_id": 2, "url": "/b", "score": 2.5},
+            {"user_id": 2, "url": "/c", "score": 3},
+        ]
+    )
+    yield
+    await Click.Q.drop_collection(force=True)
+
+
+def test_db_field_mappings():
+    assert Click.__db_fields__ == {"user_id": "u", "url": "l"}
+    assert Click.__mapping_from_fields__["u"] == "user_id"
+    assert Click.get_db_field("url") == "l"
+    assert Click.Q._validate_query_data({"user_id__in": [1], "url": "/a"}) == {
+        "u": {"$in": [1]},
+        "l": "/a",
+    }
+    with pytest.raises(ValueError):
+
+        class Broken(Document):
+            first: int = Field(db_field="x")
+            second: int = Field(db_field="x")
+
+
+@pytest.mark.asyncio
+async def test_db_field_storage_and_hydration(connection):
+    raw = await Click.Q.raw_query("find_one", {"u": 1})
+    assert raw["l"] == "/a" and "user_id" not in raw
+    click = await Click.Q.find_one(user_id=1)
+    assert click.url == "/a"
+    clicks = await Click.Q.find(user_id=2, sort_fields=["url"], sort=-1)
+    assert [c.url for c in clicks] == ["/c", "/b"]
+    total, page = await Click.Q.find_with_count(
+        user_id=2, sort_fields=["url"], sort=-1, limit_rows=1
+    )
+    assert total == 2 and [c.url for c in page] == ["/c"]
+    assert clicks.filter(url="/b").first().score == 2.5
+    rows = await Click.Q.find(Q(user_id=2) | Q(url="/a"), as_rows=True)
+    assert sorted(row.url for row in rows) == ["/a", "/b", "/c"]
+    assert sorted(await Click.Q.distinct("url", user_id=2)) == ["/b", "/c"]
+
+
+@pytest.mark.asyncio
+async def test_db_field_update_and_aggregate(connection):
+    updated = await Click.Q.update_many(url="/c", url__set="/d")
+    assert updated == 1
+    data = await Click.Q.find_one_and_update(
+        user_id=2, url="/d", score__set=4, projection_fields=["url", "score"]
+    )
+    assert data == {"url": "/d", "score": 4}
+    assert await Click.Q.aggregate_sum("score", user_id=2) == 6.5
+    result = await Click.Q.simple_aggregate(
+        aggregation=Sum("score"), group_by="user_id"
+    )
+    assert result.data == {1: {"score__sum": 1.5}, 2: {"score__sum": 6.5}}
+
+
+@pytest.mark.asyncio
+async def test_db_field_excluded_from_json(connection):
+    await Visit.manager.collection.insert_one({"url": "/a", "t": "secret"})
+    chunks = await Visit.Q.find(as_json=True)
+    data = json.loads(b"".join([chunk async for chunk in chunks]))
+    assert [sorted(row) for row in data] == [["_id", "url"]]
+    await Visit.Q.drop_collection(force=True)
+
+
+@pytest.mark.asyncio
+async def test_db_field_insert_one_and_save(connection):
+    object_id = await Order.Q.insert_one(user_id=1, total=2.5)
+    raw = await Order.Q.raw_query("find_one", {"_id": object_id})
+    assert raw["u"] == 1 and "user_id" not in raw
+    order = Order(user_id=2, total=1)
+    await order.save()
+    assert order._id is not None
+    order.total = 3
+    await order.save()
+    saved = await Order.Q.find_one(user_id=2)
+    assert saved.total == 3 and saved._id == order._id
+    await Order.Q.drop_collection(force=True)
+
+
+@pytest.mark.asyncio
+async def test_db_field_indexes(connection):
+    await Order.ensure_indexes()
+    indexes = await Order.Q.list_indexes()
+    assert indexes["user_id_1"] == {"key": {"u": 1}}
+    plan = await Order.ensure_indexes()
+    assert plan.unchanged == ["user_id_1"]
+    await Order.Q.drop_collection(force=True)
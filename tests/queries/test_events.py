@@ -0,0 +1,92 @@
+import pytest
+import pytest_asyncio
+
+from motordantic.document import Document
+from motordantic.types import Relation
+from motordantic.events import QueryEvent, add_listener, remove_listener, filter_shape
+
+
+class Shelf(Document):
+    title: str
+
+
+class Folder(Document):
+    name: str
+    size: int
+    shelf: Relation[Shelf]
+
+
+@pytest_asyncio.fixture(scope="session", autouse=True)
+async def drop_folder_collections(event_loop):
+    yield
+    await Folder.Q.drop_collection(force=True)
+    await Shelf.Q.drop_collection(force=True)
+
+
+def test_filter_shape():
+    assert filter_shape({"size": {"$gte": 1}, "name": "a"}) == {
+        "size": {"$gte": "?"},
+        "name": "?",
+    }
+    assert filter_shape({"$or": [{"name": "a"}, {"size": 2}]}) == {
+        "$or": [{"name": "?"}, {"size": "?"}]
+    }
+    assert filter_shape({"name": {"$in": ["a", "b"]}}) == {"name": {"$in": "?"}}
+
+
+@pytest.mark.asyncio
+async def test_query_events(connection):
+    events = []
+    listener = add_listener(events.append)
+    try:
+        shelf_id = await Shelf.Q.insert_one(title="top")
+        await Folder.Q.insert_many(
+            [
+                Folder(name=str(i), size=i, shelf=Shelf.to_relation(shelf_id))
+                for i in range(3)
+            ]
+        )
+        assert [e.operation for e in events] == ["insert_one", "insert_many"]
+        assert events[1].rows == 3
+        assert all(isinstance(e, QueryEvent) for e in events)
+
+        events.clear()
+        result = await Folder.Q.find(size__gte=1, with_relations_objects=True)
+        assert len(result.data) == 2
+        find_event = events[0]
+        assert find_event.operation == "find"
+        assert find_event.collection == Folder.get_collection_name()
+        assert find_event.filter_shape == {"size": {"$gte": "?"}}
+        assert find_event.rows == 2
+        assert find_event.bytes > 0
+        assert find_event.total_ms >= find_event.hydrate_ms > 0
+        assert events[-1].operation == "relations"
+        assert events[-1].rows == 1
+        assert any(
+            e.operation == "find" and e.collection == Shelf.get_collection_name()
+            for e in events
+        )
+
+        events.clear()
+        rows = await Folder.Q.raw_aggregate([{"$match": {"size": 0}}])
+        assert len(rows) == 1
+        assert events[0].operation == "aggregate"
+        assert events[0].rows == 1
+    finally:
+        remove_listener(listener)
+
+    events.clear()
+    await Folder.Q.find_one(name="0")
+    assert events == []
+
+
+@pytest.mark.asyncio
+async def test_query_event_listener_error(connection):
+    def broken(event):
+        raise ValueError(event)
+
+    add_listener(broken)
+    try:
+        assert await Folder.Q.count_documents(name="1") == 1
+    finally:
+        remove_listener(broken)
@@ -1,9 +1,11 @@
 import pytest
 import pytest_asyncio
 from pymongo import IndexModel
+from pymongo.errors import ServerSelectionTimeoutError
 
 from motordantic.document import Document
 from motordantic.exceptions import MotordanticIndexError
+from motordantic.indexes import sync_all_indexes
 from motordantic.utils.pydantic import IS_PYDANTIC_V2
 from motordantic.config import ConfigDict
 
@@ -81,3 +83,90 @@ async def test_drop_index(connection):
 
     result = await IndexTicket.Q.drop_index("position_1")
     assert result == "position_1 dropped."
+
+
+def _coupon_indexes(ttl):
+    return [
+        IndexModel(
+            [("code", 1)],
+            unique=True,
+            partialFilterExpression={"active": True},
+            name="code_active",
+        ),
+        IndexModel([("created", 1)], expireAfterSeconds=ttl),
+    ]
+
+
+class Coupon(Document):
+    code: str
+    active: bool
+    created: int
+
+    if IS_PYDANTIC_V2:
+        model_config = ConfigDict(indexes=_coupon_indexes(60))  # type: ignore
+    else:
+
+        class Config:
+            indexes = _coupon_indexes(60)
+
+
+@pytest.mark.asyncio
+async def test_ensure_indexes_options_and_plan(connection):
+    plan = await Coupon.ensure_indexes(dry_run=True)
+    assert plan.create_names == ["code_active", "created_1"]
+    assert plan.drop == []
+    assert await Coupon.Q.list_indexes() in ({}, {"_id_": {"key": {"_id": 1}}})
+
+    plan = await Coupon.ensure_indexes()
+    assert plan.create_names == ["code_active", "created_1"]
+    indexes = {
+        index["name"]: index async for index in Coupon.manager.collection.list_indexes()
+    }
+    assert indexes["code_active"]["unique"] is True
+    assert dict(indexes["code_active"]["partialFilterExpression"]) == {"active": True}
+    assert indexes["created_1"]["expireAfterSeconds"] == 60
+    assert Coupon.__indexes__ == {"_id_", "code_active", "created_1"}
+
+    plan = await Coupon.manager.ensure_indexes()
+    assert not plan
+    assert plan.unchanged == ["code_active", "created_1"]
+
+    class Coupon2(Document):
+        code: str
+        active: bool
+        created: int
+
+        if IS_PYDANTIC_V2:
+            model_config = ConfigDict(  # type: ignore
+                collection_name="coupon", indexes=_coupon_indexes(120)
+            )
+        else:
+
+            class Config:
+                collection_name = "coupon"
+                indexes = _coupon_indexes(120)
+
+    [plan] = await sync_all_indexes([Coupon2])
+    assert plan.rebuild == ["created_1"]
+    assert plan.unchanged == ["code_active"]
+    indexes = {
+        index["name"]: index async for index in Coupon.manager.collection.list_indexes()
+    }
+    assert indexes["created_1"]["expireAfterSeconds"] == 120
+    await Coupon.Q.drop_collection(force=True)
+
+
+@pytest.mark.asyncio
+async def test_ensure_indexes_skips_connection_errors(connection, monkeypatch):
+    async def create_indexes(*args, **kwargs):
+        raise ServerSelectionTimeoutError("server is down")
+
+    collection = Coupon.manager.collection
+    monkeypatch.setattr(type(collection), "create_indexes", create_indexes)
+    plan = await Coupon.ensure_indexes()
+    assert plan.create_names == ["code_active", "created_1"]
+    assert Coupon.__indexes__ == set()
+    monkeypatch.undo()
+    await Coupon.ensure_indexes()
+    assert Coupon.__indexes__ == {"_id_", "code_active", "created_1"}
+    await Coupon.Q.drop_collection(force=True)
@@ -1,7 +1,12 @@
+from typing import List, Optional
+
 import pytest_asyncio
 import pytest
+from pydantic import BaseModel, Field
 
 from motordantic.document import Document
+from motordantic.exceptions import MotordanticValidationError, NotDeclaredField
+from motordantic.field_paths import build_field_paths
 from motordantic.utils.pydantic import IS_PYDANTIC_V2
 from motordantic.config import ConfigDict
 
@@ -23,6 +28,46 @@ class InnerTicket(Document):
             excluded_query_fields = ("sign", "type")
 
 
+class Geo(BaseModel):
+    lat: float
+    lng: float
+
+
+class Address(BaseModel):
+    city: str
+    zip_code: int = Field(0, alias="zip")
+    geo: Optional[Geo] = None
+
+    # documents store nested fields by name
+    if IS_PYDANTIC_V2:
+        model_config = ConfigDict(populate_by_name=True)
+    else:
+
+        class Config:
+            allow_population_by_field_name = True
+
+
+class Customer(Document):
+    name: str
+    address: Address
+    previous: List[Address] = []
+
+
+@pytest_asyncio.fixture(scope="session", autouse=True)
+async def customers(event_loop):
+    await Customer.Q.insert_one(
+        name="first",
+        address=Address(city="Paris", zip=75001, geo=Geo(lat=48.8, lng=2.3)),
+        previous=[Address(city="Lyon", zip=69001)],
+    )
+    await Customer.Q.insert_one(
+        name="second",
+        address=Address(city="Berlin", zip=10115),
+    )
+    yield
+    await Customer.Q.drop_collection(force=True)
+
+
 @pytest_asyncio.fixture(scope="session", autouse=True)
 async def innert_tickets(event_loop):
 
@@ -100,3 +145,40 @@ async def test_inner_update_one(connection):
     assert updated == 1
     data = await InnerTicket.Q.find_one(config__url__startswith="test")
     assert data.name == "second"
+
+
+def test_nested_model_paths():
+    query = Customer.Q._validate_query_data(
+        {
+            "address__zip": "75001",
+            "address__geo__lat__gte": "48",
+            "previous__0__zip_code__in": ["69001"],
+            "previous__city": "Lyon",
+        }
+    )
+    assert query == {
+        "address.zip_code": 75001,
+        "address.geo.lat": {"$gte": 48.0},
+        "previous.0.zip_code": {"$in": [69001]},
+        "previous.city": "Lyon",
+    }
+    with pytest.raises(MotordanticValidationError):
+        Customer.Q._validate_query_data({"address__zip": "paris"})
+    with pytest.raises(NotDeclaredField):
+        Customer.Q._validate_query_data({"address__street": "Main"})
+    paths = build_field_paths(Customer)
+    assert paths[("address", "geo", "lng")].db_path == "address.geo.lng"
+
+
+@pytest.mark.asyncio
+async def test_nested_model_find(connection):
+    data = await Customer.Q.find_one(address__zip="10115")
+    assert data.name == "second"
+    data = await Customer.Q.find_one(address__geo__lat__gt=48, previous__city="Lyon")
+    assert data.name == "first"
+    updated = await Customer.Q.update_one(
+        name="second", address__geo__set={"lat": "52.5", "lng": 13.4}
+    )
+    assert updated == 1
+    data = await Customer.Q.find_one(name="second")
+    assert data.address.geo == Geo(lat=52.5, lng=13.4)
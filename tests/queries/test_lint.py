@@ -0,0 +1,86 @@
+import pytest
+import pytest_asyncio
+from pymongo import IndexModel, DESCENDING
+
+from motordantic.document import Document
+from motordantic.query.query import Q
+from motordantic.query.lint import QueryLinter, lint_find, lint_query
+from motordantic.utils.pydantic import IS_PYDANTIC_V2
+from motordantic.config import ConfigDict
+
+INDEXES = [
+    IndexModel([("city", 1), ("created", DESCENDING)]),
+    IndexModel([("email", 1)]),
+]
+
+
+class Customer(Document):
+    email: str
+    city: str
+    created: int
+    note: str = ""
+
+    if IS_PYDANTIC_V2:
+        model_config = ConfigDict(indexes=INDEXES)  # type: ignore
+    else:
+
+        class Config:
+            indexes = INDEXES
+
+
+@pytest_asyncio.fixture(scope="session", autouse=True)
+async def drop_customer_collection(event_loop):
+    yield
+    await Customer.Q.drop_collection(force=True)
+
+
+def codes(issues):
+    return [issue.code for issue in issues]
+
+
+def test_lint_prefix():
+    assert lint_find(Customer, email="a@b.c") == []
+    assert lint_find(Customer, city="x", created__gte=1) == []
+    assert lint_find(Customer) == []
+    assert codes(lint_find(Customer, created__gte=1)) == ["no_index"]
+    assert codes(lint_find(Customer, note="x")) == ["no_index"]
+    assert lint_find(Customer, Q(email="a") | Q(city="b")) == []
+    assert codes(lint_find(Customer, Q(email="a") | Q(note="b"))) == ["no_index"]
+
+
+def test_lint_sort():
+    assert lint_find(Customer, city="x", sort_fields=["created"], sort=-1) == []
+    assert lint_find(Customer, city="x", sort_fields=["created"], sort=1) == []
+    assert lint_query(Customer, {}, [("city", 1), ("created", -1)]) == []
+    assert lint_query(Customer, {}, [("city", -1), ("created", 1)]) == []
+    assert codes(lint_query(Customer, {}, [("city", 1), ("created", 1)])) == [
+        "sort_not_indexed"
+    ]
+    assert codes(lint_find(Customer, sort_fields=["note"], sort=1)) == [
+        "sort_not_indexed"
+    ]
+
+
+def test_lint_regex():
+    assert lint_find(Customer, email__startswith="adm") == []
+    assert codes(lint_find(Customer, email__endswith=".com")) == ["unanchored_regex"]
+    assert codes(lint_find(Customer, email__iregex="^adm")) == ["unanchored_regex"]
+    issues = lint_find(Customer, note__regex="x")
+    assert codes(issues) == ["unanchored_regex"]
+    assert issues[0].field == "note"
+
+
+@pytest.mark.asyncio
+async def test_query_linter(connection):
+    await Customer.Q.insert_one(email="a@b.c", city="x", created=1)
+    with QueryLinter() as linter:
+        await Customer.Q.find(city="x", sort_fields=["created"], sort=-1)
+        await Customer.Q.find_one(note="x")
+        await Customer.Q.find_one(note="y")
+        await Customer.Q.count_documents(email__iendswith="b.c")
+        await Customer.Q.raw_aggregate(
+            [{"$match": {"city": "x"}}, {"$sort": {"note": 1}}]
+        )
+    assert codes(linter.issues) == ["no_index", "unanchored_regex", "sort_not_indexed"]
+    await Customer.Q.find_one(note="z")
+    assert len(linter.issues) == 3
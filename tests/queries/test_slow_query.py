@@ -0,0 +1,88 @@
+import asyncio
+import logging
+
+import pytest
+import pytest_asyncio
+
+from motordantic.document import Document
+from motordantic.config import ConfigDict
+from motordantic.events import listeners
+from motordantic.slow_query import log_slow_query, summarize_explain
+from motordantic.utils.pydantic import IS_PYDANTIC_V2
+
+
+class Ticket(Document):
+    code: str
+    price: int
+
+    if IS_PYDANTIC_V2:
+        model_config = ConfigDict(slow_query_ms=0, slow_query_explain=True)  # type: ignore
+    else:
+
+        class Config:
+            slow_query_ms = 0
+            slow_query_explain = True
+
+
+@pytest_asyncio.fixture(scope="session", autouse=True)
+async def drop_ticket_collection(event_loop):
+    yield
+    await Ticket.Q.drop_collection(force=True)
+
+
+def test_summarize_explain():
+    summary = summarize_explain(
+        {
+            "queryPlanner": {
+                "winningPlan": {
+                    "stage": "LIMIT",
+                    "inputStage": {"stage": "COLLSCAN", "direction": "forward"},
+                },
+                "rejectedPlans": [],
+            },
+            "executionStats": {
+                "nReturned": 1,
+                "executionTimeMillis": 3,
+                "totalKeysExamined": 0,
+                "totalDocsExamined": 100,
+            },
+        }
+    )
+    assert summary == {
+        "collscan": True,
+        "stages": ["LIMIT", "COLLSCAN"],
+        "docs_examined": 100,
+        "keys_examined": 0,
+        "returned": 1,
+        "execution_ms": 3,
+    }
+
+
+@pytest.mark.asyncio
+async def test_slow_query_log(connection, caplog):
+    assert log_slow_query in listeners
+    await Ticket.Q.insert_many([Ticket(code=str(i), price=i) for i in range(5)])
+    with caplog.at_level(logging.WARNING, logger="motordantic.slow_query"):
+        await Ticket.Q.find(price__gte=2, sort_fields=["price"], sort=-1, limit_rows=2)
+        await Ticket.Q.insert_one(code="x", price=10)
+        for _ in range(5):
+            await asyncio.sleep(0)
+    messages = [record.getMessage() for record in caplog.records]
+    assert len(messages) == 2
+    assert messages[0].startswith(f"slow find on {Ticket.get_collection_name()}")
+    assert "filter={'price': {'$gte': '?'}}" in messages[0]
+    assert "sort=[('price', -1)]" in messages[0]
+    assert "limit=2" in messages[0]
+    assert "explain: collscan=True" in messages[1]
+
+    caplog.clear()
+    with caplog.at_level(logging.WARNING, logger="motordantic.slow_query"):
+        await Ticket.Q.estimated_count()
+    assert caplog.records[0].getMessage().startswith(
+        f"slow estimated_document_count on {Ticket.get_collection_name()}"
+    )
+
+    caplog.clear()
+    Ticket.manager.set_slow_query_log(None)
+    await Ticket.Q.find_one(code="1")
+    assert not caplog.records
@@ -0,0 +1,118 @@
+from datetime import datetime
+from typing import List, Optional
+
+import pytest_asyncio
+import pytest
+from pydantic import Field
+
+from motordantic.document import Document
+from motordantic.exceptions import MotordanticValidationError
+
+
+class Counter(Document):
+    name: str
+    views: int = 0
+    rating: float = 1.0
+    tags: List[str] = []
+    scores: List[int] = []
+    updated: Optional[datetime] = None
+    created_by: Optional[str] = None
+
+
+@pytest_asyncio.fixture(scope="session", autouse=True)
+async def counters(event_loop):
+    await Counter.Q.insert_one(name="first", tags=["a"], scores=[1, 5, 9])
+    yield
+    await Counter.Q.drop_collection(force=True)
+
+
+def test_compile_update_operators():
+    query, update = Counter.Q._prepare_update_data(
+        name="first",
+        views__inc=2,
+        rating__mul=1.5,
+        tags__push=["b", "c"],
+        scores__add_to_set="3",
+        created_by__unset=True,
+        updated__current_date=True,
+    )
+    assert query == {"name": "first"}
+    assert update == {
+        "$inc": {"views": 2},
+        "$mul": {"rating": 1.5},
+        "$push": {"tags": {"$each": ["b", "c"]}},
+        "$addToSet": {"scores": 3},
+        "$unset": {"created_by": ""},
+        "$currentDate": {"updated": True},
+    }
+    with pytest.raises(MotordanticValidationError):
+        Counter.Q._prepare_update_data(name="first", views__inc=1.5)
+    with pytest.raises(MotordanticValidationError):
+        Counter.Q._prepare_update_data(name="first", scores__push="many")
+    with pytest.raises(MotordanticValidationError):
+        Counter.Q._prepare_update_data(name="first")
+
+
+@pytest.mark.asyncio
+async def test_update_operators(connection):
+    updated = await Counter.Q.update_one(
+        name="first",
+        views__inc=3,
+        tags__add_to_set=["a", "b"],
+        scores__pull={"$gte": 9},
+        updated__current_date=True,
+    )
+    assert updated == 1
+    counter = await Counter.Q.find_one(name="first")
+    assert counter.views == 3
+    assert counter.tags == ["a", "b"]
+    assert counter.scores == [1, 5]
+    assert isinstance(counter.updated, datetime)
+
+    await Counter.Q.update_many(name="first", views__max=10, scores__pull_all=[1])
+    counter = await Counter.Q.find_one(name="first")
+    assert (counter.views, counter.scores) == (10, [5])
+
+    await Counter.Q.update_one(
+        upsert=True, name="second", created_by__set_on_insert="admin", views__inc=1
+    )
+    second = await Counter.Q.find_one(name="second")
+    assert (second.created_by, second.views) == ("admin", 1)
+
+
+class OrderLine(Document):
+    price: float
+    qty: int = Field(db_field="q")
+    total: float = 0
+    note: Optional[str] = None
+
+
+@pytest.mark.asyncio
+async def test_update_many_pipeline(connection):
+    await OrderLine.Q.insert_many(
+        [
+            {"price": 2.5, "qty": 4, "note": "x"},
+            {"price": 10, "qty": 1, "note": "y"},
+        ]
+    )
+    pipeline = (
+        OrderLine.manager.aggregate()
+        .set(total={"$multiply": ["$price", "$qty"]})
+        .unset("note")
+    )
+    assert pipeline.pipeline == [
+        {"$set": {"total": {"$multiply": ["$price", "$q"]}}},
+        {"$unset": ["note"]},
+    ]
+    updated = await OrderLine.Q.update_many(price__gte=1, pipeline=pipeline)
+    assert updated == 2
+    lines = await OrderLine.Q.find(sort_fields=["price"], sort=1)
+    assert [(line.total, line.note) for line in lines] == [(10, None), (10, None)]
+
+    with pytest.raises(MotordanticValidationError):
+        OrderLine.manager.aggregate().set(missing=1)
+    with pytest.raises(MotordanticValidationError):
+        await OrderLine.Q.update_many(pipeline=[{"$match": {}}])
+    with pytest.raises(MotordanticValidationError):
+        await OrderLine.Q.update_many(pipeline=pipeline, total__inc=1)
+    await OrderLine.Q.drop_collection(force=True)
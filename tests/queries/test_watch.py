@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+
+from motordantic.document import Document
+from motordantic.cache import MemoryCache
+from motordantic.config import ConfigDict
+from motordantic.watch import BaseResumeTokenStore, MemoryResumeTokenStore
+from motordantic.utils.pydantic import IS_PYDANTIC_V2
+
+
+class Parcel(Document):
+    name: str
+    weight: int
+
+    if IS_PYDANTIC_V2:
+        model_config = ConfigDict(cache=MemoryCache(ttl=None))  # type: ignore
+    else:
+
+        class Config:
+            cache = MemoryCache(ttl=None)
+
+
+@pytest_asyncio.fixture(scope="session", autouse=True)
+async def drop_parcel_collection(event_loop):
+    yield
+    await Parcel.Q.drop_collection(force=True)
+
+
+@pytest.mark.asyncio
+async def test_watch_events(connection):
+    store = MemoryResumeTokenStore()
+    async with Parcel.Q.watch(resume_token_store=store) as stream:
+        parcel_id = await Parcel.Q.insert_one(name="box", weight=1)
+        await Parcel.Q.update_one(_id=parcel_id, weight__set=2)
+
+        event = await asyncio.wait_for(stream.__anext__(), 10)
+        assert event.operation_type == "insert"
+        assert isinstance(event.document, Parcel)
+        assert event.document.name == "box"
+        assert event.pk == parcel_id
+
+        event = await asyncio.wait_for(stream.__anext__(), 10)
+        assert event.operation_type == "update"
+        assert event.update_description["updatedFields"] == {"weight": 2}
+
+    # resumed after last consumed event
+    assert await store.load("parcel") == event.resume_token
+    await Parcel.Q.delete_one(_id=parcel_id)
+    async with Parcel.Q.watch(resume_token_store=store) as stream:
+        event = await asyncio.wait_for(stream.__anext__(), 10)
+        assert event.operation_type == "delete"
+        assert event.document is None
+
+
+@pytest.mark.asyncio
+async def test_cache_invalidation_by_change_stream(connection):
+    task = Parcel.manager.start_cache_invalidation()
+    await asyncio.sleep(0.1)
+    assert await Parcel.Q.count(name="other") == 0
+
+    # write from another process
+    await Parcel.manager.collection.insert_one({"name": "other", "weight": 3})
+    for _ in range(50):
+        await asyncio.sleep(0.1)
+        if await Parcel.Q.count(name="other") == 1:
+            break
+    assert await Parcel.Q.count(name="other") == 1
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+
+def test_resume_token_store_is_abstract():
+    class LoadOnlyStore(BaseResumeTokenStore):
+        async def load(self, name):
+            return None
+
+    with pytest.raises(TypeError):
+        LoadOnlyStore()
@@ -34,3 +34,11 @@ async def test_insert_many_with_wrice_concern(connection):
         data, ordered=False, write_concern=write_concern
     )
     assert inserted_count == 2
+
+
+def test_collection_with_options_cached(connection):
+    write_concern = WriteConcern(w=0)
+    collection = Box.manager.get_collection(write_concern=write_concern)
+    assert collection is Box.manager.get_collection(write_concern=WriteConcern(w=0))
+    assert collection.write_concern == write_concern
+    assert Box.manager.get_collection() is Box.manager.collection
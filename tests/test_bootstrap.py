@@ -0,0 +1,79 @@
+import pytest
+import pytest_asyncio
+from pymongo import IndexModel
+
+import motordantic
+from motordantic.document import Document
+from motordantic.types import Relation
+from motordantic.registry import (
+    get_document,
+    get_documents,
+    register_document,
+    unregister_document,
+)
+from motordantic.exceptions import MotordanticValidationError
+from motordantic.utils.pydantic import IS_PYDANTIC_V2
+from motordantic.config import ConfigDict
+
+
+class TimestampedDocument(Document):
+    created: int = 0
+
+    if IS_PYDANTIC_V2:
+        model_config = ConfigDict(abstract=True)  # type: ignore
+    else:
+
+        class Config:
+            abstract = True
+
+
+class Brand(TimestampedDocument):
+    title: str
+
+    if IS_PYDANTIC_V2:
+        model_config = ConfigDict(indexes=[IndexModel([("title", 1)])])  # type: ignore
+    else:
+
+        class Config:
+            indexes = [IndexModel([("title", 1)])]
+
+
+class Gadget(TimestampedDocument):
+    name: str
+    brand: Relation[Brand]
+
+
+@pytest_asyncio.fixture(scope="session", autouse=True)
+async def drop_bootstrap_collections(event_loop):
+    yield
+    await Brand.Q.drop_collection(force=True)
+
+
+def test_registry():
+    documents = get_documents()
+    assert Brand in documents
+    assert Gadget in documents
+    assert TimestampedDocument not in documents
+    assert Document not in documents
+    assert get_document("Brand") is Brand
+    assert get_document(f"{Gadget.__module__}.Gadget") is Gadget
+
+
+@pytest.mark.asyncio
+async def test_init(connection):
+    plans = await motordantic.init(connection, documents=[Brand, Gadget])
+    assert [plan.create_names for plan in plans] == [["title_1"]]
+    assert "title_1" in await Brand.Q.list_indexes()
+
+    plans = await motordantic.init(documents=[Brand, Gadget])
+    assert not any(plans)
+
+
+@pytest.mark.asyncio
+async def test_init_unregistered_relation(connection):
+    unregister_document(Brand)
+    try:
+        with pytest.raises(MotordanticValidationError):
+            await motordantic.init(documents=[Gadget], ensure_indexes=False, warm=False)
+    finally:
+        register_document(Brand)
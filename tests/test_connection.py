@@ -1,16 +1,23 @@
 import os
 
+import pytest
+
 from motordantic.connection import (
     connect,
     MotordanticConnection,
 )
+from motordantic.exceptions import MotordanticConnectionError
 
 from motor.motor_asyncio import AsyncIOMotorClient
 
+from .conftest import TEST_BACKEND
+
 
 class TestWriteConnectionParams:
-    def setup(self):
-        connection = connect("mongodb://127.0.0.1:27017", "test")
+    def setup_method(self):
+        connection = connect(
+            "mongodb://127.0.0.1:27017", "test", backend=TEST_BACKEND
+        )
         self.connection: MotordanticConnection = connection
 
     def test_envirnament_values(self):
@@ -26,12 +33,21 @@ class TestWriteConnectionParams:
         assert database_name == "test"
         assert conn_string == "mongodb://127.0.0.1:27017"
 
+    @pytest.mark.motor
     def test_connection(self):
         motor_client = self.connection._get_motor_client()
         assert isinstance(motor_client, AsyncIOMotorClient)
 
+    @pytest.mark.motor
     def test_conection_database(self):
         motor_client = self.connection._get_motor_client()
         assert motor_client.get_database('test') == AsyncIOMotorClient(
             "mongodb://127.0.0.1:27017"
         ).get_database("test")
+
+    def test_connect_other_backend(self):
+        other = "memory" if TEST_BACKEND == "motor" else "motor"
+        with pytest.raises(MotordanticConnectionError):
+            connect("mongodb://127.0.0.1:27017", "test", backend=other)
+        assert self.connection._get_motor_client() is not None
+        assert os.getenv("MOTORDANTIC_ADDRESS") == "mongodb://127.0.0.1:27017"
@@ -46,3 +46,22 @@ async def test_raise_with_field_mongo_model(connection):
     with pytest.raises(MotordanticValidationError):
         app = await Application.Q.find_one()
         d = Default(name="default", app=app)
+
+
+def test_precomputed_properties():
+    from typing import Optional
+
+    class Versioned(Application):
+        version: Optional[int] = None
+
+        @property
+        def title(self) -> str:
+            return f"{self.name}:{self.version}"
+
+    assert Application.__properties__ == ()
+    assert Versioned.__properties__ == ("title",)
+    assert Versioned.fields_all == ["name", "cfg", "lang", "version", "title"]
+    app = Versioned(name="app", cfg=Config(), lang="go", version=2)
+    assert app.data["title"] == "app:2"
+    assert "title" not in app.model_dump(exclude={"title"})
+    assert app.serialize(["title", "lang"]) == {"title": "app:2", "lang": "go"}
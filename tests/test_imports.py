@@ -0,0 +1,32 @@
+import subprocess
+import sys
+
+import motordantic
+
+
+def _loaded_modules(code: str) -> set:
+    output = subprocess.check_output(
+        [sys.executable, "-c", f"{code}\nimport sys\nprint(' '.join(sys.modules))"]
+    )
+    return set(output.decode().split())
+
+
+def test_package_import_is_lazy():
+    modules = _loaded_modules("import motordantic")
+    assert "motordantic.document" not in modules
+    assert "pydantic" not in modules
+
+
+def test_document_import_defers_motor():
+    modules = _loaded_modules("import motordantic.document")
+    assert "motor" not in modules
+    assert "pymongo" not in modules
+
+
+def test_lazy_attributes():
+    from motordantic.document import Document
+    from motordantic.bootstrap import init
+
+    assert motordantic.Document is Document
+    assert motordantic.init is init
+    assert "Document" in dir(motordantic)
@@ -0,0 +1,74 @@
+import pytest
+import pytest_asyncio
+
+from motordantic.document import Document
+from motordantic.types import Relation
+from motordantic import tracing
+
+pytest.importorskip("opentelemetry.sdk")
+
+from opentelemetry.sdk.trace import TracerProvider  # noqa: E402
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor  # noqa: E402
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (  # noqa: E402
+    InMemorySpanExporter,
+)
+
+
+class Station(Document):
+    name: str
+
+
+class Train(Document):
+    number: int
+    station: Relation[Station]
+
+
+@pytest_asyncio.fixture(scope="session", autouse=True)
+async def drop_train_collections(event_loop):
+    yield
+    await Train.Q.drop_collection(force=True)
+    await Station.Q.drop_collection(force=True)
+
+
+@pytest.fixture
+def exporter():
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    tracing.instrument(tracer_provider=provider)
+    yield exporter
+    tracing.uninstrument()
+
+
+@pytest.mark.asyncio
+async def test_builder_spans(connection, exporter):
+    station_id = await Station.Q.insert_one(name="central")
+    await Train.Q.insert_one(number=1, station=Station.to_relation(station_id))
+    exporter.clear()
+
+    await Train.Q.find(number__gte=1, with_relations_objects=True)
+    spans = {span.name: span for span in exporter.get_finished_spans()}
+    find_span = spans[f"find {Train.get_collection_name()}"]
+    assert find_span.attributes["db.system"] == "mongodb"
+    assert find_span.attributes["db.statement"] == '{"number":{"$gte":"?"}}'
+    assert find_span.attributes["motordantic.rows"] == 1
+
+    relations_span = spans[f"relations {Train.get_collection_name()}"]
+    assert relations_span.parent.span_id == find_span.context.span_id
+    station_span = spans[f"find {Station.get_collection_name()}"]
+    assert station_span.parent.span_id == relations_span.context.span_id
+
+    exporter.clear()
+    await Train.manager.aggregate().raw_match({"number": 1}).result()
+    names = [span.name for span in exporter.get_finished_spans()]
+    assert f"aggregate {Train.get_collection_name()}" in names
+    assert f"raw_aggregate {Train.get_collection_name()}" in names
+
+
+def test_uninstrument():
+    find = Train.Q.__class__.find
+    tracing.instrument(tracer_provider=TracerProvider())
+    assert tracing.is_instrumented()
+    assert Train.Q.__class__.find is not find
+    tracing.uninstrument()
+    assert Train.Q.__class__.find is find